@@ -9,8 +9,19 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 from django.core.asgi import get_asgi_application
 
+from core.utils.realtime import CancelOnDisconnectMiddleware
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+# İstemci ayrıldığında /events/ akışlarını sonlandır
+application = CancelOnDisconnectMiddleware(application)
+
+if settings.DEBUG:
+    # runserver'daki gibi geliştirme ortamında admin statik dosyalarını sun
+    application = ASGIStaticFilesHandler(application)
@@ -0,0 +1,37 @@
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgreSQLDatabaseWrapper
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from .pool import get_pool
+
+
+class DatabaseWrapper(PostgreSQLDatabaseWrapper):
+    """
+    Bağlantıları her istekte açıp kapatmak yerine süreç içi havuzdan alan PostgreSQL
+    backend'i. Django bağlantıyı kapattığında fiziksel bağlantı havuza geri döner;
+    transaction ortasında kapatılan ya da autocommit durumu bozulmuş bağlantılar atılır.
+    """
+
+    @property
+    def pool(self):
+        return get_pool(self.alias)
+
+    def get_new_connection(self, conn_params):
+        connection = self.pool.getconn(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+        )
+        # Havuzdan gelen bağlantıda üst sınıfın ayarladığı izolasyon seviyesi yeniden kurulur
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        discard = (
+            self.in_atomic_block
+            or self.connection.autocommit != self.settings_dict['AUTOCOMMIT']
+            or (self.errors_occurred and not self.is_usable())
+        )
+        with self.wrap_database_errors:
+            self.pool.putconn(self.connection, discard=discard)
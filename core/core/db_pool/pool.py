@@ -0,0 +1,197 @@
+import threading
+import time
+from collections import deque
+
+from core.utils.conf import get_setting_group
+from core.utils.logging import log_warning
+from core.utils.metrics import latency_histograms, get_metrics_settings
+
+DEFAULT_POOL_SETTINGS = {
+    'min_size': 2,  # Boşta kapatılmadan tutulacak en az bağlantı
+    'max_size': 20,  # Süreç başına en fazla bağlantı
+    'timeout': 10,  # Havuz doluyken bağlantı için bekleme süresi (saniye)
+    'max_idle': 300,  # Boşta bekleyen bağlantının kapatılma süresi (saniye)
+    'max_lifetime': 3600,  # Bağlantının yenilenme süresi (saniye)
+    'pre_ping': True,  # Teslim öncesi SELECT 1 sağlık kontrolü
+    'slow_wait_ms': 100,  # Bu süreyi aşan beklemeler loglanır
+}
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+def get_pool_settings():
+    return get_setting_group('DATABASE_POOL', DEFAULT_POOL_SETTINGS)
+
+
+class ConnectionPool:
+    """
+    Süreç içinde paylaşılan, thread güvenli veritabanı bağlantı havuzu. Bağlantılar LIFO
+    sırasıyla verilir; `max_idle` saniyeden uzun boşta kalanlar `min_size` korunarak,
+    `max_lifetime` saniyeyi aşanlar koşulsuz kapatılır. `pre_ping` açıksa bağlantı teslim
+    edilmeden önce `SELECT 1` ile doğrulanır. Havuz doluysa `timeout` saniye beklenir ve
+    bekleme süresi `db_pool` histogramına yazılır.
+    """
+
+    def __init__(self, name, min_size, max_size, timeout, max_idle, max_lifetime, pre_ping, slow_wait_ms):
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.pre_ping = pre_ping
+        self.slow_wait_ms = slow_wait_ms
+        self.condition = threading.Condition()
+        self.idle = deque()
+        self.created_at = {}
+        self.size = 0
+        self.waiting = 0
+        self.timeouts = 0
+
+    def getconn(self, connect):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            connection, created = self.checkout(deadline)
+            if created:
+                connection = self.open_connection(connect)
+            elif self.pre_ping and not self.ping(connection):
+                self.discard(connection)
+                continue
+            self.observe_wait((time.monotonic() - started) * 1000)
+            return connection
+
+    def checkout(self, deadline):
+        """Boşta bir bağlantı ya da yeni bağlantı açma hakkı alınana kadar bekler"""
+        with self.condition:
+            while True:
+                self.prune_idle()
+                if self.idle:
+                    connection, _ = self.idle.pop()
+                    return connection, False
+                if self.size < self.max_size:
+                    self.size += 1
+                    return None, True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f"'{self.name}' bağlantı havuzundan {self.timeout} saniye içinde bağlantı alınamadı "
+                        f"(max_size={self.max_size})"
+                    )
+                self.waiting += 1
+                try:
+                    self.condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+
+    def open_connection(self, connect):
+        try:
+            connection = connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.created_at[id(connection)] = time.monotonic()
+        return connection
+
+    def putconn(self, connection, discard=False):
+        now = time.monotonic()
+        with self.condition:
+            expired = now - self.created_at.get(id(connection), now) >= self.max_lifetime
+            if not (discard or expired or connection.closed):
+                self.idle.append((connection, now))
+                self.condition.notify()
+                return
+        self.discard(connection)
+
+    def discard(self, connection):
+        with self.condition:
+            self.created_at.pop(id(connection), None)
+            self.size -= 1
+            self.condition.notify()
+        close_quietly(connection)
+
+    def prune_idle(self):
+        """En eski boşta bağlantılardan başlayarak süresi dolanları kapatır; kilit altında çağrılır"""
+        now = time.monotonic()
+        while self.idle:
+            connection, returned_at = self.idle[0]
+            too_old = now - self.created_at.get(id(connection), now) >= self.max_lifetime
+            too_idle = now - returned_at >= self.max_idle and self.size > self.min_size
+            if not (too_old or too_idle):
+                break
+            self.idle.popleft()
+            self.created_at.pop(id(connection), None)
+            self.size -= 1
+            close_quietly(connection)
+
+    @staticmethod
+    def ping(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def observe_wait(self, wait_ms):
+        if get_metrics_settings()['enabled']:
+            latency_histograms.observe('db_pool', self.name, wait_ms)
+        if wait_ms >= self.slow_wait_ms:
+            log_warning('system_monitoring', 'Veritabanı bağlantı havuzunda uzun bekleme', {
+                'pool': self.name,
+                'wait_ms': round(wait_ms, 2),
+                **self.stats(),
+            })
+
+    def stats(self):
+        with self.condition:
+            return {
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'waiting': self.waiting,
+                'timeouts': self.timeouts,
+            }
+
+    def close_all(self):
+        with self.condition:
+            idle, self.idle = self.idle, deque()
+            for connection, _ in idle:
+                self.created_at.pop(id(connection), None)
+                self.size -= 1
+        for connection, _ in idle:
+            close_quietly(connection)
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias):
+    """Veritabanı takma adı başına tek havuz oluşturur"""
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = ConnectionPool(alias, **get_pool_settings())
+    return pool
+
+
+def pool_stats():
+    return {alias: pool.stats() for alias, pool in _pools.items()}
@@ -11,58 +11,75 @@ class JWTAuthenticationMiddleware:
         self.header_prefix = 'Bearer'
 
     def resolve(self, next, root, info, **args):
-        request = info.context
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+        self.authenticate(info.context)
+        return next(root, info, **args)
+
+    def authenticate(self, request):
+        """İstek başına bir kez token doğrular, sonucu request üzerinde saklar"""
+        if getattr(request, '_jwt_authenticated', False):
+            return request.user
 
+        request._jwt_authenticated = True
+        request.user = AnonymousUser()
+        request.user_role = None
+        request.token_payload = None
+
+        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
         if not auth_header:
-            request.user = AnonymousUser()
-            return next(root, info, **args)
+            return request.user
 
         try:
             parts = auth_header.split()
             if len(parts) != 2 or parts[0] != self.header_prefix:
-                request.user = AnonymousUser()
-                return next(root, info, **args)
+                return request.user
 
             token = parts[1]
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
 
             if payload.get('token_type') != 'access':
-                request.user = AnonymousUser()
-                return next(root, info, **args)
+                return request.user
 
             user_id = payload.get('user_id')
             if not user_id:
-                request.user = AnonymousUser()
-                return next(root, info, **args)
+                return request.user
 
             try:
-                user = CustomUser.objects.get(id=user_id)
+                user = CustomUser.objects.select_related('role').get(id=user_id)
+                if user.role and payload.get('role_version') != user.role.version:
+                    # Rol izinleri token üretildikten sonra değişmiş, istemci token yenilemeli
+                    logger.error("JWT Authentication - Rol versiyonu eskimiş", {
+                        "user_id": user.id,
+                        "role_version": payload.get('role_version')
+                    })
+                    return request.user
+
+                user.token_permission_mask = payload.get('permission_mask')
                 request.user = user
+                request.user_role = user.role
+                request.token_payload = payload
                 logger.info("JWT Authentication başarılı", {
                     "user_id": user.id,
                     "role": user.role.name
                 })
             except CustomUser.DoesNotExist:
-                request.user = AnonymousUser()
                 logger.error("JWT Authentication - Kullanıcı bulunamadı", {
                     "user_id": user_id
                 })
 
         except jwt.ExpiredSignatureError:
-            request.user = AnonymousUser()
             logger.error("JWT Authentication - Token süresi dolmuş", {
                 "token": token[:10] if 'token' in locals() else None
             })
         except jwt.InvalidTokenError:
-            request.user = AnonymousUser()
             logger.error("JWT Authentication - Geçersiz token", {
                 "token": token[:10] if 'token' in locals() else None
             })
         except Exception as e:
             request.user = AnonymousUser()
+            request.user_role = None
+            request.token_payload = None
             logger.error("JWT Authentication - Beklenmeyen hata", {
                 "error": str(e)
             })
 
-        return next(root, info, **args) 
\ No newline at end of file
+        return request.user
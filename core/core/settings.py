@@ -80,6 +80,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'core.wsgi.application'
+ASGI_APPLICATION = 'core.asgi.application'
 
 
 # Database
@@ -96,13 +97,90 @@ DATABASES = {
     }
 }
 
+# Bağlantı yönetimi: 'off' (her istekte yeni bağlantı), 'persistent' (thread başına kalıcı
+# bağlantı + sağlık kontrolü, WSGI için), 'pool' (süreç içi PostgreSQL bağlantı havuzu, ASGI için)
+DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'off')
+
+if DB_POOL_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', 60))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+elif DB_POOL_MODE == 'pool' and (DATABASES['default']['ENGINE'] or '').endswith('postgresql'):
+    # Django her istek sonunda bağlantıyı kapatır, havuz backend'i bunu havuza iade olarak uygular
+    DATABASES['default']['ENGINE'] = 'core.db_pool'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Okuma replikaları: virgülle ayrılmış `host[:port]` listesi (SQLite'ta veritabanı dosya yolları).
+# Her replika birincil ayarlarını devralır ve `replica_1`, `replica_2`, ... adlarıyla tanımlanır.
+for index, replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1):
+    replica_settings = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+    if (replica_settings['ENGINE'] or '').endswith('sqlite3'):
+        replica_settings['NAME'] = replica.strip()
+    else:
+        host, _, port = replica.strip().partition(':')
+        replica_settings['HOST'] = host
+        replica_settings['PORT'] = port or replica_settings['PORT']
+    DATABASES[f'replica_{index}'] = replica_settings
+
+DATABASE_ROUTERS = ['core.utils.db_router.ReadReplicaRouter']
+
+
+def env_settings(**variables):
+    """
+    Yalnızca tanımlı ortam değişkenlerini ayar grubuna alır. Tanımsız anahtarlar ilgili modüldeki
+    `DEFAULT_*_SETTINGS` değerlerini kullanır (bkz. core.utils.conf.get_setting_group).
+    """
+    return {key: cast(os.environ[name]) for key, (name, cast) in variables.items() if name in os.environ}
+
+
+def env_flag(value):
+    return value == 'True'
+
+
+# Ayar grupları yalnızca varsayılandan farklı değerleri içerir; varsayılanlar ve açıklamaları
+# ilgili modüllerde tutulur: READ_REPLICAS (core.utils.db_router), DATABASE_POOL (core.db_pool.pool),
+# GRAPHQL_PERSISTED_QUERIES, GRAPHQL_DOCUMENT_CACHE, GRAPHQL_RESPONSE_CACHE, GRAPHQL_METRICS,
+# GRAPHQL_QUERY_COUNTER, REALTIME_EVENTS (core.utils.*), DIARY_PARTITIONING (internshipManage.utils.partitioning),
+# USER_IMPORT, AUTOCOMPLETE (userManage.utils.*)
+READ_REPLICAS = {
+    'aliases': [alias for alias in DATABASES if alias.startswith('replica_')],
+    **env_settings(sticky_seconds=('DB_REPLICA_STICKY_SECONDS', int)),
+}
+
+DATABASE_POOL = env_settings(
+    min_size=('DB_POOL_MIN_SIZE', int),
+    max_size=('DB_POOL_MAX_SIZE', int),
+    timeout=('DB_POOL_TIMEOUT', float),
+    max_idle=('DB_POOL_MAX_IDLE', int),
+    max_lifetime=('DB_POOL_MAX_LIFETIME', int),
+    pre_ping=('DB_POOL_PRE_PING', env_flag),
+    slow_wait_ms=('DB_POOL_SLOW_WAIT_MS', int),
+)
+
 GRAPHENE = {
     'SCHEMA': 'core.schema.schema',
     'MIDDLEWARE': [
         'core.middleware.JWTAuthenticationMiddleware',
+        'core.utils.response_cache.ResponseCacheTagMiddleware',
+        'core.utils.metrics.ResolverTimingMiddleware',
     ],
 }
 
+# Rol bazlı sorgu sınırları, tanımsız roller ve anonim istekler `default` değerlerini kullanır
+GRAPHQL_QUERY_LIMITS = {
+    'default': {'max_depth': 10, 'max_cost': 5000, 'max_page_size': 100},
+    'Student': {'max_depth': 10, 'max_cost': 10000, 'max_page_size': 100},
+    'Company': {'max_depth': 10, 'max_cost': 20000, 'max_page_size': 100},
+    'Admin': {'max_depth': 12, 'max_cost': 50000, 'max_page_size': 100},
+}
+
+# Staj tarih çakışması kapsamı: 'company' (aynı öğrenci + aynı şirket) veya 'student' (aynı öğrenci, tüm şirketler)
+# Değiştirildikten sonra `python manage.py sync_overlap_constraint` ile PostgreSQL constraint'i güncellenmelidir
+INTERNSHIP_OVERLAP_SCOPE = os.getenv('INTERNSHIP_OVERLAP_SCOPE', 'company')
+
+DIARY_PARTITIONING = env_settings(enabled=('DIARY_PARTITIONING', env_flag))
+
+USER_IMPORT = env_settings(upload_dir=('USER_IMPORT_DIR', str))
+
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
@@ -213,4 +291,9 @@ LOG_MONITORING = {
 CRONJOBS = [
     ('0 0 * * *', 'core.tasks.cleanup_logs'),
     ('0 */6 * * *', 'core.tasks.monitor_logs'),
+    ('* * * * *', 'core.tasks.send_registration_mails'),
+    ('* * * * *', 'core.tasks.run_user_imports'),
+    ('30 2 * * *', 'core.tasks.reconcile_progress_counters'),
+    ('*/10 * * * *', 'core.tasks.refresh_dashboard_stats'),
+    ('0 3 1 * *', 'core.tasks.ensure_diary_partitions'),
 ] 
\ No newline at end of file
@@ -2,6 +2,11 @@ from django.conf import settings
 from core.utils.logging import LogCleaner
 from core.utils.monitoring import LogMonitor
 from core.utils.logging import log_info, log_error
+from userManage.utils.mail_queue import send_queued_registration_mails
+from userManage.utils.user_import import run_pending_import_jobs
+from internshipManage.utils.progress import reconcile_internship_progress
+from internshipManage.utils.partitioning import ensure_diary_partitions as create_diary_partitions
+from internshipManage.utils.dashboard import refresh_dashboard_stats as refresh_dashboard_stat_tables
 
 def cleanup_logs():
     try:
@@ -27,4 +32,34 @@ def monitor_logs():
             log_info('system_monitoring', 'Log istatistikleri', stats)
             
     except Exception as e:
-        log_error('system_monitoring', 'Log izleme işlemi başarısız', {'error': str(e)}) 
\ No newline at end of file
+        log_error('system_monitoring', 'Log izleme işlemi başarısız', {'error': str(e)})
+
+def send_registration_mails():
+    try:
+        send_queued_registration_mails()
+    except Exception as e:
+        log_error('user_management', 'Kuyruktaki kayıt e-postaları gönderilemedi', {'error': str(e)})
+
+def run_user_imports():
+    try:
+        run_pending_import_jobs()
+    except Exception as e:
+        log_error('user_management', 'Kuyruktaki kullanıcı içe aktarma işleri çalıştırılamadı', {'error': str(e)})
+
+def reconcile_progress_counters():
+    try:
+        reconcile_internship_progress()
+    except Exception as e:
+        log_error('internship_management', 'Staj ilerleme sayaçları mutabakatı başarısız', {'error': str(e)})
+
+def refresh_dashboard_stats():
+    try:
+        refresh_dashboard_stat_tables()
+    except Exception as e:
+        log_error('internship_management', 'Panel istatistikleri yenilenemedi', {'error': str(e)})
+
+def ensure_diary_partitions():
+    try:
+        create_diary_partitions()
+    except Exception as e:
+        log_error('internship_management', 'Günlük tablosu bölümleri oluşturulamadı', {'error': str(e)})
@@ -0,0 +1,57 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from userManage.models import Company, CustomPermission, CustomRole, CustomUser, Student
+from userManage.utils.jwt_payload import generate_access_token
+
+# Testler Redis yerine süreç içi önbellek kullanır
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_role(name, *codenames):
+    role = CustomRole.objects.create(name=name, description=name)
+    for codename in codenames:
+        permission, _ = CustomPermission.objects.get_or_create(codename=codename, defaults={'name': codename, 'description': codename})
+        role.permissions.add(permission)
+    return role
+
+
+def create_user(username, role=None, **fields):
+    CustomUser.objects.create_user(username, f'{username}@example.com', 'pass1234', role=role, **fields)
+    # İzin maskesi sinyalle güncellendiğinden rol yeniden okunur
+    return CustomUser.objects.select_related('role').get(username=username)
+
+
+def create_student(index, role=None, is_superuser=False, **fields):
+    user = create_user(f'student{index}', role, is_superuser=is_superuser)
+    profile = {
+        'first_name': f'Ogrenci{index}', 'last_name': 'Test', 'student_number': f'S{index:04d}',
+        'department': 'Bilgisayar', 'faculty': 'Muhendislik', **fields,
+    }
+    return Student.objects.create(user=user, **profile)
+
+
+def create_company(name, role=None, **fields):
+    user = create_user(name.replace(' ', '').lower(), role)
+    return Company.objects.create(user=user, company_name=name, **{'contact_person': 'Yetkili', **fields})
+
+
+@override_settings(CACHES=TEST_CACHES)
+class GraphQLTestCase(TestCase):
+    """`/graphql/` uç noktasına JWT ile istek atan testlerin ortak tabanı; `self.admin` tüm izinlere sahiptir"""
+
+    def setUp(self):
+        cache.clear()
+        CustomPermission.clear_bit_cache()
+        self.admin = create_user('admin', create_role('Admin'), is_superuser=True)
+
+    def post(self, payload, user=None):
+        return self.client.post(
+            '/graphql/', json.dumps(payload), content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {generate_access_token(user or self.admin)}'
+        ).json()
+
+    def query(self, query, user=None, variables=None):
+        return self.post({'query': query, 'variables': variables or {}}, user)
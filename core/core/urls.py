@@ -16,11 +16,12 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from graphene_django.views import GraphQLView
 from .schema import schema
-from graphene_file_upload.django import FileUploadGraphQLView
+from .views import EventStreamView, GraphQLView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path("graphql/", FileUploadGraphQLView.as_view(graphiql=True)),
+    path("graphql/", GraphQLView.as_view(graphiql=True)),
+    path("events/", EventStreamView.as_view()),
+    path("export/", include('internshipManage.urls')),
 ]
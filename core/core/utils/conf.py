@@ -0,0 +1,9 @@
+from django.conf import settings
+
+
+def get_setting_group(name, defaults):
+    """
+    `settings.<name>` sözlüğünü modüldeki varsayılanlarla birleştirir. Varsayılanlar yalnızca
+    ilgili modülde tutulur; settings.py'de sadece değiştirilmek istenen anahtarlar verilir.
+    """
+    return {**defaults, **getattr(settings, name, {})}
@@ -0,0 +1,216 @@
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Manager
+import graphene
+from graphene import relay
+from graphene_django.filter import DjangoFilterConnectionField
+from graphene_django.filter.fields import convert_enum
+
+
+class DataLoader:
+    """İstek boyunca biriken anahtarları tek sorguda yükleyip önbellekte tutar"""
+
+    def __init__(self, on_load=None):
+        self._cache = {}
+        self._pending = set()
+        self._on_load = on_load
+
+    def batch_load(self, keys):
+        raise NotImplementedError
+
+    def prime(self, key, value):
+        self._cache.setdefault(key, value)
+
+    def enqueue(self, keys):
+        self._pending.update(key for key in keys if key is not None and key not in self._cache)
+
+    def load(self, key):
+        if key is None:
+            return None
+        if key not in self._cache:
+            keys = self._pending | {key}
+            self._pending = set()
+            results = self.batch_load(list(keys))
+            for item_key in keys:
+                self._cache[item_key] = results.get(item_key)
+            if self._on_load:
+                self._on_load(results.values())
+        return self._cache[key]
+
+
+class ModelLoader(DataLoader):
+    """Model nesnelerini birincil anahtara göre `IN (...)` sorgusuyla yükler"""
+
+    def __init__(self, model, on_load=None):
+        super().__init__(on_load)
+        self.model = model
+
+    def batch_load(self, keys):
+        return self.model._default_manager.in_bulk(keys)
+
+
+class RelatedListLoader(DataLoader):
+    """Ters ilişkileri (ör. internship.diaries) üst nesne id'sine göre gruplayarak yükler"""
+
+    def __init__(self, field, queryset=None, on_load=None):
+        super().__init__(on_load)
+        self.field = field
+        self.queryset = queryset if queryset is not None else field.model._default_manager.all()
+
+    def batch_load(self, keys):
+        grouped = defaultdict(list)
+        # Bölümlü tablolar üst anahtarlardan bölüm sınırlarını da ekleyebilir
+        for_parents = getattr(self.queryset, 'for_parents', None)
+        if for_parents is not None:
+            queryset = for_parents(keys)
+        else:
+            queryset = self.queryset.filter(**{f'{self.field.name}__in': keys})
+        if not queryset.ordered:
+            queryset = queryset.order_by('pk')
+        for obj in queryset:
+            grouped[getattr(obj, self.field.attname)].append(obj)
+        return {key: grouped[key] for key in keys}
+
+
+class DataLoaders:
+    """İstek başına oluşturulan yükleyici kayıt defteri"""
+
+    def __init__(self):
+        self._model_loaders = {}
+        self._related_loaders = defaultdict(dict)
+        self._parent_keys = defaultdict(set)
+
+    def for_model(self, model):
+        if model not in self._model_loaders:
+            self._model_loaders[model] = ModelLoader(model, on_load=self._register_loaded)
+        return self._model_loaders[model]
+
+    def for_relation(self, field, filters_key=None, get_queryset=None):
+        """İlişki ve filtre kombinasyonu başına ayrı bir yükleyici döndürür"""
+        loaders = self._related_loaders[field]
+        if filters_key not in loaders:
+            queryset = get_queryset() if get_queryset else None
+            loader = RelatedListLoader(field, queryset, on_load=self._register_loaded_lists)
+            loader.enqueue(self._parent_keys[field])
+            loaders[filters_key] = loader
+        return loaders[filters_key]
+
+    def register_siblings(self, instances):
+        """Aynı seviyede çözülecek nesnelerin ilişki anahtarlarını kuyruğa ekler"""
+        instances = [instance for instance in instances if instance is not None]
+        if not instances:
+            return
+
+        model = instances[0]._meta.concrete_model
+        model_loader = self.for_model(model)
+        for instance in instances:
+            model_loader.prime(instance.pk, instance)
+
+        for field in model._meta.get_fields():
+            if field.concrete and (field.many_to_one or field.one_to_one):
+                related_loader = self.for_model(field.related_model)
+                for instance in instances:
+                    if field.is_cached(instance):
+                        related = field.get_cached_value(instance)
+                        if related is not None:
+                            related_loader.prime(related.pk, related)
+                    else:
+                        related_loader.enqueue([getattr(instance, field.attname)])
+            elif field.one_to_many:
+                keys = [instance.pk for instance in instances]
+                self._parent_keys[field.field].update(keys)
+                for loader in self._related_loaders[field.field].values():
+                    loader.enqueue(keys)
+
+    def _register_loaded(self, objects):
+        self.register_siblings(list(objects))
+
+    def _register_loaded_lists(self, groups):
+        self.register_siblings([obj for group in groups for obj in group])
+
+
+def get_dataloaders(context):
+    loaders = getattr(context, 'dataloaders', None)
+    if loaders is None:
+        loaders = DataLoaders()
+        context.dataloaders = loaders
+    return loaders
+
+
+def load_related(instance, info, field_name):
+    """ForeignKey/OneToOne alanını toplu yükleyici üzerinden çözer"""
+    field = instance._meta.get_field(field_name)
+    if field.is_cached(instance):
+        return getattr(instance, field_name)
+
+    value = get_dataloaders(info.context).for_model(field.related_model).load(getattr(instance, field.attname))
+    field.set_cached_value(instance, value)
+    return value
+
+
+def load_related_list(instance, info, field, filters_key=None, get_queryset=None):
+    """Ters ilişkiyi önceden yüklenmişse önbellekten, değilse toplu yükleyiciden çözer"""
+    if filters_key is None:
+        cache_name = field.remote_field.get_cache_name()
+        prefetched = getattr(instance, '_prefetched_objects_cache', {})
+        if cache_name in prefetched:
+            return list(prefetched[cache_name])
+
+    loader = get_dataloaders(info.context).for_relation(field, filters_key, get_queryset)
+    objects = loader.load(instance.pk)
+    for obj in objects:
+        field.set_cached_value(obj, instance)
+    return objects
+
+
+class BatchedConnection(relay.Connection):
+    """Kenarlar çözülürken kardeş düğümleri yükleyicilere kaydeden bağlantı sınıfı"""
+
+    total_count = graphene.Int()
+
+    class Meta:
+        abstract = True
+
+    def resolve_total_count(self, info):
+        # Keyset sayfalamada sayım yalnızca istendiğinde yapılır
+        if getattr(self, 'length', None) is None:
+            return self.iterable.count()
+        return self.length
+
+    def resolve_edges(self, info):
+        get_dataloaders(info.context).register_siblings([edge.node for edge in self.edges])
+        return self.edges
+
+
+class BatchedFilterConnectionField(DjangoFilterConnectionField):
+    """Ters ilişki bağlantılarını filtreleriyle birlikte toplu yükleyiciden çözer"""
+
+    @classmethod
+    def prepare_queryset(cls, queryset, info):
+        return queryset
+
+    @classmethod
+    def resolve_queryset(cls, connection, iterable, info, args, filtering_args, filterset_class):
+        instance = getattr(iterable, 'instance', None)
+        field = getattr(iterable, 'field', None)
+        if not isinstance(iterable, Manager) or instance is None or field is None:
+            return super().resolve_queryset(connection, iterable, info, args, filtering_args, filterset_class)
+
+        filter_kwargs = {
+            name: convert_enum(value)
+            for name, value in args.items()
+            if name in filtering_args and value is not None
+        }
+
+        def get_queryset():
+            queryset = field.model._default_manager.all()
+            if filter_kwargs:
+                filterset = filterset_class(data=filter_kwargs, queryset=queryset, request=info.context)
+                if not filterset.is_valid():
+                    raise ValidationError(filterset.form.errors.as_json())
+                queryset = filterset.qs
+            return cls.prepare_queryset(queryset, info)
+
+        filters_key = repr(sorted(filter_kwargs.items())) if filter_kwargs else None
+        return load_related_list(instance, info, field, filters_key, get_queryset)
@@ -0,0 +1,97 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from .conf import get_setting_group
+from .logging import log_warning
+
+# GraphQL query operasyonları ve dışa aktarmalar replikalardan okunur; mutasyon yapan
+# kullanıcının okumaları `sticky_seconds` boyunca birincilde kalır (read-your-writes)
+DEFAULT_READ_REPLICA_SETTINGS = {
+    'aliases': [],
+    'sticky_seconds': 5,
+}
+
+STICKY_KEY_PREFIX = 'db:sticky'
+
+# Geçerli bağlamdaki okumaların yönleneceği veritabanı; None ise birincil kullanılır
+read_database = ContextVar('read_database', default=None)
+
+
+def get_read_replica_settings():
+    return get_setting_group('READ_REPLICAS', DEFAULT_READ_REPLICA_SETTINGS)
+
+
+def replica_aliases():
+    return get_read_replica_settings()['aliases']
+
+
+def sticky_key(user_id):
+    return f'{STICKY_KEY_PREFIX}:{user_id}'
+
+
+def mark_recent_write(user):
+    """Kullanıcının kendi yazdığını hemen okuyabilmesi için kısa süre birincile sabitler"""
+    if not replica_aliases() or not getattr(user, 'is_authenticated', False):
+        return
+    try:
+        cache.set(sticky_key(user.id), 1, get_read_replica_settings()['sticky_seconds'])
+    except Exception as e:
+        log_warning('graphql', 'Replika yapışkanlık kaydı yazılamadı', {'user_id': user.id, 'error': str(e)})
+
+
+def choose_read_database(user=None):
+    """
+    Okuma için rastgele bir replika seçer. Replika tanımlı değilse ya da kullanıcı
+    `sticky_seconds` içinde yazma yaptıysa birincil veritabanı döner.
+    """
+    aliases = replica_aliases()
+    if not aliases:
+        return DEFAULT_DB_ALIAS
+    if getattr(user, 'is_authenticated', False):
+        try:
+            if cache.get(sticky_key(user.id)):
+                return DEFAULT_DB_ALIAS
+        except Exception as e:
+            log_warning('graphql', 'Replika yapışkanlık kaydı okunamadı', {'user_id': user.id, 'error': str(e)})
+            return DEFAULT_DB_ALIAS
+    return random.choice(aliases)
+
+
+@contextmanager
+def use_read_database(alias):
+    """Blok içindeki tüm okumaları verilen veritabanına yönlendirir"""
+    token = read_database.set(alias)
+    try:
+        yield alias
+    finally:
+        read_database.reset(token)
+
+
+class ReadReplicaRouter:
+    """
+    Okumalar yalnızca `use_read_database` ile açıkça işaretlenmiş bağlamlarda (GraphQL
+    query operasyonları, dışa aktarmalar) replikaya gider; diğer tüm okumalar ve bütün
+    yazmalar birincil veritabanını kullanır. Replikalara migration uygulanmaz.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        # Replikadan okunmuş bir nesne kaydedilirken de birincile yazılır
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+
+from .conf import get_setting_group
+
+# Parse edilmiş ve doğrulanmış GraphQL dokümanları için worker başına LRU önbellek
+DEFAULT_DOCUMENT_CACHE_SETTINGS = {
+    'max_size': 1000,  # 0 verilirse önbellek devre dışı kalır
+}
+
+
+def get_document_cache_settings():
+    return get_setting_group('GRAPHQL_DOCUMENT_CACHE', DEFAULT_DOCUMENT_CACHE_SETTINGS)
+
+
+class DocumentCache:
+    """
+    Parse edilmiş ve şemaya göre doğrulanmış GraphQL dokümanlarını sorgu hash'ine göre
+    tutan, boyutu sınırlı süreç içi LRU önbellek. `max_size` 0 ise önbellek devre dışıdır.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            document = self._documents.get(key)
+            if document is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document
+
+    def set(self, key, document):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._documents[key] = document
+            self._documents.move_to_end(key)
+            while len(self._documents) > self.max_size:
+                self._documents.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+
+    def stats(self):
+        """Önbellek kullanım istatistiklerini döndürür"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._documents),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+_document_caches = {}
+
+
+def get_document_cache(schema):
+    """Şema başına süreç içinde tek bir doküman önbelleği döndürür"""
+    if schema not in _document_caches:
+        _document_caches[schema] = DocumentCache(get_document_cache_settings()['max_size'])
+    return _document_caches[schema]
@@ -0,0 +1,64 @@
+import csv
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+# gzip başlığıyla sıkıştırma (zlib için wbits=16+15)
+GZIP_WBITS = 31
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """csv.writer'ın yazdığı satırı tampona almadan geri döndürür"""
+
+    def write(self, value):
+        return value
+
+
+def csv_gzip_chunks(header, rows, compress_level=6):
+    """
+    Satırları CSV'ye çevirip anında gzip ile sıkıştırır. zlib yalnızca kendi tamponu
+    dolduğunda çıktı verdiğinden bellek kullanımı satır sayısından bağımsızdır.
+    """
+    writer = csv.writer(Echo())
+    compressor = zlib.compressobj(compress_level, zlib.DEFLATED, GZIP_WBITS)
+    chunk = compressor.compress(('﻿' + writer.writerow(header)).encode('utf-8'))
+    if chunk:
+        yield chunk
+    for row in rows:
+        chunk = compressor.compress(writer.writerow(row).encode('utf-8'))
+        if chunk:
+            yield chunk
+    yield compressor.flush()
+
+
+async def stream_in_thread(make_iterator):
+    """
+    Senkron bir üreticiyi ASGI altında tamamen belleğe almadan akıtır. Sunucu tarafı
+    cursor aynı veritabanı bağlantısında kalmalıdır; bu yüzden üretici baştan sona tek bir
+    thread'de çalıştırılır ve bitince o thread'in bağlantısı kapatılır.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='export')
+
+    def run(func, *args):
+        return sync_to_async(func, thread_sensitive=False, executor=executor)(*args)
+
+    iterator = await run(make_iterator)
+    try:
+        while True:
+            chunk = await run(next, iterator, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        await run(close_iterator, iterator)
+        executor.shutdown(wait=False)
+
+
+def close_iterator(iterator):
+    try:
+        iterator.close()
+    finally:
+        connections.close_all()
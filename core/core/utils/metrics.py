@@ -0,0 +1,169 @@
+import atexit
+import threading
+import time
+from bisect import bisect_left
+from inspect import isawaitable
+
+from django_redis import get_redis_connection
+
+from .conf import get_setting_group
+from .logging import log_warning
+
+# Çözücü ve operasyon gecikme histogramları
+DEFAULT_METRICS_SETTINGS = {
+    'enabled': True,
+    'flush_interval': 10,  # Süreç içinde toplanan histogramların Redis'e yazılma aralığı (saniye)
+    'ttl': 60 * 60 * 24 * 7,  # Histogram anahtarlarının Redis'te tutulma süresi
+}
+
+# Milisaniye cinsinden histogram üst sınırları, son kova sınırsızdır
+LATENCY_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+BUCKET_LABELS = tuple(str(bucket) for bucket in LATENCY_BUCKETS) + ('inf',)
+
+KEY_PREFIX = 'metrics:latency'
+INDEX_KEY = f'{KEY_PREFIX}:index'
+
+
+def get_metrics_settings():
+    return get_setting_group('GRAPHQL_METRICS', DEFAULT_METRICS_SETTINGS)
+
+
+def histogram_key(kind, name):
+    return f'{KEY_PREFIX}:{kind}:{name}'
+
+
+class LatencyHistograms:
+    """
+    Süre ölçümlerini süreç içinde sabit kovalı histogramlarda toplar ve `flush_interval`
+    saniyede bir Redis'e HINCRBY ile ekler. Böylece istek başına Redis'e yazılmaz, tüm
+    worker'ların verisi Redis'te birleşir.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.last_flush = time.monotonic()
+        self.flush_interval = None
+
+    def observe(self, kind, name, duration_ms):
+        if self.flush_interval is None:
+            self.flush_interval = get_metrics_settings()['flush_interval']
+        key = (kind, name)
+        bucket = bisect_left(LATENCY_BUCKETS, duration_ms)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * len(BUCKET_LABELS), 0, 0.0]
+            histogram[0][bucket] += 1
+            histogram[1] += 1
+            histogram[2] += duration_ms
+            now = time.monotonic()
+            due = now - self.last_flush >= self.flush_interval
+            if due:
+                self.last_flush = now
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            histograms, self.histograms = self.histograms, {}
+        if not histograms:
+            return
+
+        try:
+            ttl = get_metrics_settings()['ttl']
+            pipeline = get_redis_connection('default').pipeline(transaction=False)
+            for (kind, name), (buckets, count, total) in histograms.items():
+                key = histogram_key(kind, name)
+                for label, value in zip(BUCKET_LABELS, buckets):
+                    if value:
+                        pipeline.hincrby(key, label, value)
+                pipeline.hincrby(key, 'count', count)
+                pipeline.hincrbyfloat(key, 'sum', total)
+                pipeline.expire(key, ttl)
+                pipeline.sadd(INDEX_KEY, key)
+            pipeline.expire(INDEX_KEY, ttl)
+            pipeline.execute()
+        except Exception as e:
+            log_warning('graphql', 'Gecikme metrikleri Redis\'e yazılamadı', {'error': str(e)})
+
+
+latency_histograms = LatencyHistograms()
+atexit.register(latency_histograms.flush)
+
+
+def estimate_percentile(buckets, count, percentile):
+    """Kova sayılarından yüzdelik değerin üst sınırını tahmin eder"""
+    if not count:
+        return None
+    threshold = count * percentile / 100
+    cumulative = 0
+    for label, value in zip(BUCKET_LABELS, buckets):
+        cumulative += value
+        if cumulative >= threshold:
+            return label
+    return BUCKET_LABELS[-1]
+
+
+def read_histograms(kind=None):
+    """Redis'teki histogramları p50/p95/p99 tahminleriyle birlikte döndürür"""
+    redis = get_redis_connection('default')
+    report = []
+    for key in sorted(member.decode() for member in redis.smembers(INDEX_KEY)):
+        _, _, key_kind, name = key.split(':', 3)
+        if kind and key_kind != kind:
+            continue
+        data = {field.decode(): value for field, value in redis.hgetall(key).items()}
+        if not data:
+            continue
+        buckets = [int(data.get(label, 0)) for label in BUCKET_LABELS]
+        count = int(data.get('count', 0))
+        report.append({
+            'kind': key_kind,
+            'name': name,
+            'count': count,
+            'avg_ms': float(data.get('sum', 0)) / count if count else 0,
+            'p50': estimate_percentile(buckets, count, 50),
+            'p95': estimate_percentile(buckets, count, 95),
+            'p99': estimate_percentile(buckets, count, 99),
+            'buckets': dict(zip(BUCKET_LABELS, buckets)),
+        })
+    return report
+
+
+def field_path(info):
+    """Liste indekslerini atarak `internships.edges.node.student` biçiminde alan yolu üretir"""
+    return '.'.join(key for key in info.path.as_list() if isinstance(key, str))
+
+
+class ResolverTimingMiddleware:
+    """Her alan çözücüsünün süresini alan yoluna göre histograma ekler"""
+
+    def __init__(self):
+        self.enabled = get_metrics_settings()['enabled']
+
+    def resolve(self, next, root, info, **args):
+        if not self.enabled:
+            return next(root, info, **args)
+
+        started = time.perf_counter()
+        result = None
+        try:
+            result = next(root, info, **args)
+            return self.observe_async(result, info, started) if isawaitable(result) else result
+        finally:
+            if not isawaitable(result):
+                latency_histograms.observe('field', field_path(info), (time.perf_counter() - started) * 1000)
+
+    @staticmethod
+    async def observe_async(result, info, started):
+        """Async çözücülerin süresi coroutine tamamlandığında ölçülür"""
+        try:
+            return await result
+        finally:
+            latency_histograms.observe('field', field_path(info), (time.perf_counter() - started) * 1000)
+
+
+def observe_operation(operation_name, duration_ms):
+    if get_metrics_settings()['enabled']:
+        latency_histograms.observe('operation', operation_name or 'anonymous', duration_ms)
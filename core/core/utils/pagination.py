@@ -0,0 +1,165 @@
+import base64
+import json
+from functools import reduce
+
+import graphene
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q, QuerySet
+from graphene.relay.connection import connection_adapter, page_info_adapter
+
+from core.utils.query_optimizer import OptimizedFilterConnectionField
+
+KEYSET_CURSOR_PREFIX = 'keyset:'
+INVALID_CURSOR_MESSAGE = "Geçersiz cursor."
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+def encode_keyset_cursor(values):
+    return base64.b64encode(f'{KEYSET_CURSOR_PREFIX}{json.dumps(values)}'.encode('utf-8')).decode('ascii')
+
+
+def decode_keyset_cursor(cursor):
+    """Keyset cursor'ını çözer, offset tabanlı ya da geçersiz cursor'lar için None döndürür"""
+    try:
+        decoded = base64.b64decode(cursor.encode('ascii')).decode('utf-8')
+    except Exception:
+        return None
+    if not decoded.startswith(KEYSET_CURSOR_PREFIX):
+        return None
+    try:
+        values = json.loads(decoded[len(KEYSET_CURSOR_PREFIX):])
+    except ValueError:
+        return None
+    return values if isinstance(values, list) else None
+
+
+def parse_ordering(ordering):
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def cursor_value(obj, name):
+    value = getattr(obj, name)
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def ordering_field(queryset, name):
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+    return queryset.model._meta.get_field(name)
+
+
+def parse_cursor_values(queryset, ordering, values):
+    """Cursor değerlerini sıralama alanlarının tiplerine çevirir; uyuşmazlıkta InvalidCursorError fırlatır"""
+    if values is None or len(values) != len(ordering):
+        raise InvalidCursorError(INVALID_CURSOR_MESSAGE)
+    parsed = []
+    for (name, _), value in zip(ordering, values):
+        try:
+            value = ordering_field(queryset, name).to_python(value)
+        except (FieldDoesNotExist, ValidationError, ValueError, TypeError):
+            raise InvalidCursorError(INVALID_CURSOR_MESSAGE)
+        if value is None:
+            raise InvalidCursorError(INVALID_CURSOR_MESSAGE)
+        parsed.append(value)
+    return parsed
+
+
+def keyset_filter(ordering, values, forward):
+    """(a, b) > (x, y) karşılaştırmasını `a > x OR (a = x AND b > y)` biçiminde kurar"""
+    conditions = []
+    for index, (name, descending) in enumerate(ordering):
+        lookup = 'lt' if descending == forward else 'gt'
+        equals = {prefix_name: values[i] for i, (prefix_name, _) in enumerate(ordering[:index])}
+        conditions.append(Q(**equals, **{f'{name}__{lookup}': values[index]}))
+    return reduce(lambda left, right: left | right, conditions)
+
+
+class KeysetConnectionField(OptimizedFilterConnectionField):
+    """
+    İstemci `keyset: true` gönderdiğinde offset yerine (ör. `(date, id)`) sıralama anahtarına
+    göre sayfalayan bağlantı alanı. Cursor'lar son kaydın sıralama değerlerini taşır, böylece
+    derin sayfalar da ilk sayfa kadar hızlıdır ve `COUNT(*)` yalnızca `totalCount` istendiğinde
+    çalışır. `keyset` gönderilmezse mevcut sıralama ve offset sayfalaması değişmeden kalır.
+    """
+
+    def __init__(self, type_, *args, ordering=('created_at', 'id'), keyset_default=False, **kwargs):
+        self.ordering = tuple(ordering)
+        kwargs.setdefault('keyset', graphene.Boolean(default_value=keyset_default))
+        super().__init__(type_, *args, **kwargs)
+
+    def get_queryset_resolver(self):
+        resolve_queryset = super().get_queryset_resolver()
+
+        def resolver(connection, iterable, info, args):
+            queryset = resolve_queryset(connection, iterable, info, args)
+            if args.get('keyset') and isinstance(queryset, QuerySet):
+                queryset = queryset.order_by(*self.ordering)
+            return queryset
+
+        return resolver
+
+    @classmethod
+    def resolve_connection(cls, connection, args, iterable, max_limit=None):
+        if not args.get('keyset') or not isinstance(iterable, QuerySet):
+            return super().resolve_connection(connection, args, iterable, max_limit)
+        if args.get('offset'):
+            raise Exception("`offset` argümanı keyset sayfalamayla birlikte kullanılamaz.")
+
+        ordering = parse_ordering(iterable.query.order_by)
+        after, before = args.get('after'), args.get('before')
+        try:
+            after_values = parse_cursor_values(iterable, ordering, decode_keyset_cursor(after)) if after else None
+            before_values = parse_cursor_values(iterable, ordering, decode_keyset_cursor(before)) if before else None
+        except InvalidCursorError as e:
+            raise Exception(str(e))
+
+        return cls.resolve_keyset_connection(
+            connection, iterable, after_values, before_values, args.get('first'), args.get('last'), max_limit
+        )
+
+    @classmethod
+    def resolve_keyset_connection(cls, connection, queryset, after, before, first, last, max_limit):
+        ordering = parse_ordering(queryset.query.order_by)
+        page = queryset
+        if after is not None:
+            page = page.filter(keyset_filter(ordering, after, forward=True))
+        if before is not None:
+            page = page.filter(keyset_filter(ordering, before, forward=False))
+
+        if first is None and last is None:
+            first = max_limit
+
+        has_previous_page = after is not None
+        has_next_page = before is not None
+        if first is not None or last is None:
+            nodes = list(page[:first + 1]) if first is not None else list(page)
+            if first is not None and len(nodes) > first:
+                nodes = nodes[:first]
+                has_next_page = True
+            if last is not None and len(nodes) > last:
+                nodes = nodes[-last:]
+                has_previous_page = True
+        else:
+            nodes = list(page.reverse()[:last + 1])
+            if len(nodes) > last:
+                nodes = nodes[:last]
+                has_previous_page = True
+            nodes.reverse()
+
+        edges = [
+            connection.Edge(node=node, cursor=encode_keyset_cursor([cursor_value(node, name) for name, _ in ordering]))
+            for node in nodes
+        ]
+        page_info = page_info_adapter(
+            edges[0].cursor if edges else None,
+            edges[-1].cursor if edges else None,
+            has_previous_page,
+            has_next_page,
+        )
+        result = connection_adapter(connection, edges, page_info)
+        result.iterable = queryset
+        result.length = None
+        return result
@@ -0,0 +1,84 @@
+import hashlib
+
+from django.core.cache import cache
+from graphql import GraphQLError, print_schema
+
+from .conf import get_setting_group
+from .logging import log_warning
+
+PERSISTED_QUERY_VERSION = 1
+
+# Otomatik persisted query (APQ) kayıtları
+DEFAULT_PERSISTED_QUERY_SETTINGS = {
+    'timeout': 60 * 60 * 24 * 7,  # Redis'te hash → sorgu kaydının tutulma süresi
+}
+
+
+class PersistedQueryError(GraphQLError):
+    """Apollo APQ istemcilerinin tanıdığı hata kodlarıyla dönen GraphQL hatası"""
+
+    def __init__(self, message, code):
+        super().__init__(message, extensions={'code': code})
+
+
+def get_persisted_query_settings():
+    return get_setting_group('GRAPHQL_PERSISTED_QUERIES', DEFAULT_PERSISTED_QUERY_SETTINGS)
+
+
+def hash_query(query):
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+def get_persisted_query_hash(extensions):
+    """İstek `extensions` alanındaki persistedQuery bilgisinden hash değerini döndürür"""
+    persisted_query = (extensions or {}).get('persistedQuery')
+    if not persisted_query:
+        return None
+
+    if persisted_query.get('version') != PERSISTED_QUERY_VERSION:
+        raise PersistedQueryError('Desteklenmeyen persisted query sürümü', 'PERSISTED_QUERY_NOT_SUPPORTED')
+
+    sha256_hash = persisted_query.get('sha256Hash')
+    if not isinstance(sha256_hash, str) or len(sha256_hash) != 64:
+        raise PersistedQueryError('Geçersiz persisted query hash değeri', 'PERSISTED_QUERY_INVALID_HASH')
+    return sha256_hash.lower()
+
+
+class PersistedQueryRegistry:
+    """
+    Redis üzerinde tüm worker'lar arasında paylaşılan hash → doğrulanmış sorgu metni kaydı.
+    Anahtarlar şema parmak iziyle ayrıldığından şema değiştiğinde eski kayıtlar
+    tekrar doğrulanmadan kullanılmaz.
+    """
+
+    def __init__(self, schema):
+        self.timeout = get_persisted_query_settings()['timeout']
+        self.schema_fingerprint = hash_query(print_schema(schema))[:16]
+
+    def cache_key(self, sha256_hash):
+        return f'graphql:apq:{self.schema_fingerprint}:{sha256_hash}'
+
+    def get(self, sha256_hash):
+        """Kayıtlı sorgu metnini döndürür, bulunamazsa None"""
+        try:
+            return cache.get(self.cache_key(sha256_hash))
+        except Exception as e:
+            log_warning('graphql', 'Persisted query okunamadı', {'hash': sha256_hash, 'error': str(e)})
+            return None
+
+    def register(self, sha256_hash, query):
+        """Doğrulamadan geçmiş sorguyu hash'i ile kaydeder"""
+        try:
+            cache.set(self.cache_key(sha256_hash), query, self.timeout)
+        except Exception as e:
+            log_warning('graphql', 'Persisted query kaydedilemedi', {'hash': sha256_hash, 'error': str(e)})
+
+
+_registries = {}
+
+
+def get_persisted_query_registry(schema):
+    """Şema başına süreç içinde tek bir kayıt defteri döndürür"""
+    if schema not in _registries:
+        _registries[schema] = PersistedQueryRegistry(schema)
+    return _registries[schema]
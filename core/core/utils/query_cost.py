@@ -0,0 +1,161 @@
+from django.conf import settings
+from graphene_django.settings import graphene_settings
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLList,
+    InlineFragmentNode,
+    IntValueNode,
+    VariableNode,
+    get_named_type,
+    get_nullable_type,
+    get_operation_ast,
+)
+
+# Sayfa boyutunu belirleyen bağlantı argümanları
+PAGE_SIZE_ARGUMENTS = ('first', 'last')
+
+DEFAULT_QUERY_LIMITS = {
+    'max_depth': 12,
+    'max_cost': 5000,
+    'max_page_size': 100,
+}
+
+
+class QueryLimitError(GraphQLError):
+    """Sorgu çalıştırılmadan önce maliyet/derinlik sınırı aşıldığında döner"""
+
+    def __init__(self, message, code, analysis, limits):
+        super().__init__(message, extensions={'code': code, 'cost': analysis, 'limits': limits})
+
+
+def get_query_limits(role_name=None):
+    """Rol adına göre sorgu sınırlarını döndürür, tanımsız roller `default` sınırlarını kullanır"""
+    configured = getattr(settings, 'GRAPHQL_QUERY_LIMITS', {})
+    limits = {**DEFAULT_QUERY_LIMITS, **configured.get('default', {})}
+    if role_name:
+        limits.update(configured.get(role_name, {}))
+    return limits
+
+
+class QueryCostAnalyzer:
+    """
+    Dokümanı çalıştırmadan önce şema üzerinde gezerek maliyet, derinlik ve en büyük sayfa
+    boyutunu hesaplar. Her alan 1 puandır; liste ve bağlantı alanlarının alt seçimleri
+    `first`/`last` değeri (verilmemişse RELAY_CONNECTION_MAX_LIMIT) ile çarpılır.
+    """
+
+    def __init__(self, schema, document, variables=None):
+        self.schema = schema
+        self.variables = variables or {}
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document.definitions
+            if isinstance(definition, FragmentDefinitionNode)
+        }
+        self.default_page_size = graphene_settings.RELAY_CONNECTION_MAX_LIMIT or DEFAULT_QUERY_LIMITS['max_page_size']
+        self.max_depth = 0
+        self.max_page_size = 0
+
+    def analyze(self, operation):
+        root_type = self.schema.get_root_type(operation.operation)
+        cost = self.selection_cost(operation.selection_set, root_type, 1, set())
+        return {'cost': cost, 'depth': self.max_depth, 'max_page_size': self.max_page_size}
+
+    def selection_cost(self, selection_set, parent_type, depth, visited_fragments):
+        if selection_set is None:
+            return 0
+
+        cost = 0
+        for selection in selection_set.selections:
+            if isinstance(selection, FieldNode):
+                cost += self.field_cost(selection, parent_type, depth, visited_fragments)
+            elif isinstance(selection, InlineFragmentNode):
+                fragment_type = parent_type
+                if selection.type_condition:
+                    fragment_type = self.schema.get_type(selection.type_condition.name.value)
+                cost += self.selection_cost(selection.selection_set, fragment_type, depth, visited_fragments)
+            elif isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                if fragment is None or name in visited_fragments:
+                    continue
+                fragment_type = self.schema.get_type(fragment.type_condition.name.value)
+                cost += self.selection_cost(
+                    fragment.selection_set, fragment_type, depth, visited_fragments | {name}
+                )
+        return cost
+
+    def field_cost(self, field_node, parent_type, depth, visited_fragments):
+        name = field_node.name.value
+        if name.startswith('__'):
+            return 0
+
+        fields = getattr(parent_type, 'fields', None) or {}
+        field = fields.get(name)
+        if field is None:
+            return 0
+
+        self.max_depth = max(self.max_depth, depth)
+        field_type = get_nullable_type(field.type)
+        named_type = get_named_type(field_type)
+
+        multiplier = 1
+        page_size = self.page_size(field_node)
+        if page_size is not None:
+            self.max_page_size = max(self.max_page_size, page_size)
+            multiplier = page_size
+        elif named_type.name.endswith('Connection') or (
+            # Bağlantı içindeki `edges` listesi bağlantının sayfa boyutuyla zaten çarpılmıştır
+            isinstance(field_type, GraphQLList) and not parent_type.name.endswith('Connection')
+        ):
+            multiplier = self.default_page_size
+
+        child_cost = self.selection_cost(field_node.selection_set, named_type, depth + 1, visited_fragments)
+        return 1 + multiplier * child_cost
+
+    def page_size(self, field_node):
+        sizes = []
+        for argument in field_node.arguments or ():
+            if argument.name.value not in PAGE_SIZE_ARGUMENTS:
+                continue
+            value = argument.value
+            if isinstance(value, VariableNode):
+                value = self.variables.get(value.name.value)
+            elif isinstance(value, IntValueNode):
+                value = int(value.value)
+            else:
+                value = None
+            if isinstance(value, int):
+                sizes.append(value)
+        return max(sizes) if sizes else None
+
+
+def analyze_query(schema, document, operation_name=None, variables=None):
+    """Çalıştırılacak operasyonun maliyet analizini döndürür, operasyon bulunamazsa None"""
+    operation = get_operation_ast(document, operation_name)
+    if operation is None:
+        return None
+    return QueryCostAnalyzer(schema, document, variables).analyze(operation)
+
+
+def check_query_limits(analysis, limits):
+    """Sınır aşılmışsa QueryLimitError döndürür"""
+    if analysis['depth'] > limits['max_depth']:
+        return QueryLimitError(
+            f"Sorgu derinliği sınırı aşıldı ({analysis['depth']} > {limits['max_depth']})",
+            'QUERY_TOO_DEEP', analysis, limits
+        )
+    if analysis['max_page_size'] > limits['max_page_size']:
+        return QueryLimitError(
+            f"Sayfa boyutu sınırı aşıldı ({analysis['max_page_size']} > {limits['max_page_size']})",
+            'PAGE_SIZE_TOO_LARGE', analysis, limits
+        )
+    if analysis['cost'] > limits['max_cost']:
+        return QueryLimitError(
+            f"Sorgu maliyeti sınırı aşıldı ({analysis['cost']} > {limits['max_cost']})",
+            'QUERY_TOO_COMPLEX', analysis, limits
+        )
+    return None
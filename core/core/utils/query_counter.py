@@ -0,0 +1,102 @@
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .conf import get_setting_group
+from .logging import log_warning
+
+# Operasyon başına SQL sayacı ve N+1 tespiti
+DEFAULT_QUERY_COUNTER_SETTINGS = {
+    'enabled': True,
+    'expose_extensions': None,  # Sorgu sayısı, süre ve tekrarlar `extensions.sql` alanına eklenir; None ise DEBUG
+    'duplicate_threshold': 10,  # Aynı SQL şekli bundan fazla çalışırsa log_warning ile uyarı verilir
+}
+
+# Aynı sorgunun farklı uzunluktaki IN listeleri tek bir şekil olarak sayılır
+IN_LIST_PATTERN = re.compile(r'\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)', re.IGNORECASE)
+LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def get_query_counter_settings():
+    config = get_setting_group('GRAPHQL_QUERY_COUNTER', DEFAULT_QUERY_COUNTER_SETTINGS)
+    if config['expose_extensions'] is None:
+        config['expose_extensions'] = settings.DEBUG
+    return config
+
+
+def normalize_sql(sql):
+    """Parametre ve sabitleri atarak sorgunun şeklini çıkarır"""
+    sql = IN_LIST_PATTERN.sub('IN (...)', sql)
+    sql = LITERAL_PATTERN.sub('?', sql)
+    return WHITESPACE_PATTERN.sub(' ', sql).strip()
+
+
+class QueryCounter:
+    """
+    Bir GraphQL operasyonu boyunca tüm veritabanı bağlantılarına `execute_wrapper` takar;
+    sorgu sayısını, toplam SQL süresini ve tekrar eden sorgu şekillerini toplar. Aynı şekil
+    `duplicate_threshold` kereden fazla çalıştıysa N+1 şüphesiyle uyarı loglanır.
+    """
+
+    def __init__(self, operation_name=None):
+        self.operation_name = operation_name
+        self.settings = get_query_counter_settings()
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.databases = Counter()
+        self.stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.shapes[normalize_sql(sql)] += 1
+            self.databases[context['connection'].alias] += 1
+
+    def __enter__(self):
+        if self.settings['enabled']:
+            self.stack = ExitStack()
+            for alias in connections:
+                self.stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.stack is None:
+            return
+        self.stack.close()
+        duplicates = self.duplicates()
+        if duplicates:
+            log_warning('graphql', 'Tekrarlanan SQL sorgusu tespit edildi (olası N+1)', {
+                'operation': self.operation_name,
+                'queries': self.count,
+                'duplicates': duplicates,
+            })
+
+    def duplicates(self):
+        threshold = self.settings['duplicate_threshold']
+        return [
+            {'sql': sql, 'count': count}
+            for sql, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+    def report(self):
+        return {
+            'queries': self.count,
+            'duration_ms': round(self.duration * 1000, 2),
+            'databases': dict(self.databases),
+            'duplicates': [
+                {'sql': sql, 'count': count}
+                for sql, count in self.shapes.most_common()
+                if count > 1
+            ],
+        }
@@ -0,0 +1,124 @@
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Prefetch, QuerySet
+from graphene.utils.str_converters import to_snake_case
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+
+from core.utils.dataloaders import BatchedFilterConnectionField
+
+# Seçilmediğinde sorgudan çıkarılan büyük kolon tipleri
+HEAVY_FIELD_TYPES = (models.TextField,)
+
+# Bağlantı alanlarında filtre sayılmayan sayfalama argümanları
+PAGINATION_ARGUMENTS = {'first', 'last', 'before', 'after', 'offset'}
+
+
+def collect_fields(selection_set, info):
+    """Seçim kümesindeki alanları fragment'lar dahil isimlerine göre gruplar"""
+    fields = defaultdict(list)
+    if selection_set is None:
+        return fields
+
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            fields[selection.name.value].append(selection)
+        elif isinstance(selection, InlineFragmentNode):
+            for name, nodes in collect_fields(selection.selection_set, info).items():
+                fields[name].extend(nodes)
+        elif isinstance(selection, FragmentSpreadNode):
+            fragment = info.fragments.get(selection.name.value)
+            if fragment is not None:
+                for name, nodes in collect_fields(fragment.selection_set, info).items():
+                    fields[name].extend(nodes)
+    return fields
+
+
+def collect_sub_fields(field_nodes, info):
+    fields = defaultdict(list)
+    for field_node in field_nodes:
+        for name, nodes in collect_fields(field_node.selection_set, info).items():
+            fields[name].extend(nodes)
+    return fields
+
+
+def collect_connection_node_fields(field_nodes, info):
+    """Relay bağlantısında `edges { node { ... } }` altındaki alanları döndürür"""
+    edges = collect_sub_fields(field_nodes, info).get('edges', [])
+    nodes = collect_sub_fields(edges, info).get('node', [])
+    return collect_sub_fields(nodes, info)
+
+
+def has_filter_arguments(field_nodes):
+    return any(
+        argument.name.value not in PAGINATION_ARGUMENTS
+        for field_node in field_nodes
+        for argument in field_node.arguments or ()
+    )
+
+
+def build_plan(model, fields, info, prefix=''):
+    """Seçili alanlara göre select_related, prefetch ve defer listelerini çıkarır"""
+    plan = {'select_related': [], 'prefetches': [], 'deferred': []}
+    selected = set()
+
+    for name, field_nodes in fields.items():
+        try:
+            field = model._meta.get_field(to_snake_case(name))
+        except FieldDoesNotExist:
+            continue
+        selected.add(field.name)
+
+        if field.concrete and (field.many_to_one or field.one_to_one):
+            plan['select_related'].append(prefix + field.name)
+            related_plan = build_plan(
+                field.related_model, collect_sub_fields(field_nodes, info), info, f'{prefix}{field.name}__'
+            )
+            for key, values in related_plan.items():
+                plan[key].extend(values)
+        elif field.one_to_many and not has_filter_arguments(field_nodes):
+            # Filtreli ters ilişkiler veri yükleyici tarafından filtreleriyle birlikte toplanır
+            child_queryset = apply_plan(
+                field.related_model._default_manager.order_by('pk'),
+                build_plan(field.related_model, collect_connection_node_fields(field_nodes, info), info),
+            )
+            plan['prefetches'].append(Prefetch(prefix + field.get_accessor_name(), queryset=child_queryset))
+
+    plan['deferred'].extend(
+        prefix + field.name
+        for field in model._meta.concrete_fields
+        if isinstance(field, HEAVY_FIELD_TYPES) and field.name not in selected
+    )
+    return plan
+
+
+def apply_plan(queryset, plan):
+    if plan['select_related']:
+        queryset = queryset.select_related(*plan['select_related'])
+    if plan['prefetches']:
+        queryset = queryset.prefetch_related(*plan['prefetches'])
+    if plan['deferred']:
+        queryset = queryset.defer(*plan['deferred'])
+    return queryset
+
+
+def optimize_queryset(queryset, info):
+    """Bağlantı sorgusunu GraphQL seçim kümesine göre yeniden yazar"""
+    fields = collect_connection_node_fields(info.field_nodes, info)
+    return apply_plan(queryset, build_plan(queryset.model, fields, info))
+
+
+class OptimizedFilterConnectionField(BatchedFilterConnectionField):
+    """Seçim kümesine göre join, prefetch ve defer uygulayan filtreli bağlantı alanı"""
+
+    @classmethod
+    def prepare_queryset(cls, queryset, info):
+        return optimize_queryset(queryset, info)
+
+    @classmethod
+    def resolve_queryset(cls, connection, iterable, info, args, filtering_args, filterset_class):
+        queryset = super().resolve_queryset(connection, iterable, info, args, filtering_args, filterset_class)
+        if isinstance(queryset, QuerySet):
+            queryset = optimize_queryset(queryset, info)
+        return queryset
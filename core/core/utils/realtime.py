@@ -0,0 +1,162 @@
+import asyncio
+import json
+import weakref
+
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from .conf import get_setting_group
+from .logging import log_warning
+
+# /events/ Server-Sent Events uç noktası (Redis pub/sub üzerinden dağıtılır)
+DEFAULT_REALTIME_SETTINGS = {
+    'heartbeat': 15,  # Olay yoksa bu kadar saniyede bir bağlantıyı canlı tutma mesajı gönderilir
+    'max_lifetime': 300,  # Akış bu süre sonunda kapanır, tarayıcı otomatik yeniden bağlanır (saniye)
+    'max_connections': 1000,  # Süreç başına en fazla eşzamanlı pub/sub bağlantısı
+    'redis_url': None,  # Boşsa varsayılan cache'in Redis adresi kullanılır
+}
+
+CHANNEL_PREFIX = 'events:user'
+RETRY_MS = 5000
+# Havuz dolduğunda istemcinin yeniden bağlanmadan önce bekleyeceği süre
+BUSY_RETRY_MS = 30000
+
+# redis.asyncio bağlantıları oluşturuldukları olay döngüsüne bağlıdır
+_async_pools = weakref.WeakKeyDictionary()
+
+
+def get_realtime_settings():
+    return get_setting_group('REALTIME_EVENTS', DEFAULT_REALTIME_SETTINGS)
+
+
+def user_channel(user_id):
+    return f'{CHANNEL_PREFIX}:{user_id}'
+
+
+def publish_event(user_ids, event_type, payload):
+    """Olayı kullanıcı kanallarına yayınlar; bağlı olduğu worker fark etmeksizin istemciye ulaşır"""
+    message = json.dumps({'type': event_type, 'data': payload}, ensure_ascii=False, default=str)
+    try:
+        redis = get_redis_connection('default')
+        for user_id in {user_id for user_id in user_ids if user_id}:
+            redis.publish(user_channel(user_id), message)
+    except Exception as e:
+        log_warning('realtime', 'Olay yayınlanamadı', {'type': event_type, 'error': str(e)})
+
+
+def publish_event_on_commit(get_user_ids, event_type, payload):
+    """İşlem commit edilmeden istemciye olay gitmemesi için yayını ertelemeye alır"""
+    transaction.on_commit(lambda: publish_event(get_user_ids(), event_type, payload))
+
+
+def format_sse(event_type, data):
+    return f'event: {event_type}\ndata: {data}\n\n'
+
+
+def get_async_redis():
+    """
+    Olay döngüsü başına (uvicorn'da süreç başına) tek bir redis.asyncio bağlantı havuzu
+    kullanılır; her akış havuzdan bir pub/sub bağlantısı alır ve kapanınca iade eder.
+    `max_connections` Redis'in istemci sınırına ulaşılmasını engeller.
+    """
+    from redis import asyncio as aioredis
+
+    loop = asyncio.get_running_loop()
+    pool = _async_pools.get(loop)
+    if pool is None:
+        realtime_settings = get_realtime_settings()
+        redis_url = realtime_settings['redis_url'] or settings.CACHES['default']['LOCATION']
+        pool = _async_pools[loop] = aioredis.BlockingConnectionPool.from_url(
+            redis_url, max_connections=realtime_settings['max_connections'], timeout=1
+        )
+    return aioredis.Redis(connection_pool=pool)
+
+
+async def event_stream(user_id):
+    """
+    Kullanıcının Redis kanalını dinleyip Server-Sent Events biçiminde üretir.
+    Proxy'lerin bağlantıyı kapatmaması için belirli aralıklarla yorum satırı gönderilir.
+    Akış `max_lifetime` saniye sonra kapanır, tarayıcı `retry` süresi sonunda yeniden bağlanır;
+    böylece kopan bir bağlantı fark edilmese bile abonelik süresiz açık kalmaz. İstemcinin
+    ayrıldığı ASGI katmanında `CancelOnDisconnectMiddleware` ile yakalanır.
+    """
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    realtime_settings = get_realtime_settings()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + realtime_settings['max_lifetime']
+    pubsub = get_async_redis().pubsub(ignore_subscribe_messages=True)
+    try:
+        try:
+            await pubsub.subscribe(user_channel(user_id))
+        except RedisConnectionError as e:
+            log_warning('realtime', 'Olay akışı için Redis bağlantısı alınamadı', {'user_id': user_id, 'error': str(e)})
+            yield f'retry: {BUSY_RETRY_MS}\n\n'
+            return
+
+        yield f'retry: {RETRY_MS}\n\n'
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            message = await pubsub.get_message(timeout=min(realtime_settings['heartbeat'], remaining))
+            if message is None:
+                yield ': ping\n\n'
+                continue
+            event = json.loads(message['data'])
+            yield format_sse(event['type'], json.dumps(event['data'], ensure_ascii=False))
+    finally:
+        await pubsub.aclose()
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    Django 4.2 akış yanıtı gönderirken istemcinin ayrıldığını (`http.disconnect`) dinlemez ve
+    uvicorn kapalı bağlantıya yazmayı sessizce yok sayar. Bu ASGI katmanı verilen yollarda istek
+    gövdesi okunduktan sonra `receive` kanalını izler; istemci ayrılınca isteği işleyen görevi
+    iptal eder, böylece akışın `finally` bloğu çalışır ve Redis bağlantısı havuza döner.
+    """
+
+    def __init__(self, app, paths=('/events/',)):
+        self.app = app
+        self.paths = tuple(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not scope['path'].startswith(self.paths):
+            return await self.app(scope, receive, send)
+
+        disconnected = asyncio.get_running_loop().create_future()
+        watcher = None
+
+        async def watch_disconnect():
+            message = await receive()
+            if not disconnected.done():
+                disconnected.set_result(message)
+
+        async def app_receive():
+            nonlocal watcher
+            if watcher is not None:
+                # Gövde okunduktan sonra gelebilecek tek mesaj http.disconnect'tir
+                return await asyncio.shield(disconnected)
+            message = await receive()
+            if message['type'] == 'http.request' and not message.get('more_body', False):
+                watcher = asyncio.ensure_future(watch_disconnect())
+            return message
+
+        app_task = asyncio.ensure_future(self.app(scope, app_receive, send))
+        try:
+            await asyncio.wait({app_task, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if not app_task.done():
+                app_task.cancel()
+                try:
+                    await app_task
+                except asyncio.CancelledError:
+                    pass
+                return
+            return app_task.result()
+        finally:
+            if not app_task.done():
+                app_task.cancel()
+            if watcher is not None:
+                watcher.cancel()
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db import models, transaction
+from graphene.utils.str_converters import to_snake_case
+from graphql import get_named_type
+from graphql_relay import from_global_id
+
+from .conf import get_setting_group
+from .logging import log_warning
+
+# Okuma sorguları için etiket tabanlı yanıt önbelleği
+DEFAULT_RESPONSE_CACHE_SETTINGS = {
+    'enabled': True,
+    'timeout': 300,  # Etiketler geçersiz kılınmasa da yanıtın tutulacağı en uzun süre
+}
+
+ENTRY_KEY_PREFIX = 'graphql:response'
+TAG_KEY_PREFIX = 'graphql:tag'
+INVALIDATED_KEY_PREFIX = 'graphql:invalidated'
+
+
+def get_response_cache_settings():
+    return get_setting_group('GRAPHQL_RESPONSE_CACHE', DEFAULT_RESPONSE_CACHE_SETTINGS)
+
+
+def model_tag(model, pk):
+    return f'{model._meta.model_name}:{pk}'
+
+
+def list_tag(model):
+    return f'{model._meta.model_name}:list'
+
+
+def instance_tags(instance):
+    """Bir kayıt değiştiğinde geçersiz kılınacak etiketler: kaydın kendisi, ilişkili kayıtlar ve liste"""
+    tags = {model_tag(instance, instance.pk), list_tag(instance)}
+    for field in instance._meta.concrete_fields:
+        if field.many_to_one or field.one_to_one:
+            related_id = getattr(instance, field.attname)
+            if related_id is not None:
+                tags.add(model_tag(field.related_model, related_id))
+    return tags
+
+
+def scope_for(request):
+    """Önbellek kapsamı: kullanıcı ve rol versiyonu, yetki değiştiğinde eski kayıtlar kullanılmaz"""
+    user = getattr(request, 'user', None)
+    if not user or not user.is_authenticated:
+        return 'anonymous'
+    role = getattr(user, 'role', None)
+    return f'{user.pk}:{role.version if role else 0}'
+
+
+def response_cache_key(document_key, operation_name, variables, scope):
+    normalized = json.dumps(
+        [document_key, operation_name, variables or {}, scope], sort_keys=True, default=str
+    )
+    return f'{ENTRY_KEY_PREFIX}:{hashlib.sha256(normalized.encode("utf-8")).hexdigest()}'
+
+
+def tag_key(tag):
+    return f'{TAG_KEY_PREFIX}:{tag}'
+
+
+def invalidated_key(tag):
+    return f'{INVALIDATED_KEY_PREFIX}:{tag}'
+
+
+def invalidated_since(tags, since):
+    """Etiketlerden herhangi biri `since` anından sonra geçersiz kılındıysa True döner"""
+    stored = cache.get_many([invalidated_key(tag) for tag in tags])
+    return any(invalidated_at >= since for invalidated_at in stored.values())
+
+
+def get_tag_versions(tags):
+    keys = {tag_key(tag): tag for tag in tags}
+    stored = cache.get_many(list(keys))
+    return {tag: stored.get(key, 0) for key, tag in keys.items()}
+
+
+def get_cached_response(key):
+    """Etiket versiyonları değişmemişse kayıtlı yanıt verisini döndürür"""
+    try:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if get_tag_versions(entry['tags']) != entry['tags']:
+            return None
+        return entry['data']
+    except Exception as e:
+        log_warning('graphql', 'Yanıt önbelleği okunamadı', {'error': str(e)})
+        return None
+
+
+def set_cached_response(key, data, tags, not_before=None):
+    """
+    Yanıtı etiket versiyonlarıyla birlikte yazar. Etiketi olmayan yanıtlar (ör. Redis'teki iş
+    durumu, özet tablolar, otomatik tamamlama) hiçbir değişiklikle geçersiz kılınamayacağından
+    yazılmaz. Etiketlerinden biri `not_before` anından sonra geçersiz kılındıysa okuma bu
+    değişikliği görmemiş olabileceğinden yine yazılmaz.
+    """
+    if not tags:
+        return False
+    try:
+        if not_before is not None and invalidated_since(tags, not_before):
+            return False
+        cache.set(key, {'data': data, 'tags': get_tag_versions(tags)}, get_response_cache_settings()['timeout'])
+        return True
+    except Exception as e:
+        log_warning('graphql', 'Yanıt önbelleğe yazılamadı', {'error': str(e)})
+        return False
+
+
+def invalidate_tags(tags):
+    """
+    Etiket versiyonlarını artırarak bu etiketleri taşıyan tüm yanıtları geçersiz kılar.
+    Geçersiz kılma anı da saklanır; replikalar bu değişikliği yakalayana kadar önbellek doldurulmaz.
+    """
+    try:
+        cache.set_many(
+            {invalidated_key(tag): time.time() for tag in tags}, get_response_cache_settings()['timeout']
+        )
+    except Exception as e:
+        log_warning('graphql', 'Önbellek etiketi geçersiz kılma anı yazılamadı', {'tags': sorted(tags), 'error': str(e)})
+    for tag in tags:
+        key = tag_key(tag)
+        try:
+            if not cache.add(key, 1, None):
+                cache.incr(key)
+        except Exception as e:
+            log_warning('graphql', 'Önbellek etiketi geçersiz kılınamadı', {'tag': tag, 'error': str(e)})
+
+
+def invalidate_instance(instance):
+    """Kayıt değişikliğini işlem commit edildikten sonra önbelleğe yansıtır"""
+    tags = instance_tags(instance)
+    transaction.on_commit(lambda: invalidate_tags(tags))
+
+
+class ResponseCacheTagMiddleware:
+    """
+    Önbelleğe alınacak sorgularda çözülen model kayıtlarından etiket toplar.
+    Bağlantı alanları ilişki filtresiyle sorgulandıysa ilgili kaydın etiketini (ör. `company:3`),
+    filtresizse modelin liste etiketini alır; böylece yeni kayıtlar da doğru yanıtları geçersiz kılar.
+    """
+
+    def resolve(self, next, root, info, **args):
+        tags = getattr(info.context, 'response_cache_tags', None)
+        if tags is not None:
+            self.collect_connection_tags(tags, info, args)
+
+        result = next(root, info, **args)
+        if tags is not None and isinstance(result, models.Model):
+            tags.add(model_tag(result, result.pk))
+        return result
+
+    def collect_connection_tags(self, tags, info, args):
+        if info.path.prev is not None:
+            # İç içe bağlantılar üst kaydın etiketiyle geçersiz kılınır
+            return
+
+        connection_type = getattr(get_named_type(info.return_type), 'graphene_type', None)
+        node_type = getattr(getattr(connection_type, '_meta', None), 'node', None)
+        model = getattr(getattr(node_type, '_meta', None), 'model', None)
+        if model is None:
+            return
+
+        related_tags = set()
+        for name, value in args.items():
+            try:
+                field = model._meta.get_field(to_snake_case(name))
+            except Exception:
+                continue
+            if value is None or not (field.many_to_one or field.one_to_one):
+                continue
+            related_tags.add(model_tag(field.related_model, self.decode_id(value)))
+        tags.update(related_tags or {list_tag(model)})
+
+    @staticmethod
+    def decode_id(value):
+        try:
+            _, pk = from_global_id(value)
+            return pk or value
+        except Exception:
+            return value
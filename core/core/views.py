@@ -0,0 +1,389 @@
+import json
+import time
+from inspect import isawaitable
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import close_old_connections, connection, transaction
+from django.views import View
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBadRequest
+from graphene_django.constants import MUTATION_ERRORS_FLAG
+from graphene_django.settings import graphene_settings
+from graphene_django.utils.utils import set_rollback
+from graphene_django.views import HttpError
+from graphene_file_upload.django import FileUploadGraphQLView
+from graphql import (
+    ExecutionContext,
+    ExecutionResult,
+    OperationType,
+    execute,
+    get_operation_ast,
+    parse,
+    validate_schema,
+)
+from graphql.validation import validate
+
+from core.middleware import JWTAuthenticationMiddleware
+from core.utils.db_router import (
+    choose_read_database,
+    get_read_replica_settings,
+    mark_recent_write,
+    replica_aliases,
+    use_read_database,
+)
+from core.utils.document_cache import get_document_cache
+from core.utils.logging import log_warning
+from core.utils.metrics import observe_operation
+from core.utils.persisted_queries import (
+    PersistedQueryError,
+    get_persisted_query_hash,
+    get_persisted_query_registry,
+    hash_query,
+)
+from core.utils.realtime import event_stream
+from core.utils.query_counter import QueryCounter
+from core.utils.query_cost import analyze_query, check_query_limits, get_query_limits
+from core.utils.response_cache import (
+    get_cached_response,
+    get_response_cache_settings,
+    response_cache_key,
+    scope_for,
+    set_cached_response,
+)
+
+
+class AsyncRootExecutionContext(ExecutionContext):
+    """
+    Operasyonu olay döngüsünde yürütür. Kök alanlar coroutine olarak çözülür: senkron
+    çözücüler ve alt seçimleri (ORM erişimi dahil) sync_to_async ile isteğin iş parçacığında
+    tamamlanır, async çözücüler (ör. AuthMutation'ın Redis hız sınırları) döngüyü bloklamadan
+    beklenir. Async çözücüler ORM'e tembel erişim gerektirmeyen değerler döndürmelidir;
+    alt alanları döngüde tamamlanır.
+    """
+
+    def execute_field(self, parent_type, source, field_nodes, path):
+        if path.prev is not None:
+            return super().execute_field(parent_type, source, field_nodes, path)
+        return self.execute_root_field(parent_type, source, field_nodes, path)
+
+    async def execute_root_field(self, parent_type, source, field_nodes, path):
+        result = await sync_to_async(super().execute_field)(parent_type, source, field_nodes, path)
+        if self.is_awaitable(result):
+            result = await result
+        return result
+
+
+def execute_on_event_loop(schema, document, **execute_options):
+    """
+    Çağıran iş parçacığı (ASGI'de isteğin iş parçacığı) kök alanların senkron işlerini üstlenir;
+    böylece veritabanı bağlantısı, işlem (transaction) ve SQL sayacı istek boyunca aynı kalır.
+    """
+    async def run():
+        result = execute(schema, document, **execute_options)
+        return await result if isawaitable(result) else result
+
+    return async_to_sync(run)()
+
+
+class GraphQLView(FileUploadGraphQLView):
+    """
+    /graphql/ uç noktası. Dosya yüklemeye ek olarak Apollo uyumlu otomatik persisted
+    query (APQ) desteği sağlar: istemci sorgu metni yerine SHA-256 hash gönderebilir.
+    Doğrulanmış dokümanlar sorgu hash'ine göre LRU önbellekte tutulur, tekrar eden
+    sorgularda parse ve doğrulama adımları atlanır. Çalıştırmadan önce rol bazlı
+    maliyet/derinlik sınırları uygulanır ve hesaplanan maliyet `extensions.cost` alanında döner.
+    Okuma operasyonlarının yanıtları etiketlerle Redis'te önbelleğe alınır. Operasyonlar
+    `AsyncRootExecutionContext` ile olay döngüsünde yürütülür.
+    """
+
+    execution_context_class = AsyncRootExecutionContext
+
+    @staticmethod
+    def get_extensions(request, data):
+        extensions = request.GET.get('extensions') or data.get('extensions')
+        if extensions and isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except Exception:
+                raise HttpError(HttpResponseBadRequest('Extensions are invalid JSON.'))
+        return extensions
+
+    @staticmethod
+    def get_role_name(request):
+        """Sorgu sınırları çalıştırmadan önce belirlendiği için kimlik doğrulama burada yapılır"""
+        JWTAuthenticationMiddleware().authenticate(request)
+        return request.user_role.name if request.user_role else None
+
+    def get_document(self, schema, query, document_key):
+        """
+        Çalıştırılacak dokümanı ve doğrulanmış olup olmadığını döndürür.
+        Önce süreç içi LRU önbelleğe, sorgu metni yoksa APQ kaydına bakılır.
+        Hata durumunda ExecutionResult döner.
+        """
+        document_cache = get_document_cache(schema)
+        document = document_cache.get(document_key)
+        if document is not None:
+            return document, True
+
+        if not query:
+            query = get_persisted_query_registry(schema).get(document_key)
+            if query is None:
+                return ExecutionResult(errors=[
+                    PersistedQueryError('PersistedQueryNotFound', 'PERSISTED_QUERY_NOT_FOUND')
+                ]), False
+
+            # Kayıtlı sorgular kaydedilmeden önce doğrulanmıştır
+            document = parse(query)
+            document_cache.set(document_key, document)
+            return document, True
+
+        try:
+            return parse(query), False
+        except Exception as e:
+            return ExecutionResult(errors=[e]), False
+
+    def execute_graphql_request(
+        self, request, data, query, variables, operation_name, show_graphiql=False
+    ):
+        try:
+            sha256_hash = get_persisted_query_hash(self.get_extensions(request, data))
+        except PersistedQueryError as e:
+            return ExecutionResult(errors=[e])
+
+        if not query and not sha256_hash:
+            if show_graphiql:
+                return None
+            raise HttpError(HttpResponseBadRequest("Must provide query string."))
+
+        schema = self.schema.graphql_schema
+
+        schema_validation_errors = validate_schema(schema)
+        if schema_validation_errors:
+            return ExecutionResult(data=None, errors=schema_validation_errors)
+
+        document_key = hash_query(query) if query else sha256_hash
+        if sha256_hash and document_key != sha256_hash:
+            return ExecutionResult(errors=[
+                PersistedQueryError('provided sha does not match query', 'PERSISTED_QUERY_HASH_MISMATCH')
+            ])
+
+        document, validated = self.get_document(schema, query, document_key)
+        if isinstance(document, ExecutionResult):
+            return document
+
+        operation_ast = get_operation_ast(document, operation_name)
+
+        if (
+            request.method.lower() == "get"
+            and operation_ast is not None
+            and operation_ast.operation != OperationType.QUERY
+        ):
+            if show_graphiql:
+                return None
+
+            raise HttpError(
+                HttpResponseNotAllowed(
+                    ["POST"],
+                    "Can only perform a {} operation from a POST request.".format(
+                        operation_ast.operation.value
+                    ),
+                )
+            )
+
+        if not validated:
+            validation_errors = validate(
+                schema,
+                document,
+                self.validation_rules,
+                graphene_settings.MAX_VALIDATION_ERRORS,
+            )
+
+            if validation_errors:
+                return ExecutionResult(data=None, errors=validation_errors)
+
+            get_document_cache(schema).set(document_key, document)
+
+        if sha256_hash and query:
+            get_persisted_query_registry(schema).register(sha256_hash, query)
+
+        analysis = analyze_query(schema, document, operation_name, variables)
+        if analysis is not None:
+            role_name = self.get_role_name(request)
+            limit_error = check_query_limits(analysis, get_query_limits(role_name))
+            if limit_error is not None:
+                log_warning('graphql', 'Sorgu sınırı aşıldı', {
+                    'role': role_name,
+                    'operation': operation_name,
+                    'code': limit_error.extensions['code'],
+                    **analysis
+                })
+                return ExecutionResult(errors=[limit_error], extensions={'cost': analysis})
+
+        extensions = {'cost': analysis} if analysis is not None else {}
+        cache_key = self.get_response_cache_key(request, operation_ast, document_key, operation_name, variables)
+        if cache_key is not None:
+            cached_data = get_cached_response(cache_key)
+            if cached_data is not None:
+                return ExecutionResult(data=cached_data, extensions={**extensions, 'cache': 'HIT'})
+            extensions['cache'] = 'MISS'
+            request.response_cache_tags = set()
+
+        try:
+            started = time.time()
+            with QueryCounter(operation_name) as query_counter:
+                result = self.execute_document(request, schema, document, operation_ast, variables, operation_name)
+            if cache_key is not None and not result.errors:
+                set_cached_response(
+                    cache_key, result.data, request.response_cache_tags, self.get_cache_fill_cutoff(request, started)
+                )
+        finally:
+            request.response_cache_tags = None
+
+        if query_counter.settings['expose_extensions']:
+            extensions['sql'] = query_counter.report()
+
+        if extensions:
+            result.extensions = {**(result.extensions or {}), **extensions}
+        return result
+
+    @staticmethod
+    def get_response_cache_key(request, operation_ast, document_key, operation_name, variables):
+        """Yalnızca okuma operasyonları kullanıcı/rol kapsamıyla önbelleğe alınır"""
+        if not get_response_cache_settings()['enabled']:
+            return None
+        if operation_ast is None or operation_ast.operation != OperationType.QUERY:
+            return None
+        JWTAuthenticationMiddleware().authenticate(request)
+        return response_cache_key(document_key, operation_name, variables, scope_for(request))
+
+    @staticmethod
+    def get_cache_fill_cutoff(request, started):
+        """
+        Bu andan sonra geçersiz kılınan etiketleri taşıyan yanıt önbelleğe yazılmaz. Birincilden
+        yapılan okumalar yalnızca çalışırken gelen değişiklikleri, replikadan yapılanlar ise
+        gecikme payı olarak son `sticky_seconds` içindeki değişiklikleri de kaçırmış sayılır.
+        """
+        if getattr(request, 'read_database', None) in replica_aliases():
+            return started - get_read_replica_settings()['sticky_seconds']
+        return started
+
+    def get_response(self, request, data, show_graphiql=False):
+        query, variables, operation_name, id = self.get_graphql_params(request, data)
+
+        execution_result = self.execute_graphql_request(
+            request, data, query, variables, operation_name, show_graphiql
+        )
+
+        if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+            set_rollback()
+
+        status_code = 200
+        if execution_result:
+            response = {}
+
+            if execution_result.errors:
+                set_rollback()
+                response["errors"] = [
+                    self.format_error(e) for e in execution_result.errors
+                ]
+
+            if execution_result.errors and any(
+                not getattr(e, "path", None) for e in execution_result.errors
+            ):
+                status_code = 400
+            else:
+                response["data"] = execution_result.data
+
+            if execution_result.extensions:
+                response["extensions"] = execution_result.extensions
+
+            if self.batch:
+                response["id"] = id
+                response["status"] = status_code
+
+            result = self.json_encode(request, response, pretty=show_graphiql)
+        else:
+            result = None
+
+        return result, status_code
+
+    def execute_document(self, request, schema, document, operation_ast, variables, operation_name):
+        started = time.perf_counter()
+        try:
+            execute_options = {
+                "root_value": self.get_root_value(request),
+                "context_value": self.get_context(request),
+                "variable_values": variables,
+                "operation_name": operation_name,
+                "middleware": self.get_middleware(request),
+            }
+            if self.execution_context_class:
+                execute_options[
+                    "execution_context_class"
+                ] = self.execution_context_class
+
+            if (
+                operation_ast is not None
+                and operation_ast.operation == OperationType.MUTATION
+                and (
+                    graphene_settings.ATOMIC_MUTATIONS is True
+                    or connection.settings_dict.get("ATOMIC_MUTATIONS", False) is True
+                )
+            ):
+                with transaction.atomic():
+                    result = execute_on_event_loop(schema, document, **execute_options)
+                    if getattr(request, MUTATION_ERRORS_FLAG, False) is True:
+                        transaction.set_rollback(True)
+                return result
+
+            request.read_database = self.get_read_database(request, operation_ast)
+            with use_read_database(request.read_database):
+                return execute_on_event_loop(schema, document, **execute_options)
+        except Exception as e:
+            return ExecutionResult(errors=[e])
+        finally:
+            if operation_ast is not None and operation_ast.operation == OperationType.MUTATION:
+                mark_recent_write(getattr(request, 'user', None))
+            if operation_ast is not None and operation_ast.name is not None:
+                operation_name = operation_ast.name.value
+            observe_operation(operation_name, (time.perf_counter() - started) * 1000)
+
+    @staticmethod
+    def get_read_database(request, operation_ast):
+        """Query operasyonları replikadan okunur, mutasyonlar birincilde kalır"""
+        if operation_ast is None or operation_ast.operation != OperationType.QUERY:
+            return None
+        return choose_read_database(JWTAuthenticationMiddleware().authenticate(request))
+
+
+def authenticate_request(request):
+    """
+    JWT'yi `Authorization` başlığından ya da başlık gönderilemeyen istemciler
+    (EventSource, indirme bağlantıları) için `?token=` parametresinden doğrular.
+    """
+    token = request.GET.get('token')
+    if token and not request.META.get('HTTP_AUTHORIZATION'):
+        request.META['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    try:
+        return JWTAuthenticationMiddleware().authenticate(request)
+    finally:
+        close_old_connections()
+
+
+class EventStreamView(View):
+    """
+    Oturum açmış kullanıcıya staj durumu, günlük geri bildirimi ve değerlendirme onayı
+    olaylarını Server-Sent Events ile iletir.
+    """
+
+    http_method_names = ['get']
+
+    async def get(self, request, *args, **kwargs):
+        user = await sync_to_async(authenticate_request)(request)
+        if not user.is_authenticated:
+            return JsonResponse({'message': 'Lütfen giriş yapınız.'}, status=401)
+
+        response = StreamingHttpResponse(event_stream(user.pk), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
@@ -53,6 +53,16 @@ def create_permissions():
             'name': 'Staj Günlüğü Listeleme',
             'codename': 'internshipManage.InternshipDiaryList',
             'description': 'Staj günlüklerini listeleme yetkisi'
+        },
+        {
+            'name': 'Panel İstatistikleri Görüntüleme',
+            'codename': 'internshipManage.DashboardView',
+            'description': 'Yönetici paneli istatistiklerini görüntüleme yetkisi'
+        },
+        {
+            'name': 'Staj Günlüğü Arama',
+            'codename': 'internshipManage.InternshipDiarySearch',
+            'description': 'Staj günlüklerinde tam metin arama yetkisi'
         }
     ]
 
@@ -97,6 +107,11 @@ def create_permissions():
             'name': 'Profil Güncelleme',
             'codename': 'userManage.ProfileUpdate',
             'description': 'Kendi profilini güncelleme yetkisi'
+        },
+        {
+            'name': 'Şirket Otomatik Tamamlama',
+            'codename': 'userManage.CompanyAutocomplete',
+            'description': 'Staj başvurusunda şirket adını otomatik tamamlama yetkisi'
         }
     ]
 
@@ -167,7 +182,10 @@ def create_roles(permissions):
         permissions['userManage.UserList'],
         permissions['userManage.UserView'],
         permissions['internshipManage.InternshipApplicationList'],
-        permissions['internshipManage.InternshipDiaryList']
+        permissions['internshipManage.InternshipDiaryList'],
+        permissions['internshipManage.DashboardView'],
+        permissions['internshipManage.InternshipDiarySearch'],
+        permissions['userManage.CompanyAutocomplete']
     )
 
     # Öğrenci Rolü
@@ -185,7 +203,8 @@ def create_roles(permissions):
         permissions['internshipManage.InternshipDiaryAdd'],
         permissions['internshipManage.InternshipDiaryUpdate'],
         permissions['internshipManage.InternshipDiaryDelete'],
-        permissions['userManage.ProfileUpdate']
+        permissions['userManage.ProfileUpdate'],
+        permissions['userManage.CompanyAutocomplete']
     )
 
     # Şirket Rolü
@@ -200,7 +219,8 @@ def create_roles(permissions):
         permissions['internshipManage.InternshipApplicationEvaluation'],
         permissions['userManage.CompanyProfileUpdate'],
         permissions['internshipManage.InternshipEvaluationView'],
-        permissions['internshipManage.InternshipApplicationList']
+        permissions['internshipManage.InternshipApplicationList'],
+        permissions['internshipManage.InternshipDiarySearch']
     )
 
 if __name__ == '__main__':
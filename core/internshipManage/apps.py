@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class InternshipmanageConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'internshipManage'
+
+    def ready(self):
+        from . import signals
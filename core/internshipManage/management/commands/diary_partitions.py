@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from internshipManage.models import InternshipDiary
+from internshipManage.utils.partitioning import (
+    academic_year,
+    detach_partitions,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = 'Staj günlüğü tablosunun akademik yıl bölümlerini listeler, önceden oluşturur ya da eski bölümleri ayırır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ensure', action='store_true', help='Eksik bölümleri years_ahead kadar ileriye oluşturur')
+        parser.add_argument('--detach-before', type=int, help='Bu akademik yıldan önceki bölümleri ayırır (ör. 2022)')
+        parser.add_argument('--concurrently', action='store_true', help='DETACH PARTITION ... CONCURRENTLY kullanır')
+
+    def handle(self, *args, **options):
+        table = InternshipDiary._meta.db_table
+        if connection.vendor != 'postgresql':
+            raise CommandError('Tablo bölümleme yalnızca PostgreSQL üzerinde desteklenir.')
+        with connection.cursor() as cursor:
+            if not is_partitioned(cursor, table):
+                raise CommandError(f'{table} tablosu bölümlenmemiş. Önce migration\'ları uygulayın.')
+
+        if options['ensure']:
+            created = ensure_partitions(connection, table)
+            self.stdout.write(self.style.SUCCESS(f'Oluşturulan bölümler: {created or "yok"}'))
+
+        before_year = options['detach_before']
+        if before_year is not None:
+            current = academic_year(timezone.localdate())
+            if before_year > current:
+                raise CommandError(f'Geçerli akademik yılın ({current}) bölümü ayrılamaz.')
+            detached = detach_partitions(connection, table, before_year, concurrently=options['concurrently'])
+            self.stdout.write(self.style.SUCCESS(f'Ayrılan bölümler: {", ".join(detached) or "yok"}'))
+
+        with connection.cursor() as cursor:
+            for name, year in list_partitions(cursor, table):
+                self.stdout.write(f'{name}\t{year}-{year + 1}')
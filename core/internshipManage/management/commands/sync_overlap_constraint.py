@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from internshipManage.models import Internship
+from internshipManage.utils.overlap import apply_overlap_constraint, get_overlap_scope, uses_exclusion_constraint
+
+
+class Command(BaseCommand):
+    help = 'Staj çakışma exclusion constraint\'ini INTERNSHIP_OVERLAP_SCOPE ayarına göre yeniden kurar'
+
+    def handle(self, *args, **options):
+        if not uses_exclusion_constraint(connection):
+            raise CommandError('Exclusion constraint yalnızca PostgreSQL üzerinde desteklenir.')
+
+        scope = get_overlap_scope()
+        with connection.schema_editor() as schema_editor:
+            apply_overlap_constraint(schema_editor, Internship._meta.db_table, scope)
+        self.stdout.write(self.style.SUCCESS(f'Çakışma kontrolü "{scope}" kapsamıyla güncellendi.'))
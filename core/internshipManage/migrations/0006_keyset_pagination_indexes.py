@@ -0,0 +1,25 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internshipManage', '0005_rename_evaulation_evaluation_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['created_at', 'id'], name='evaluation_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internship',
+            index=models.Index(fields=['created_at', 'id'], name='internship_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='internshipdiary',
+            index=models.Index(fields=['date', 'id'], name='diary_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+from internshipManage.utils.overlap import (
+    apply_overlap_constraint,
+    get_overlap_scope,
+    remove_overlap_constraint,
+    uses_exclusion_constraint,
+)
+
+
+def add_constraint(apps, schema_editor):
+    if not uses_exclusion_constraint(schema_editor.connection):
+        return
+    Internship = apps.get_model('internshipManage', 'Internship')
+    apply_overlap_constraint(schema_editor, Internship._meta.db_table, get_overlap_scope())
+
+
+def drop_constraint(apps, schema_editor):
+    if not uses_exclusion_constraint(schema_editor.connection):
+        return
+    Internship = apps.get_model('internshipManage', 'Internship')
+    remove_overlap_constraint(schema_editor, Internship._meta.db_table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internshipManage', '0006_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_constraint, drop_constraint),
+    ]
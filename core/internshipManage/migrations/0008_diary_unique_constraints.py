@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internshipManage', '0007_internship_overlap_constraint'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='internshipdiary',
+            constraint=models.UniqueConstraint(fields=('internship', 'date'), name='diary_unique_internship_date'),
+        ),
+        migrations.AddConstraint(
+            model_name='internshipdiary',
+            constraint=models.UniqueConstraint(fields=('internship', 'day_number'), name='diary_unique_internship_day'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:38
+
+from django.db import migrations, models
+
+from internshipManage.utils.progress import PROGRESS_FIELDS, actual_progress
+
+
+def backfill_progress(apps, schema_editor):
+    Internship = apps.get_model('internshipManage', 'Internship')
+    internships = []
+    for internship in actual_progress(Internship.objects.all()).iterator(chunk_size=500):
+        internship.submitted_diary_count = internship.actual_submitted
+        internship.draft_diary_count = internship.actual_draft
+        internship.total_hours_worked = internship.actual_hours
+        internship.last_diary_date = internship.actual_last_date
+        internships.append(internship)
+    Internship.objects.bulk_update(internships, PROGRESS_FIELDS, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internshipManage', '0008_diary_unique_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='draft_diary_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='last_diary_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='submitted_diary_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='total_hours_worked',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=7),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internshipManage', '0009_internship_progress_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('total', 'Total'), ('status', 'Status'), ('department', 'Department'), ('faculty', 'Faculty'), ('company', 'Company')], max_length=20)),
+                ('key', models.CharField(max_length=100)),
+                ('label', models.CharField(max_length=100)),
+                ('internship_count', models.PositiveIntegerField(default=0)),
+                ('evaluation_count', models.PositiveIntegerField(default=0)),
+                ('average_score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardstat',
+            constraint=models.UniqueConstraint(fields=('dimension', 'key'), name='dashboard_stat_unique_dimension_key'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+from internshipManage.utils.integrity import DIARY_DAY_CONSTRAINT
+from internshipManage.utils.partitioning import partition_diary_table, unpartition_diary_table, uses_partitioning
+
+
+def partition(apps, schema_editor):
+    InternshipDiary = apps.get_model('internshipManage', 'InternshipDiary')
+    if uses_partitioning(schema_editor.connection):
+        partition_diary_table(schema_editor, InternshipDiary)
+        return
+    # Bölümleme yoksa (internship, day_number) benzersizliği aynı adlı benzersiz indeksle korunur
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        f'CREATE UNIQUE INDEX {quote(DIARY_DAY_CONSTRAINT)} '
+        f'ON {quote(InternshipDiary._meta.db_table)} ("internship_id", "day_number")'
+    )
+
+
+def unpartition(apps, schema_editor):
+    InternshipDiary = apps.get_model('internshipManage', 'InternshipDiary')
+    if schema_editor.connection.vendor == 'postgresql':
+        unpartition_diary_table(schema_editor, InternshipDiary)
+    schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(DIARY_DAY_CONSTRAINT)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internshipManage', '0010_dashboard_stats'),
+    ]
+
+    # Bölümlü tabloda (internship, day_number) benzersiz kısıt olamaz; durumda bu kural
+    # indeks olarak tutulur, veritabanında ise trigger ya da benzersiz indeksle uygulanır
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveConstraint(
+                    model_name='internshipdiary',
+                    name='diary_unique_internship_day',
+                ),
+                migrations.AddIndex(
+                    model_name='internshipdiary',
+                    index=models.Index(fields=['internship', 'day_number'], name='diary_unique_internship_day'),
+                ),
+            ],
+            database_operations=[
+                migrations.RemoveConstraint(
+                    model_name='internshipdiary',
+                    name='diary_unique_internship_day',
+                ),
+                migrations.RunPython(partition, unpartition),
+            ],
+        ),
+    ]
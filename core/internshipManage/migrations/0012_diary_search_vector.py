@@ -0,0 +1,28 @@
+from django.db import migrations
+
+from internshipManage.utils.search import add_search_column, remove_search_column, uses_full_text_search
+
+
+def add_column(apps, schema_editor):
+    if not uses_full_text_search(schema_editor.connection):
+        return
+    InternshipDiary = apps.get_model('internshipManage', 'InternshipDiary')
+    add_search_column(schema_editor, InternshipDiary._meta.db_table)
+
+
+def drop_column(apps, schema_editor):
+    if not uses_full_text_search(schema_editor.connection):
+        return
+    InternshipDiary = apps.get_model('internshipManage', 'InternshipDiary')
+    remove_search_column(schema_editor, InternshipDiary._meta.db_table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internshipManage', '0011_partition_internship_diary'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_column, drop_column),
+    ]
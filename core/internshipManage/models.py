@@ -1,5 +1,6 @@
 from django.db import models
 from userManage.models import Student, Company, BaseModel
+from .utils.progress import PROGRESS_FIELDS
 
 class Internship(BaseModel):
     class StatusChoices(models.TextChoices):
@@ -18,9 +19,47 @@ class Internship(BaseModel):
     description = models.TextField()
     status = models.CharField(max_length=20, choices=StatusChoices.choices, default=StatusChoices.Pending)
 
+    # Günlük yazımlarıyla birlikte güncellenen, gece mutabakatla doğrulanan ilerleme sayaçları
+    submitted_diary_count = models.PositiveIntegerField(default=0)
+    draft_diary_count = models.PositiveIntegerField(default=0)
+    total_hours_worked = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    last_diary_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='internship_created_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.student} - {self.company} - {self.position}"
+
+    def save(self, *args, **kwargs):
+        # Sayaçlar yalnızca F() güncellemeleriyle değişir; bellekteki eski değerler onları ezmemeli.
+        # Ertelenmiş alanlar Django'nun kendi save() davranışındaki gibi yazılmaz, böylece yeniden okunmaz
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in PROGRESS_FIELDS and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
     
+class InternshipDiaryQuerySet(models.QuerySet):
+    """
+    Staj bazlı günlük sorguları yalnızca staj anahtarıyla filtrelenir. Staj tarihleri sonradan
+    değişebildiğinden dönem aralığı filtreye eklenmez; bölümlü tabloda her bölümün
+    (internship, date) indeksi kullanılır.
+    """
+
+    def for_internship(self, internship):
+        return self.filter(internship=internship)
+
+    def for_internships(self, internship_ids):
+        return self.filter(internship_id__in=internship_ids)
+
+    # Toplu ilişki yükleyicisi üst nesne anahtarlarıyla bu metodu kullanır
+    for_parents = for_internships
+
 class InternshipDiary(BaseModel): 
     class StatusChoices(models.TextChoices):
         Draft = 'draft', 'Draft'
@@ -33,6 +72,18 @@ class InternshipDiary(BaseModel):
     text = models.TextField(null=True, blank=True)
     tasks = models.CharField(max_length=255, null=True, blank=True)
     feedback = models.TextField(null=True, blank=True)  
+
+    objects = InternshipDiaryQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date', 'id'], name='diary_date_id_idx'),
+            # Benzersizlik veritabanında sağlanır: bölümlü tabloda trigger, diğerlerinde benzersiz indeks (0011)
+            models.Index(fields=['internship', 'day_number'], name='diary_unique_internship_day'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['internship', 'date'], name='diary_unique_internship_date'),
+        ]
     
     def __str__(self):
         return f"{self.internship} - {self.date} - {self.hours_worked}"
@@ -49,5 +100,35 @@ class Evaluation(BaseModel):
     overall_score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     is_approved = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='evaluation_created_id_idx'),
+        ]
+
     def __str__(self):
         return f"{self.internship} - {self.internship.student} - {self.overall_score}"
+
+class DashboardStat(models.Model):
+    """Yönetici paneli için zamanlanmış görevle yenilenen önceden hesaplanmış istatistikler"""
+    class DimensionChoices(models.TextChoices):
+        Total = 'total', 'Total'
+        Status = 'status', 'Status'
+        Department = 'department', 'Department'
+        Faculty = 'faculty', 'Faculty'
+        Company = 'company', 'Company'
+
+    dimension = models.CharField(max_length=20, choices=DimensionChoices.choices)
+    key = models.CharField(max_length=100)
+    label = models.CharField(max_length=100)
+    internship_count = models.PositiveIntegerField(default=0)
+    evaluation_count = models.PositiveIntegerField(default=0)
+    average_score = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key'], name='dashboard_stat_unique_dimension_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension} - {self.label} - {self.internship_count}"
@@ -1,18 +1,29 @@
 import graphene
 from graphene_django.types import DjangoObjectType
-from graphene_django.filter import DjangoFilterConnectionField
+from graphql_relay import from_global_id
 
+from core.utils.dataloaders import BatchedConnection, load_related
+from core.utils.pagination import KeysetConnectionField
+from core.utils.response_cache import instance_tags, invalidate_tags, list_tag, model_tag
+from core.utils.query_optimizer import OptimizedFilterConnectionField
 from userManage.utils.jwt_payload import custom_permission_required
 from userManage.models import Student, Company
-from .models import Internship, InternshipDiary, Evaluation
+from .models import Internship, InternshipDiary, Evaluation, DashboardStat
 from .utils.utils import calculate_total_working_days
+from .utils.integrity import diary_conflict_field
+from .utils.search import search_diaries
+from .utils.progress import apply_progress_delta, merge_deltas, progress_delta, snapshot_of
+from .utils.overlap import OVERLAP_MESSAGES, get_overlap_scope, is_overlap_violation, overlapping_internships, uses_exclusion_constraint
 
 from .utils.mail_context import get_internship_application_mail_context,get_internship_application_mail_context_for_student,get_internship_application_mail_context_for_student_accepted,get_internship_application_mail_context_for_student_rejected , send_internship_mail
 
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from core.utils.logging import log_error, log_info, log_warning
 
 class InternshipNode(DjangoObjectType):
+    diaries = OptimizedFilterConnectionField('internshipManage.schema.InternshipDiaryNode', required=True)
+    evaluations = OptimizedFilterConnectionField('internshipManage.schema.EvaluationNode', required=True)
+
     class Meta:
         model = Internship
         filter_fields = {
@@ -22,8 +33,17 @@ class InternshipNode(DjangoObjectType):
             'status': ['exact'],
         }
         interfaces = (graphene.relay.Node,)
+        connection_class = BatchedConnection
+
+    def resolve_student(self, info):
+        return load_related(self, info, 'student')
+
+    def resolve_company(self, info):
+        return load_related(self, info, 'company')
 
 class InternshipDiaryNode(DjangoObjectType):
+    search_rank = graphene.Float(description="Yalnızca searchDiaries sonuçlarında dolu olan arama skoru")
+
     class Meta:
         model = InternshipDiary
         filter_fields = {
@@ -34,6 +54,13 @@ class InternshipDiaryNode(DjangoObjectType):
             'status': ['exact'],
         }
         interfaces = (graphene.relay.Node,)
+        connection_class = BatchedConnection
+
+    def resolve_internship(self, info):
+        return load_related(self, info, 'internship')
+
+    def resolve_search_rank(self, info):
+        return getattr(self, 'rank', None)
 
 class EvaluationNode(DjangoObjectType):
     class Meta:
@@ -45,6 +72,10 @@ class EvaluationNode(DjangoObjectType):
             'is_approved': ['exact'],
         }
         interfaces = (graphene.relay.Node,)
+        connection_class = BatchedConnection
+
+    def resolve_internship(self, info):
+        return load_related(self, info, 'internship')
 
 #-------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 
@@ -115,22 +146,6 @@ class CreateInternshipApplication(graphene.Mutation):
                     )
                     return cls(success=False, message="Sirket bulunamadi.")
                 
-                if Internship.objects.filter(
-                    student=student,
-                    company=company,
-                    start_date__lte=end_date,
-                    end_date__gte=start_date  
-                ).exists():
-                    log_error(
-                        module_name="internship_management",
-                        message=f"Cakisan staj basvurusu - Ogrenci: {student.first_name}, Sirket: {company.company_name}",
-                        context={
-                            "student_id": student.id,
-                            "company_id": company.id,
-                        }
-                    )
-                    return CreateInternshipApplication(success=False, message="Bu sirket icin belirtilen tarihlerde zaten bir basvurunuz mevcut.")
-
                 student_data = {
                     "first_name": student.first_name,
                     "last_name": student.last_name,
@@ -146,7 +161,28 @@ class CreateInternshipApplication(graphene.Mutation):
                     total_working_days=total_working_days,
                     status=status.PENDING.value
                 )
-                internship.save()
+
+                # PostgreSQL'de çakışma exclusion constraint ile insert sırasında atomik olarak yakalanır
+                overlap = not uses_exclusion_constraint() and overlapping_internships(internship).exists()
+                if not overlap:
+                    try:
+                        with transaction.atomic():
+                            internship.save()
+                    except IntegrityError as e:
+                        if not is_overlap_violation(e):
+                            raise
+                        overlap = True
+
+                if overlap:
+                    log_error(
+                        module_name="internship_management",
+                        message=f"Cakisan staj basvurusu - Ogrenci: {student.first_name}, Sirket: {company.company_name}",
+                        context={
+                            "student_id": student.id,
+                            "company_id": company.id,
+                        }
+                    )
+                    return CreateInternshipApplication(success=False, message=OVERLAP_MESSAGES[get_overlap_scope()])
 
                 log_info(
                     module_name="internship_management",
@@ -241,7 +277,16 @@ class UpdateInternshipApplication(graphene.Mutation):
                 for attr, value in kwargs.items():
                     if value is not None:
                         setattr(internship, attr, value)
-                internship.save()
+
+                if not uses_exclusion_constraint() and overlapping_internships(internship).exists():
+                    return UpdateInternshipApplication(success=False, message=OVERLAP_MESSAGES[get_overlap_scope()])
+                try:
+                    with transaction.atomic():
+                        internship.save()
+                except IntegrityError as e:
+                    if not is_overlap_violation(e):
+                        raise
+                    return UpdateInternshipApplication(success=False, message=OVERLAP_MESSAGES[get_overlap_scope()])
 
                 log_info(
                     module_name="internship_management",
@@ -567,7 +612,7 @@ class CreateInternshipDiary(graphene.Mutation):
         try:
             internship_id =kwargs.get("internship_id")
             internship = graphene.relay.Node.get_node_from_global_id(info, internship_id)
-            evaluation = Evaluation.objects.filter(internship=internship)
+            evaluation = Evaluation.objects.filter(internship=internship, is_approved=True)
             date = kwargs.get("date")
             if internship.student.user != info.context.user:
                 log_error(
@@ -611,29 +656,6 @@ class CreateInternshipDiary(graphene.Mutation):
                 )
                 return CreateInternshipDiary(success=False, message="Staj basvurusu onaylanmadi. Gunluk kaydi yapamazsiniz.")
             
-            if InternshipDiary.objects.filter(internship=internship, date=date).exists():
-                log_error(
-                    module_name="internship_management",
-                    message=f"Aynı tarihli günlük zaten mevcut - Staj ID: {internship.id}",
-                    context={
-                        "internship_id": internship.id,
-                        "student_id": internship.student.id
-                    }
-                )
-                return CreateInternshipDiary(success=False, message=f"{date} tarihli bir günlük zaten mevcut.")
-            
-            if InternshipDiary.objects.filter(internship=internship, day_number=kwargs.get("day_number")).exists():
-                log_error(
-                    module_name="internship_management",
-                    message=f"Aynı gün numaralı günlük zaten mevcut - Staj ID: {internship.id}, Gün: {kwargs.get('day_number')}",
-                    context={
-                        "internship_id": internship.id,
-                        "day_number": kwargs.get("day_number"),
-                        "student_id": internship.student.id
-                    }
-                )
-                return CreateInternshipDiary(success=False, message=f"{kwargs.get('day_number')} numaralı bir günlük zaten mevcut.")
-                
             if kwargs.get("hours_worked") < 0 or kwargs.get("hours_worked") > 24:
                 log_error(
                     module_name="internship_management",
@@ -646,7 +668,7 @@ class CreateInternshipDiary(graphene.Mutation):
                 )
                 return CreateInternshipDiary(success=False, message="Çalışma saati 0 ile 24 saat arasında olmalı.")
             
-            if evaluation.is_approved:
+            if evaluation.exists():
                 log_error(
                     module_name="internship_management",
                     message=f"Staj değerlendirmesi onaylı - Staj ID: {internship.id}",
@@ -664,7 +686,34 @@ class CreateInternshipDiary(graphene.Mutation):
                 if field in kwargs and kwargs[field] is not None:
                     setattr(diary, field, kwargs[field])
 
-            diary.save()
+            # Tarih ve gün numarası tekrarları benzersizlik kısıtlarıyla insert sırasında yakalanır
+            try:
+                with transaction.atomic():
+                    diary.save()
+            except IntegrityError as e:
+                conflict = diary_conflict_field(e)
+                if conflict == 'date':
+                    log_error(
+                        module_name="internship_management",
+                        message=f"Aynı tarihli günlük zaten mevcut - Staj ID: {internship.id}",
+                        context={
+                            "internship_id": internship.id,
+                            "student_id": internship.student.id
+                        }
+                    )
+                    return CreateInternshipDiary(success=False, message=f"{date} tarihli bir günlük zaten mevcut.")
+                if conflict == 'day_number':
+                    log_error(
+                        module_name="internship_management",
+                        message=f"Aynı gün numaralı günlük zaten mevcut - Staj ID: {internship.id}, Gün: {kwargs.get('day_number')}",
+                        context={
+                            "internship_id": internship.id,
+                            "day_number": kwargs.get("day_number"),
+                            "student_id": internship.student.id
+                        }
+                    )
+                    return CreateInternshipDiary(success=False, message=f"{kwargs.get('day_number')} numaralı bir günlük zaten mevcut.")
+                raise
 
             log_info(
                 module_name="internship_management",
@@ -737,17 +786,6 @@ class UpdateInternshipDiary(graphene.Mutation):
                 )
                 return UpdateInternshipDiary(success=False, message="Günlük tarihi staj dönemi içinde olmalıdır.")
             
-            if InternshipDiary.objects.filter(internship=diary.internship, date=date).exclude(id=diary.id).exists():
-                log_error(
-                    module_name="internship_management",
-                    message=f"Aynı tarihli günlük zaten mevcut - Staj ID: {diary.internship.id}",
-                    context={
-                        "internship_id": diary.internship.id,
-                        "student_id": diary.internship.student.id
-                    }
-                )
-                return UpdateInternshipDiary(success=False, message=f"{date} tarihli bir günlük zaten mevcut.")
-            
             if hours_worked is not None:
                 if hours_worked < 0 or hours_worked > 24:
                     log_error(
@@ -760,9 +798,26 @@ class UpdateInternshipDiary(graphene.Mutation):
                     )
                     return UpdateInternshipDiary(success=False, message="Çalışma saati 0 ile 24 arasında olmalıdır.")
                 
-            if day_number is not None:
-                is_duplicate = InternshipDiary.objects.filter(day_number=day_number, internship=diary.internship).exclude(id=diary.id).exists()
-                if is_duplicate:
+            for attr, value in kwargs.items():
+                if value is not None:
+                    setattr(diary, attr, value)
+
+            try:
+                with transaction.atomic():
+                    diary.save()
+            except IntegrityError as e:
+                conflict = diary_conflict_field(e)
+                if conflict == 'date':
+                    log_error(
+                        module_name="internship_management",
+                        message=f"Aynı tarihli günlük zaten mevcut - Staj ID: {diary.internship.id}",
+                        context={
+                            "internship_id": diary.internship.id,
+                            "student_id": diary.internship.student.id
+                        }
+                    )
+                    return UpdateInternshipDiary(success=False, message=f"{date} tarihli bir günlük zaten mevcut.")
+                if conflict == 'day_number':
                     log_error(
                         module_name="internship_management",
                         message=f"Aynı gün numaralı günlük zaten mevcut - Staj ID: {diary.internship.id}, Gün: {day_number}",
@@ -772,12 +827,7 @@ class UpdateInternshipDiary(graphene.Mutation):
                         }
                     )
                     return UpdateInternshipDiary(success=False, message=f"{day_number} numaralı bir günlük zaten mevcut.")
-
-            for attr, value in kwargs.items():
-                if value is not None:
-                    setattr(diary, attr, value)
-
-            diary.save()
+                raise
             log_info(
                 module_name="internship_management",
                 message=f"Staj gunlugu kaydi basariyla guncellendi - Staj ID: {diary.internship.id}, Gün: {day_number}",
@@ -951,6 +1001,201 @@ class DeleteInternshipDiary(graphene.Mutation):
             )
             return DeleteInternshipDiary(success=False, message=str(e))
 
+class InternshipDiaryEntryInput(graphene.InputObjectType):
+    date = graphene.Date(required=True)
+    hours_worked = graphene.Decimal(required=True)
+    day_number = graphene.Int(required=True)
+    status = DiaryStatusEnum(required=True)
+    text = graphene.String(required=False)
+    tasks = graphene.String(required=False)
+    feedback = graphene.String(required=False)
+
+class InternshipDiaryEntryResult(graphene.ObjectType):
+    date = graphene.Date()
+    day_number = graphene.Int()
+    success = graphene.Boolean()
+    created = graphene.Boolean()
+    message = graphene.String()
+
+class UpsertInternshipDiaries(graphene.Mutation):
+    class Arguments:
+        internship_id = graphene.ID(required=True)
+        entries = graphene.List(graphene.NonNull(InternshipDiaryEntryInput), required=True)
+
+    success = graphene.Boolean()
+    message = graphene.String()
+    results = graphene.List(InternshipDiaryEntryResult)
+
+    diary_fields = ['date', 'hours_worked', 'day_number', 'status', 'text', 'tasks', 'feedback']
+
+    @staticmethod
+    def validate_entry(internship, entry, diaries_by_date, diaries_by_day):
+        """Girdiyi stajın mevcut günlüklerine göre doğrular, hata mesajı döndürür"""
+        date = entry.date
+        if date < internship.start_date or date > internship.end_date:
+            return "Günlük tarihi staj dönemi içinde olmalıdır."
+        if date.weekday() >= 5:
+            return "Hafta sonu günlük girişi yapamazsınız."
+        if entry.hours_worked < 0 or entry.hours_worked > 24:
+            return "Çalışma saati 0 ile 24 saat arasında olmalı."
+
+        same_day = diaries_by_day.get(entry.day_number)
+        if same_day is not None and same_day.date != date:
+            return f"{entry.day_number} numaralı bir günlük zaten mevcut."
+        return None
+
+    @custom_permission_required('internshipManage.InternshipDiaryAdd')
+    def mutate(self, info, internship_id, entries):
+        user = info.context.user
+        try:
+            _, pk = from_global_id(internship_id)
+            with transaction.atomic():
+                # Aynı staja eşzamanlı toplu kayıtlar sırayla işlenir
+                internship = Internship.objects.select_for_update().select_related('student').get(id=pk or internship_id)
+
+                if internship.student.user_id != user.id:
+                    log_error(
+                        module_name="internship_management",
+                        message=f"Yetkisiz toplu gunluk kaydi denemesi - Kullanici: {user.username}, Staj ID: {internship_id}",
+                        context={
+                            "user_id": user.id,
+                            "internship_id": internship.id,
+                            "student_id": internship.student.id
+                        }
+                    )
+                    return UpsertInternshipDiaries(success=False, message="Bu staj için sadece stajyer günlük kaydı yapabilir.")
+
+                if internship.status != InternshipStatusEnum.APPROVED_BY_ADMIN.value:
+                    log_error(
+                        module_name="internship_management",
+                        message=f"Geçersiz staj durumu - Staj ID: {internship.id}, Durum: {internship.status}",
+                        context={
+                            "internship_id": internship.id,
+                            "status": internship.status
+                        }
+                    )
+                    return UpsertInternshipDiaries(success=False, message="Staj basvurusu onaylanmadi. Gunluk kaydi yapamazsiniz.")
+
+                if Evaluation.objects.filter(internship=internship, is_approved=True).exists():
+                    log_error(
+                        module_name="internship_management",
+                        message=f"Staj değerlendirmesi onaylı - Staj ID: {internship.id}",
+                        context={
+                            "internship_id": internship.id,
+                            "student_id": internship.student.id
+                        }
+                    )
+                    return UpsertInternshipDiaries(success=False, message="Staj değerlendirmesi onaylı. Günlük kaydı yapamazsınız.")
+
+                existing = list(InternshipDiary.objects.for_internship(internship))
+                diaries_by_date = {diary.date: diary for diary in existing}
+                diaries_by_day = {diary.day_number: diary for diary in existing}
+
+                results = []
+                to_create = []
+                to_update = []
+                diaries = []
+                deltas = []
+                seen_dates = set()
+                # Mevcut günlüğün üzerine yazmak ayrıca güncelleme yetkisi gerektirir
+                can_update = user.has_perm('internshipManage.InternshipDiaryUpdate')
+                for entry in entries:
+                    result = InternshipDiaryEntryResult(date=entry.date, day_number=entry.day_number, success=False, created=False)
+                    results.append(result)
+
+                    error = UpsertInternshipDiaries.validate_entry(internship, entry, diaries_by_date, diaries_by_day)
+                    if error is None and entry.date in seen_dates:
+                        error = f"{entry.date} tarihli günlük bu istekte birden fazla kez gönderildi."
+                    existing_diary = diaries_by_date.get(entry.date)
+                    if error is None and existing_diary is not None and not can_update:
+                        error = "Mevcut günlükleri güncelleme yetkiniz yok."
+                    if error is not None:
+                        result.message = error
+                        continue
+
+                    seen_dates.add(entry.date)
+                    values = {field: getattr(existing_diary, field) for field in UpsertInternshipDiaries.diary_fields} if existing_diary else {}
+                    for field in UpsertInternshipDiaries.diary_fields:
+                        value = entry.get(field)
+                        if field == 'status':
+                            value = value.value if hasattr(value, 'value') else value
+                        if value is not None:
+                            values[field] = value
+
+                    diary = InternshipDiary(internship=internship, **values)
+                    diaries.append(diary)
+                    deltas.append(progress_delta(snapshot_of(existing_diary) if existing_diary else None, snapshot_of(diary)))
+                    if existing_diary is None:
+                        to_create.append(diary)
+                        result.created = True
+                    else:
+                        to_update.append(existing_diary)
+                        # Gün numarası değiştiyse eski numara bu istekteki sonraki girdiler için boşalır
+                        if diaries_by_day.get(existing_diary.day_number) is existing_diary:
+                            del diaries_by_day[existing_diary.day_number]
+                    diaries_by_date[diary.date] = diary
+                    diaries_by_day[diary.day_number] = diary
+                    result.success = True
+                    result.message = "Staj günlüğü kaydedildi." if result.created else "Staj günlüğü güncellendi."
+
+                # Yeni ve güncellenen günlükler (internship, date) kısıtı üzerinden tek bir upsert ile yazılır
+                if diaries:
+                    InternshipDiary.objects.bulk_create(
+                        diaries,
+                        update_conflicts=True,
+                        unique_fields=['internship', 'date'],
+                        update_fields=[field for field in UpsertInternshipDiaries.diary_fields if field != 'date'] + ['updated_at'],
+                    )
+                    # Toplu yazım sinyal göndermediğinden ilerleme sayaçları tek seferde güncellenir
+                    apply_progress_delta(internship.id, merge_deltas(deltas))
+
+                # Toplu işlemler post_save sinyali göndermez. Upsert yeni günlüklerin id'lerini
+                # döndürmediğinden bunlar staj ve günlük listesi etiketleriyle geçersiz kılınır
+                if diaries:
+                    tags = {model_tag(Internship, internship.id), list_tag(InternshipDiary)}
+                    for diary in to_update:
+                        tags.update(instance_tags(diary))
+                    transaction.on_commit(lambda: invalidate_tags(tags))
+
+            saved = len(to_create) + len(to_update)
+            log_info(
+                module_name="internship_management",
+                message=f"Toplu staj günlüğü kaydı - Staj ID: {internship.id}, Yeni: {len(to_create)}, Güncellenen: {len(to_update)}",
+                context={
+                    "internship_id": internship.id,
+                    "created": len(to_create),
+                    "updated": len(to_update),
+                    "failed": len(entries) - saved,
+                    "student_id": internship.student.id
+                }
+            )
+            return UpsertInternshipDiaries(
+                success=saved == len(entries),
+                message=f"{saved}/{len(entries)} günlük kaydedildi.",
+                results=results
+            )
+        except Internship.DoesNotExist:
+            log_error(
+                module_name="internship_management",
+                message=f"Günlük kaydedilecek staj bulunamadı - Staj ID: {internship_id}",
+                context={
+                    "internship_id": internship_id,
+                    "user_id": user.id
+                }
+            )
+            return UpsertInternshipDiaries(success=False, message="Staj bulunamadı.")
+        except Exception as e:
+            log_error(
+                module_name="internship_management",
+                message=f"Toplu günlük kaydında hata: {str(e)}",
+                context={
+                    "internship_id": internship_id,
+                    "user_id": user.id,
+                    "error": str(e)
+                }
+            )
+            return UpsertInternshipDiaries(success=False, message=str(e))
+
 class CreateEvaluation(graphene.Mutation):
     class Arguments:
         internship_id = graphene.ID(required=True)
@@ -1170,7 +1415,7 @@ class EvaluationApproval(graphene.Mutation):
             user = info.context.user
             evaluation = Evaluation.objects.get(id=evaluation_id)
 
-            internship_diary_count = evaluation.internship.diaries.filter(status=DiaryStatusEnum.SUBMITTED.value).count()
+            internship_diary_count = evaluation.internship.submitted_diary_count
 
             if evaluation.internship.company.user != user:
                 log_error(
@@ -1230,16 +1475,87 @@ class EvaluationApproval(graphene.Mutation):
             )
             return EvaluationApproval(success=False, message=str(e))
 
+class DashboardStatType(graphene.ObjectType):
+    key = graphene.String()
+    label = graphene.String()
+    internship_count = graphene.Int()
+    evaluation_count = graphene.Int()
+    average_score = graphene.Decimal()
+
+class DashboardStatsType(graphene.ObjectType):
+    refreshed_at = graphene.DateTime()
+    total = graphene.Field(DashboardStatType)
+    by_status = graphene.List(DashboardStatType)
+    by_department = graphene.List(DashboardStatType)
+    by_faculty = graphene.List(DashboardStatType)
+    by_company = graphene.List(DashboardStatType)
+
 #-------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 class InternshipQuery(graphene.ObjectType):
+    dashboard_stats = graphene.Field(DashboardStatsType)
+
     internship = graphene.relay.Node.Field(InternshipNode)
-    internships = DjangoFilterConnectionField(InternshipNode)
+    internships = KeysetConnectionField(InternshipNode, ordering=('created_at', 'id'))
 
     internship_diary = graphene.relay.Node.Field(InternshipDiaryNode)
-    internship_diaries = DjangoFilterConnectionField(InternshipDiaryNode)
+    internship_diaries = KeysetConnectionField(InternshipDiaryNode, ordering=('date', 'id'))
+    search_diaries = KeysetConnectionField(
+        InternshipDiaryNode,
+        ordering=('-rank', 'id'),
+        keyset_default=True,
+        query=graphene.String(required=True),
+        company=graphene.ID(),
+    )
 
     evaluation = graphene.relay.Node.Field(EvaluationNode)
-    evaluations = DjangoFilterConnectionField(EvaluationNode)
+    evaluations = KeysetConnectionField(EvaluationNode, ordering=('created_at', 'id'))
+
+    @custom_permission_required('internshipManage.InternshipDiarySearch')
+    def resolve_search_diaries(self, info, query, company=None, **kwargs):
+        query = query.strip()
+        if not query:
+            raise Exception("Arama metni boş olamaz.")
+
+        user = info.context.user
+        queryset = InternshipDiary.objects.all()
+        # Şirket kullanıcıları yalnızca kendi stajyerlerinin günlüklerinde arama yapabilir
+        user_company = Company.objects.filter(user=user).first()
+        if user_company is not None:
+            queryset = queryset.filter(internship__company=user_company)
+        if company:
+            _, company_pk = from_global_id(company)
+            queryset = queryset.filter(internship__company_id=company_pk or company)
+
+        log_info(
+            module_name="internship_management",
+            message="Günlük araması yapıldı",
+            context={"user_id": user.id, "query": query}
+        )
+        return search_diaries(queryset, query).order_by('-rank', 'id')
+
+    @custom_permission_required('internshipManage.DashboardView')
+    def resolve_dashboard_stats(self, info):
+        # Yalnızca zamanlanmış görevle doldurulan özet tablo okunur
+        groups = {dimension: [] for dimension in DashboardStat.DimensionChoices.values}
+        refreshed_at = None
+        for stat in DashboardStat.objects.order_by('dimension', '-internship_count', 'label'):
+            groups[stat.dimension].append(DashboardStatType(
+                key=stat.key,
+                label=stat.label,
+                internship_count=stat.internship_count,
+                evaluation_count=stat.evaluation_count,
+                average_score=stat.average_score,
+            ))
+            refreshed_at = max(refreshed_at, stat.refreshed_at) if refreshed_at else stat.refreshed_at
+        total = groups[DashboardStat.DimensionChoices.Total]
+        return DashboardStatsType(
+            refreshed_at=refreshed_at,
+            total=total[0] if total else None,
+            by_status=groups[DashboardStat.DimensionChoices.Status],
+            by_department=groups[DashboardStat.DimensionChoices.Department],
+            by_faculty=groups[DashboardStat.DimensionChoices.Faculty],
+            by_company=groups[DashboardStat.DimensionChoices.Company],
+        )
 
     @custom_permission_required('userManage.internshipList')
     def resolve_users(self, info, **kwargs):
@@ -1264,6 +1580,7 @@ class InternshipMutation(graphene.ObjectType):
     update_internship_diary = UpdateInternshipDiary.Field()
     update_internship_diary_status = InternshipDiaryStatusUpdate.Field()
     delete_internship_diary = DeleteInternshipDiary.Field()
+    upsert_internship_diaries = UpsertInternshipDiaries.Field()
 
     create_evaluation = CreateEvaluation.Field()
     update_evaluation = UpdateEvaluation.Field()
@@ -0,0 +1,118 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from graphql_relay import to_global_id
+
+from core.utils.realtime import publish_event_on_commit
+from .utils.progress import apply_progress_delta, diary_snapshot, progress_delta, refresh_internship_progress
+from core.utils.response_cache import invalidate_instance
+from userManage.models import Student, Company
+from .models import Internship, InternshipDiary, Evaluation
+
+# Değişikliğinde anlık olay yayınlanacak alanlar
+TRACKED_FIELDS = {
+    Internship: 'status',
+    InternshipDiary: 'feedback',
+    Evaluation: 'is_approved',
+}
+
+@receiver(post_save, sender=Internship)
+@receiver(post_save, sender=InternshipDiary)
+@receiver(post_save, sender=Evaluation)
+def internship_data_saved(sender, instance, **kwargs):
+    invalidate_instance(instance)
+
+@receiver(post_delete, sender=Internship)
+@receiver(post_delete, sender=InternshipDiary)
+@receiver(post_delete, sender=Evaluation)
+def internship_data_deleted(sender, instance, **kwargs):
+    invalidate_instance(instance)
+
+# İlerleme sayaçlarını etkileyen günlük alanları
+PROGRESS_SOURCE_FIELDS = ('status', 'hours_worked', 'date')
+
+@receiver(post_init, sender=InternshipDiary)
+def remember_diary_progress(sender, instance, **kwargs):
+    values = instance.__dict__
+    if all(field in values for field in PROGRESS_SOURCE_FIELDS):
+        instance._progress_initial = tuple(values[field] for field in PROGRESS_SOURCE_FIELDS)
+    else:
+        instance._progress_initial = None
+
+@receiver(post_save, sender=InternshipDiary)
+def diary_progress_saved(sender, instance, created, **kwargs):
+    # Sinyal günlük yazımıyla aynı işlem içinde çalışır, sayaçlar birlikte commit edilir
+    current = tuple(getattr(instance, field) for field in PROGRESS_SOURCE_FIELDS)
+    if created:
+        apply_progress_delta(instance.internship_id, progress_delta(None, diary_snapshot(*current)))
+    elif instance._progress_initial is None:
+        refresh_internship_progress(instance.internship_id)
+    elif instance._progress_initial != current:
+        apply_progress_delta(
+            instance.internship_id,
+            progress_delta(diary_snapshot(*instance._progress_initial), diary_snapshot(*current))
+        )
+    instance._progress_initial = current
+
+@receiver(post_delete, sender=InternshipDiary)
+def diary_progress_deleted(sender, instance, **kwargs):
+    apply_progress_delta(instance.internship_id, progress_delta(diary_snapshot(instance.status, instance.hours_worked, instance.date), None))
+
+@receiver(post_init, sender=Internship)
+@receiver(post_init, sender=InternshipDiary)
+@receiver(post_init, sender=Evaluation)
+def remember_tracked_field(sender, instance, **kwargs):
+    # Ertelenmiş alanlar için ek sorgu yapılmaması adına __dict__ üzerinden okunur
+    instance._tracked_initial = instance.__dict__.get(TRACKED_FIELDS[sender])
+
+def tracked_field_changed(sender, instance, created):
+    field = TRACKED_FIELDS[sender]
+    if field not in instance.__dict__:
+        return False
+    current = instance.__dict__[field]
+    if created:
+        return bool(current)
+    return current != instance._tracked_initial
+
+def internship_user_ids(internship_id, include_company=False):
+    def get_user_ids():
+        student_id, company_id = Internship.objects.filter(id=internship_id).values_list('student_id', 'company_id').get()
+        user_ids = list(Student.objects.filter(id=student_id).values_list('user_id', flat=True))
+        if include_company:
+            user_ids += Company.objects.filter(id=company_id).values_list('user_id', flat=True)
+        return user_ids
+    return get_user_ids
+
+@receiver(post_save, sender=Internship)
+@receiver(post_save, sender=InternshipDiary)
+@receiver(post_save, sender=Evaluation)
+def publish_tracked_change(sender, instance, created, **kwargs):
+    changed = tracked_field_changed(sender, instance, created)
+    instance._tracked_initial = instance.__dict__.get(TRACKED_FIELDS[sender])
+    if not changed:
+        return
+
+    if sender is Internship:
+        publish_event_on_commit(
+            internship_user_ids(instance.id, include_company=True),
+            'internship.status',
+            {'internship_id': to_global_id('InternshipNode', instance.id), 'status': instance.status},
+        )
+    elif sender is InternshipDiary:
+        publish_event_on_commit(
+            internship_user_ids(instance.internship_id),
+            'diary.feedback',
+            {
+                'diary_id': to_global_id('InternshipDiaryNode', instance.id),
+                'internship_id': to_global_id('InternshipNode', instance.internship_id),
+                'feedback': instance.feedback,
+            },
+        )
+    elif instance.is_approved:
+        publish_event_on_commit(
+            internship_user_ids(instance.internship_id),
+            'evaluation.approved',
+            {
+                'evaluation_id': to_global_id('EvaluationNode', instance.id),
+                'internship_id': to_global_id('InternshipNode', instance.internship_id),
+            },
+        )
@@ -1,3 +1,369 @@
-from django.test import TestCase
+import base64
+from contextlib import nullcontext
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.test import override_settings
+from graphql_relay import to_global_id
+
+from core.testing import GraphQLTestCase, create_company, create_role, create_student, create_user
+from userManage.models import CustomUser
+from .models import Internship, InternshipDiary
+from .utils.progress import apply_progress_delta, diary_snapshot, progress_delta, reconcile_internship_progress
+
+
+def create_internship(student, company, start_date=date(2025, 7, 1), days=30):
+    return Internship.objects.create(
+        student=student, company=company, start_date=start_date, end_date=start_date + timedelta(days=days),
+        position='Yazilim', description='Staj', status=Internship.StatusChoices.Approved_by_admin, total_working_days=days
+    )
+
+
+def create_diary(internship, day_number, status='submitted', hours_worked=8, text='Gunluk metni', tasks=None):
+    return InternshipDiary.objects.create(
+        internship=internship, date=internship.start_date + timedelta(days=day_number - 1), day_number=day_number,
+        hours_worked=hours_worked, status=status, text=text, tasks=tasks
+    )
+
+
+class KeysetPaginationTests(GraphQLTestCase):
+    DIARIES = '''
+        query ($keyset: Boolean, $after: String) {
+            internshipDiaries(keyset: $keyset, first: 2, after: $after) {
+                pageInfo { hasNextPage endCursor }
+                edges { cursor node { dayNumber } }
+            }
+        }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        internship = create_internship(create_student(1), create_company('Sirket 1'))
+        for day_number in (3, 1, 5, 2, 4):
+            create_diary(internship, day_number)
+
+    def test_cursor_round_trip_pages_through_all_rows_in_key_order(self):
+        day_numbers, after = [], None
+        while True:
+            result = self.query(self.DIARIES, variables={'keyset': True, 'after': after})
+            self.assertNotIn('errors', result)
+            connection = result['data']['internshipDiaries']
+            day_numbers += [edge['node']['dayNumber'] for edge in connection['edges']]
+            if not connection['pageInfo']['hasNextPage']:
+                break
+            after = connection['pageInfo']['endCursor']
+
+        self.assertEqual(day_numbers, [1, 2, 3, 4, 5])
+
+    def test_offset_pagination_is_default(self):
+        result = self.query(self.DIARIES)
+
+        cursor = result['data']['internshipDiaries']['edges'][0]['cursor']
+        self.assertTrue(base64.b64decode(cursor).startswith(b'arrayconnection:'))
+
+    def test_invalid_cursor_returns_error(self):
+        cursors = [
+            'bozuk',
+            base64.b64encode(b'keyset:["2025-07-01"]').decode(),
+            base64.b64encode(b'keyset:["2025-07-01", "x"]').decode(),
+            base64.b64encode(b'keyset:["tarih", 1]').decode(),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                result = self.query(self.DIARIES, variables={'keyset': True, 'after': cursor})
+                self.assertEqual(result['errors'][0]['message'], 'Geçersiz cursor.')
+
+
+class ProgressCounterTests(GraphQLTestCase):
+    INTERNSHIP = '''
+        query ($id: ID!) {
+            internship(id: $id) { submittedDiaryCount draftDiaryCount totalHoursWorked }
+        }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        self.internship = create_internship(create_student(1), create_company('Sirket 1'))
+        self.variables = {'id': to_global_id('InternshipNode', self.internship.pk)}
+
+    def progress(self):
+        self.internship.refresh_from_db()
+        return self.internship.submitted_diary_count, self.internship.draft_diary_count, self.internship.total_hours_worked
+
+    def test_diary_writes_apply_counter_deltas(self):
+        diary = create_diary(self.internship, 1, status='draft', hours_worked=6)
+        create_diary(self.internship, 2)
+        self.assertEqual(self.progress(), (1, 1, Decimal('14')))
+
+        diary.status = 'submitted'
+        diary.hours_worked = Decimal('7')
+        diary.save()
+        self.assertEqual(self.progress(), (2, 0, Decimal('15')))
+
+        diary.delete()
+        self.assertEqual(self.progress(), (1, 0, Decimal('8')))
+
+    def test_counter_updates_invalidate_cached_internship(self):
+        self.assertEqual(self.query(self.INTERNSHIP, variables=self.variables)['extensions']['cache'], 'MISS')
+        self.assertEqual(self.query(self.INTERNSHIP, variables=self.variables)['extensions']['cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_progress_delta(self.internship.pk, progress_delta(None, diary_snapshot('submitted', 8, date(2025, 7, 1))))
+
+        result = self.query(self.INTERNSHIP, variables=self.variables)
+        self.assertEqual(result['extensions']['cache'], 'MISS')
+        self.assertEqual(result['data']['internship']['submittedDiaryCount'], 1)
+
+    def test_reconcile_fixes_drift_and_invalidates_cache(self):
+        create_diary(self.internship, 1)
+        Internship.objects.filter(pk=self.internship.pk).update(submitted_diary_count=5, total_hours_worked=0)
+        self.query(self.INTERNSHIP, variables=self.variables)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(reconcile_internship_progress(), 1)
+
+        self.assertEqual(self.progress(), (1, 0, Decimal('8')))
+        result = self.query(self.INTERNSHIP, variables=self.variables)
+        self.assertEqual(result['extensions']['cache'], 'MISS')
+        self.assertEqual(result['data']['internship']['submittedDiaryCount'], 1)
+
+    def test_save_skips_deferred_fields_and_counters(self):
+        create_diary(self.internship, 1)
+        internship = Internship.objects.defer('description').get(pk=self.internship.pk)
+        internship.position = 'Backend'
+
+        with self.assertNumQueries(1):
+            internship.save()
+
+        internship = Internship.objects.get(pk=self.internship.pk)
+        self.assertEqual((internship.position, internship.description, internship.submitted_diary_count), ('Backend', 'Staj', 1))
+
+
+class UpsertInternshipDiariesTests(GraphQLTestCase):
+    DIARIES = '''
+        query ($internship: ID!) {
+            internshipDiaries(internship: $internship) { edges { node { id dayNumber text } } }
+        }
+    '''
+    DIARY = '''
+        query ($id: ID!) { internshipDiary(id: $id) { text } }
+    '''
+    UPSERT = '''
+        mutation ($internshipId: ID!, $entries: [InternshipDiaryEntryInput!]!) {
+            upsertInternshipDiaries(internshipId: $internshipId, entries: $entries) { success message results { success message } }
+        }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        student = create_student(1, self.admin.role, is_superuser=True)
+        self.student_user = student.user
+        # Staj 1 Temmuz 2025 salı başlar; testlerdeki günler hafta içidir
+        self.internship = create_internship(student, create_company('Sirket 1'))
+        self.diary = create_diary(self.internship, 1)
+        self.internship_id = to_global_id('InternshipNode', self.internship.pk)
+
+    def upsert(self, *entries):
+        with self.captureOnCommitCallbacks(execute=True):
+            result = self.query(self.UPSERT, user=self.student_user, variables={
+                'internshipId': self.internship_id,
+                'entries': [
+                    {'date': str(day), 'dayNumber': number, 'hoursWorked': '8', 'status': 'SUBMITTED', 'text': text}
+                    for day, number, text in entries
+                ],
+            })
+        self.assertTrue(result['data']['upsertInternshipDiaries']['success'], result)
+
+    def test_new_diaries_invalidate_cached_internship_lists(self):
+        variables = {'internship': self.internship_id}
+        self.query(self.DIARIES, user=self.student_user, variables=variables)
+
+        self.upsert((date(2025, 7, 2), 2, 'Yeni gun'))
+
+        result = self.query(self.DIARIES, user=self.student_user, variables=variables)
+        self.assertEqual(result['extensions']['cache'], 'MISS')
+        day_numbers = sorted(edge['node']['dayNumber'] for edge in result['data']['internshipDiaries']['edges'])
+        self.assertEqual(day_numbers, [1, 2])
+
+    def test_updated_diaries_invalidate_cached_nodes(self):
+        variables = {'id': to_global_id('InternshipDiaryNode', self.diary.pk)}
+        self.query(self.DIARY, user=self.student_user, variables=variables)
+
+        self.upsert((self.diary.date, 1, 'Guncellendi'))
+
+        result = self.query(self.DIARY, user=self.student_user, variables=variables)
+        self.assertEqual(result['extensions']['cache'], 'MISS')
+        self.assertEqual(result['data']['internshipDiary']['text'], 'Guncellendi')
+
+    def test_freed_day_number_can_be_reused_in_same_request(self):
+        self.upsert((self.diary.date, 5, 'Yeni numara'), (date(2025, 7, 2), 1, 'Bosalan numara'))
+
+        diaries = InternshipDiary.objects.filter(internship=self.internship).order_by('date')
+        self.assertEqual([diary.day_number for diary in diaries], [5, 1])
+
+    def test_updating_existing_diaries_requires_update_permission(self):
+        self.student_user.role = create_role('Student', 'internshipManage.InternshipDiaryAdd')
+        self.student_user.is_superuser = False
+        self.student_user.save()
+        self.student_user = CustomUser.objects.select_related('role').get(pk=self.student_user.pk)
+
+        result = self.query(self.UPSERT, user=self.student_user, variables={
+            'internshipId': self.internship_id,
+            'entries': [
+                {'date': str(self.diary.date), 'dayNumber': 1, 'hoursWorked': '8', 'status': 'SUBMITTED', 'text': 'Degisti'},
+                {'date': '2025-07-02', 'dayNumber': 2, 'hoursWorked': '8', 'status': 'SUBMITTED'},
+            ],
+        })
+
+        results = result['data']['upsertInternshipDiaries']['results']
+        self.assertEqual(results[0]['message'], 'Mevcut günlükleri güncelleme yetkiniz yok.')
+        self.assertTrue(results[1]['success'])
+        self.diary.refresh_from_db()
+        self.assertEqual(self.diary.text, 'Gunluk metni')
+
+
+class ResponseCacheTests(GraphQLTestCase):
+    DIARY = '''
+        query ($id: ID!) { internshipDiary(id: $id) { text } }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        self.diary = create_diary(create_internship(create_student(1), create_company('Sirket 1')), 1)
+        self.variables = {'id': to_global_id('InternshipDiaryNode', self.diary.pk)}
+
+    def test_repeated_query_is_served_from_cache(self):
+        first = self.query(self.DIARY, variables=self.variables)
+        second = self.query(self.DIARY, variables=self.variables)
+
+        self.assertEqual(first['extensions']['cache'], 'MISS')
+        self.assertEqual(second['extensions']['cache'], 'HIT')
+        self.assertEqual(second['data'], first['data'])
+
+    def test_saving_a_record_invalidates_its_tag(self):
+        self.query(self.DIARY, variables=self.variables)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.diary.text = 'Degisti'
+            self.diary.save()
+
+        result = self.query(self.DIARY, variables=self.variables)
+        self.assertEqual(result['extensions']['cache'], 'MISS')
+        self.assertEqual(result['data']['internshipDiary']['text'], 'Degisti')
+
+    def test_cache_is_scoped_per_user(self):
+        other = create_user('admin2', self.admin.role, is_superuser=True)
+        self.query(self.DIARY, variables=self.variables)
+
+        self.assertEqual(self.query(self.DIARY, user=other, variables=self.variables)['extensions']['cache'], 'MISS')
+
+    def test_mutations_are_not_cached(self):
+        mutation = '''
+            mutation ($internshipId: ID!) {
+                upsertInternshipDiaries(internshipId: $internshipId, entries: []) { success }
+            }
+        '''
+        result = self.query(mutation, variables={'internshipId': to_global_id('InternshipNode', self.diary.internship_id)})
+
+        self.assertNotIn('cache', result.get('extensions') or {})
+
+    def test_replica_reads_do_not_fill_cache_after_recent_invalidation(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.diary.save()
+
+        # Testte replika olmadığından okumalar birincilde kalır, yalnızca seçilen alias replikadır
+        with (
+            override_settings(READ_REPLICAS={'aliases': ['replica_1'], 'sticky_seconds': 5}),
+            mock.patch('core.views.choose_read_database', return_value='replica_1'),
+            mock.patch('core.views.use_read_database', return_value=nullcontext()),
+        ):
+            self.query(self.DIARY, variables=self.variables)
+            self.assertEqual(self.query(self.DIARY, variables=self.variables)['extensions']['cache'], 'MISS')
+
+        # Birincilden okunan yanıt, geçersiz kılma sorgudan önce olduğu için önbelleğe yazılır
+        self.query(self.DIARY, variables=self.variables)
+        self.assertEqual(self.query(self.DIARY, variables=self.variables)['extensions']['cache'], 'HIT')
+
+
+class DiarySearchTests(GraphQLTestCase):
+    SEARCH = '''
+        query ($query: String!, $after: String) {
+            searchDiaries(query: $query, first: 2, after: $after) {
+                pageInfo { hasNextPage endCursor }
+                edges { node { dayNumber searchRank } }
+            }
+        }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        company = create_company('Sirket 1', create_role('Company', 'internshipManage.InternshipDiarySearch'))
+        self.company_user = company.user
+        internship = create_internship(create_student(1), company)
+        create_diary(internship, 1, text='Haftalik RAPOR hazirlandi')
+        create_diary(internship, 2, text='Toplanti', tasks='rapor incelemesi')
+        create_diary(internship, 3, text='Kod yazildi')
+        create_diary(create_internship(create_student(2), create_company('Sirket 2')), 1, text='Baska sirkette rapor')
+
+    def search(self, query, user=None):
+        day_numbers, after = [], None
+        while True:
+            result = self.query(self.SEARCH, user=user, variables={'query': query, 'after': after})
+            self.assertNotIn('errors', result)
+            connection = result['data']['searchDiaries']
+            day_numbers += [(edge['node']['dayNumber'], edge['node']['searchRank']) for edge in connection['edges']]
+            if not connection['pageInfo']['hasNextPage']:
+                return day_numbers
+            after = connection['pageInfo']['endCursor']
+
+    def test_sqlite_fallback_matches_text_and_tasks_case_insensitively(self):
+        self.assertEqual(self.search('rapor'), [(1, 0.0), (2, 0.0), (1, 0.0)])
+
+    def test_company_users_only_search_their_interns(self):
+        self.assertEqual(self.search('rapor', user=self.company_user), [(1, 0.0), (2, 0.0)])
+
+    def test_blank_query_is_rejected(self):
+        result = self.query(self.SEARCH, variables={'query': '  '})
+
+        self.assertEqual(result['errors'][0]['message'], 'Arama metni boş olamaz.')
+
+
+class ShrunkInternshipTests(GraphQLTestCase):
+    INTERNSHIP_DIARIES = '''
+        query ($id: ID!) { internship(id: $id) { diaries { edges { node { dayNumber } } } } }
+    '''
+    UPSERT = UpsertInternshipDiariesTests.UPSERT
+
+    def setUp(self):
+        super().setUp()
+        student = create_student(1, self.admin.role, is_superuser=True)
+        self.student_user = student.user
+        self.internship = create_internship(student, create_company('Sirket 1'))
+        self.internship_id = to_global_id('InternshipNode', self.internship.pk)
+        create_diary(self.internship, 1)
+        create_diary(self.internship, 10)
+        # Staj dönemi sonradan daraltılır; 10. gün dönem dışında kalır
+        self.internship.end_date = self.internship.start_date + timedelta(days=5)
+        self.internship.save()
+
+    def test_diaries_outside_new_window_stay_visible(self):
+        result = self.query(self.INTERNSHIP_DIARIES, variables={'id': self.internship_id})
+
+        day_numbers = sorted(edge['node']['dayNumber'] for edge in result['data']['internship']['diaries']['edges'])
+        self.assertEqual(day_numbers, [1, 10])
+
+    def test_day_number_held_by_hidden_diary_is_reported_per_entry(self):
+        result = self.query(self.UPSERT, user=self.student_user, variables={
+            'internshipId': self.internship_id,
+            'entries': [{'date': '2025-07-02', 'dayNumber': 10, 'hoursWorked': '8', 'status': 'SUBMITTED'}],
+        })
+
+        self.assertEqual(result['data']['upsertInternshipDiaries']['message'], '0/1 günlük kaydedildi.')
+
+    def test_incremental_and_reconciled_last_diary_date_agree(self):
+        create_diary(self.internship, 3)
+
+        self.internship.refresh_from_db()
+        self.assertEqual(self.internship.last_diary_date, self.internship.start_date + timedelta(days=9))
+        self.assertEqual(reconcile_internship_progress(), 0)
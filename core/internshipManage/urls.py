@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import InternshipExportView, InternshipDiaryExportView
+
+urlpatterns = [
+    path('internships.csv.gz', InternshipExportView.as_view(), name='internship-export'),
+    path('diaries.csv.gz', InternshipDiaryExportView.as_view(), name='internship-diary-export'),
+]
@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Avg, Count
+from django.utils import timezone
+
+from core.utils.logging import log_info
+
+# Boyut -> (gruplama alanı, etiket alanı)
+DASHBOARD_DIMENSIONS = {
+    'status': ('status', 'status'),
+    'department': ('student__department', 'student__department'),
+    'faculty': ('student__faculty', 'student__faculty'),
+    'company': ('company_id', 'company__company_name'),
+}
+
+SCORE_PRECISION = Decimal('0.01')
+
+
+def round_score(value):
+    return None if value is None else Decimal(value).quantize(SCORE_PRECISION)
+
+
+def compute_dashboard_stats():
+    """
+    İstatistikleri boyut başına iki gruplu sorguyla hesaplar: biri staj sayıları, diğeri
+    onaylı değerlendirmelerin ortalama puanı için. Dönen sözlük (boyut, anahtar) ile eşlenir.
+    """
+    from ..models import Internship, Evaluation, DashboardStat
+
+    stats = {}
+    totals = Internship.objects.aggregate(internship_count=Count('id'))
+    evaluation_totals = Evaluation.objects.filter(is_approved=True).aggregate(
+        evaluation_count=Count('id'), average_score=Avg('overall_score')
+    )
+    stats[(DashboardStat.DimensionChoices.Total, '')] = {
+        'label': 'Toplam',
+        'internship_count': totals['internship_count'],
+        'evaluation_count': evaluation_totals['evaluation_count'],
+        'average_score': round_score(evaluation_totals['average_score']),
+    }
+
+    for dimension, (field, label_field) in DASHBOARD_DIMENSIONS.items():
+        rows = Internship.objects.values(field, label_field).annotate(internship_count=Count('id')).order_by()
+        for row in rows:
+            stats[(dimension, str(row[field]))] = {
+                'label': str(row[label_field]),
+                'internship_count': row['internship_count'],
+                'evaluation_count': 0,
+                'average_score': None,
+            }
+
+        scores = (
+            Evaluation.objects.filter(is_approved=True)
+            .values(f'internship__{field}')
+            .annotate(evaluation_count=Count('id'), average_score=Avg('overall_score'))
+            .order_by()
+        )
+        for row in scores:
+            stat = stats.get((dimension, str(row[f'internship__{field}'])))
+            if stat is not None:
+                stat['evaluation_count'] = row['evaluation_count']
+                stat['average_score'] = round_score(row['average_score'])
+
+    return stats
+
+
+def refresh_dashboard_stats():
+    """
+    Özet tabloyu tek bir transaction içinde yeniler: mevcut satırlar yerinde güncellenir,
+    artık karşılığı olmayanlar silinir. Okuyucular yenileme boyunca önceki tutarlı
+    görüntüyü görmeye devam eder.
+    """
+    from ..models import DashboardStat
+
+    stats = compute_dashboard_stats()
+    refreshed_at = timezone.now()
+    rows = [
+        DashboardStat(dimension=dimension, key=key, refreshed_at=refreshed_at, **values)
+        for (dimension, key), values in stats.items()
+    ]
+
+    with transaction.atomic():
+        DashboardStat.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['dimension', 'key'],
+            update_fields=['label', 'internship_count', 'evaluation_count', 'average_score', 'refreshed_at'],
+        )
+        removed, _ = DashboardStat.objects.exclude(refreshed_at=refreshed_at).delete()
+
+    log_info('internship_management', 'Panel istatistikleri yenilendi', {'rows': len(rows), 'removed': removed})
+    return len(rows)
@@ -0,0 +1,17 @@
+DIARY_DATE_CONSTRAINT = 'diary_unique_internship_date'
+DIARY_DAY_CONSTRAINT = 'diary_unique_internship_day'
+
+
+def diary_conflict_field(error):
+    """
+    Günlük yazımındaki IntegrityError'un hangi benzersizlik kuralını ihlal ettiğini döndürür:
+    'date', 'day_number' ya da başka bir hata ise None.
+    """
+    diag = getattr(error.__cause__, 'diag', None)
+    text = getattr(diag, 'constraint_name', None) or str(error)
+    # PostgreSQL constraint adını, SQLite ihlal edilen kolonları bildirir
+    if DIARY_DATE_CONSTRAINT in text or text.endswith('.date'):
+        return 'date'
+    if DIARY_DAY_CONSTRAINT in text or text.endswith('.day_number'):
+        return 'day_number'
+    return None
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.db import connection
+
+OVERLAP_CONSTRAINT_NAME = 'internship_no_overlap'
+PERIOD_COLUMN = 'period'
+EXCLUSION_VIOLATION = '23P01'
+
+# 'company': aynı öğrenci aynı şirkette çakışan staj alamaz
+# 'student': aynı öğrenci hiçbir şirkette çakışan staj alamaz
+OVERLAP_SCOPES = {
+    'company': ('student_id', 'company_id'),
+    'student': ('student_id',),
+}
+
+OVERLAP_MESSAGES = {
+    'company': "Bu sirket icin belirtilen tarihlerde zaten bir basvurunuz mevcut.",
+    'student': "Belirtilen tarihlerde cakisan bir staj basvurunuz mevcut.",
+}
+
+
+def get_overlap_scope():
+    scope = getattr(settings, 'INTERNSHIP_OVERLAP_SCOPE', 'company')
+    if scope not in OVERLAP_SCOPES:
+        raise ValueError(f"Geçersiz INTERNSHIP_OVERLAP_SCOPE: {scope}")
+    return scope
+
+
+def uses_exclusion_constraint(db_connection=connection):
+    """Çakışma kontrolü PostgreSQL'de exclusion constraint ile veritabanında yapılır"""
+    return db_connection.vendor == 'postgresql'
+
+
+def apply_overlap_constraint(schema_editor, table, scope):
+    """
+    `daterange(start_date, end_date, '[]')` üreten kolonu ve GiST tabanlı exclusion
+    constraint'i oluşturur, constraint zaten varsa verilen kapsamla yeniden kurar.
+    Reddedilen başvurular çakışma kontrolüne dahil edilmez.
+    """
+    quote = schema_editor.quote_name
+    columns = ', '.join(f'{quote(column)} WITH =' for column in OVERLAP_SCOPES[scope])
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} ADD COLUMN IF NOT EXISTS {quote(PERIOD_COLUMN)} daterange "
+        f"GENERATED ALWAYS AS (daterange({quote('start_date')}, {quote('end_date')}, '[]')) STORED"
+    )
+    schema_editor.execute(f'ALTER TABLE {quote(table)} DROP CONSTRAINT IF EXISTS {quote(OVERLAP_CONSTRAINT_NAME)}')
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(OVERLAP_CONSTRAINT_NAME)} "
+        f"EXCLUDE USING gist ({columns}, {quote(PERIOD_COLUMN)} WITH &&) "
+        f"WHERE ({quote('status')} <> 'rejected')"
+    )
+
+
+def remove_overlap_constraint(schema_editor, table):
+    quote = schema_editor.quote_name
+    schema_editor.execute(f'ALTER TABLE {quote(table)} DROP CONSTRAINT IF EXISTS {quote(OVERLAP_CONSTRAINT_NAME)}')
+    schema_editor.execute(f'ALTER TABLE {quote(table)} DROP COLUMN IF EXISTS {quote(PERIOD_COLUMN)}')
+
+
+def is_overlap_violation(error):
+    cause = error.__cause__
+    if getattr(cause, 'pgcode', None) == EXCLUSION_VIOLATION:
+        return True
+    return OVERLAP_CONSTRAINT_NAME in str(error)
+
+
+def overlapping_internships(internship, scope=None):
+    """PostgreSQL dışındaki veritabanları için sorgu ile çakışma kontrolü"""
+    from ..models import Internship
+
+    scope = scope or get_overlap_scope()
+    lookup = {column: getattr(internship, column) for column in OVERLAP_SCOPES[scope]}
+    return Internship.objects.filter(
+        start_date__lte=internship.end_date,
+        end_date__gte=internship.start_date,
+        **lookup
+    ).exclude(status=Internship.StatusChoices.Rejected).exclude(pk=internship.pk)
@@ -0,0 +1,214 @@
+from datetime import date
+
+from django.db import connection
+from django.utils import timezone
+
+from core.utils.conf import get_setting_group
+from core.utils.logging import log_info
+from .integrity import DIARY_DATE_CONSTRAINT, DIARY_DAY_CONSTRAINT
+
+# PostgreSQL'de InternshipDiary tablosunun akademik yıla göre bölümlenmesi. Bölümler
+# `years_ahead` yıl ileriye kadar önceden oluşturulur; eski yıllar `diary_partitions --detach-before` ile ayrılır
+DEFAULT_PARTITIONING_SETTINGS = {
+    'enabled': True,
+    'academic_year_start_month': 9,  # Akademik yılın başladığı ay (Eylül)
+    'years_ahead': 2,
+}
+
+DAY_TRIGGER_FUNCTION = 'diary_unique_internship_day_check'
+
+
+def get_partitioning_settings():
+    return get_setting_group('DIARY_PARTITIONING', DEFAULT_PARTITIONING_SETTINGS)
+
+
+def uses_partitioning(db_connection):
+    """Günlük tablosu yalnızca PostgreSQL'de akademik yıla göre bölümlenir"""
+    return db_connection.vendor == 'postgresql' and get_partitioning_settings()['enabled']
+
+
+def academic_year(value):
+    """Tarihin ait olduğu akademik yılın başladığı takvim yılı (ör. 2024-2025 için 2024)"""
+    start_month = get_partitioning_settings()['academic_year_start_month']
+    return value.year if value.month >= start_month else value.year - 1
+
+
+def academic_year_bounds(year):
+    start_month = get_partitioning_settings()['academic_year_start_month']
+    return date(year, start_month, 1), date(year + 1, start_month, 1)
+
+
+def partition_name(table, year):
+    return f'{table}_y{year}'
+
+
+def is_partitioned(cursor, table):
+    cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [f'"{table}"'])
+    return cursor.fetchone() is not None
+
+
+def list_partitions(cursor, table):
+    """Bölümleri (ad, akademik yıl) olarak yıl sırasıyla döndürür"""
+    cursor.execute(
+        'SELECT child.relname FROM pg_inherits '
+        'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+        'WHERE pg_inherits.inhparent = to_regclass(%s)',
+        [f'"{table}"']
+    )
+    prefix = f'{table}_y'
+    partitions = [(name, int(name[len(prefix):])) for (name,) in cursor.fetchall() if name.startswith(prefix)]
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(cursor, quote, parent, table, year):
+    start, end = academic_year_bounds(year)
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS {quote(partition_name(table, year))} PARTITION OF {quote(parent)} '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def ensure_partitions(db_connection, table, first_year=None, last_year=None):
+    """Geçerli akademik yıldan `years_ahead` yıl sonrasına kadar eksik bölümleri oluşturur"""
+    current = academic_year(timezone.localdate())
+    first_year = min(first_year or current, current)
+    last_year = max(last_year or current, current + get_partitioning_settings()['years_ahead'])
+    quote = db_connection.ops.quote_name
+    with db_connection.cursor() as cursor:
+        existing = {year for _, year in list_partitions(cursor, table)}
+        created = [year for year in range(first_year, last_year + 1) if year not in existing]
+        for year in created:
+            create_partition(cursor, quote, table, table, year)
+    return created
+
+
+def ensure_diary_partitions():
+    """Zamanlanmış görev: günlük tablosu bölümlenmişse gelecek yılların bölümlerini hazırlar"""
+    from ..models import InternshipDiary
+
+    table = InternshipDiary._meta.db_table
+    if not uses_partitioning(connection):
+        return []
+    with connection.cursor() as cursor:
+        if not is_partitioned(cursor, table):
+            return []
+    created = ensure_partitions(connection, table)
+    if created:
+        log_info('internship_management', 'Günlük tablosu bölümleri oluşturuldu', {'years': created})
+    return created
+
+
+def detach_partitions(db_connection, table, before_year, concurrently=False):
+    """
+    `before_year` öncesindeki akademik yılların bölümlerini ana tablodan ayırır. Ayrılan
+    tablolar silinmez; arşivlenip ayrıca kaldırılabilir. CONCURRENTLY transaction dışında
+    çalıştırılmalıdır.
+    """
+    quote = db_connection.ops.quote_name
+    option = ' CONCURRENTLY' if concurrently else ''
+    with db_connection.cursor() as cursor:
+        detached = [(name, year) for name, year in list_partitions(cursor, table) if year < before_year]
+        for name, _ in detached:
+            cursor.execute(f'ALTER TABLE {quote(table)} DETACH PARTITION {quote(name)}{option}')
+    return [name for name, _ in detached]
+
+
+def add_diary_constraints(schema_editor, model, primary_key):
+    """Bölümlü ve bölümsüz tablo için ortak sıra, anahtar, indeks ve kısıtları Django'nun adlarıyla kurar"""
+    quote = schema_editor.quote_name
+    table = model._meta.db_table
+    internship = model._meta.get_field('internship')
+    sequence = f'{table}_id_seq'
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'CREATE SEQUENCE IF NOT EXISTS {quote(sequence)} OWNED BY {quote(table)}."id"')
+        cursor.execute(f"ALTER TABLE {quote(table)} ALTER COLUMN \"id\" SET DEFAULT nextval('{quote(sequence)}')")
+        cursor.execute(f"SELECT setval('{quote(sequence)}', COALESCE(MAX(\"id\"), 0) + 1, false) FROM {quote(table)}")
+        cursor.execute(f'ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(table + "_pkey")} PRIMARY KEY ({primary_key})')
+        cursor.execute(
+            f'ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(DIARY_DATE_CONSTRAINT)} UNIQUE ("internship_id", "date")'
+        )
+        cursor.execute(f'CREATE INDEX "diary_date_id_idx" ON {quote(table)} ("date", "id")')
+    schema_editor.execute(schema_editor._create_fk_sql(model, internship, '_fk_%(to_table)s_%(to_column)s'))
+    schema_editor.execute(schema_editor._create_index_sql(model, fields=[internship]))
+
+
+def partition_diary_table(schema_editor, model):
+    """
+    Günlük tablosunu `date` üzerinde akademik yıl aralıklarıyla bölümlenmiş tabloya
+    dönüştürür. Bölümlü tabloda birincil anahtar ve benzersiz kısıtlar bölüm anahtarını
+    içermek zorunda olduğundan birincil anahtar (id, date) olur; (internship, day_number)
+    benzersizliği ise staj bazında advisory lock alan bir trigger ile korunur. Kopyalama
+    süresince yazımlar EXCLUSIVE kilitle bekletilir, okumalar devam eder.
+    """
+    quote = schema_editor.quote_name
+    table = model._meta.db_table
+    staging = f'{table}_staging'
+    with schema_editor.connection.cursor() as cursor:
+        if is_partitioned(cursor, table):
+            return
+        cursor.execute(f'LOCK TABLE {quote(table)} IN EXCLUSIVE MODE')
+        cursor.execute(f'SELECT MIN("date"), MAX("date") FROM {quote(table)}')
+        first_date, last_date = cursor.fetchone()
+
+        cursor.execute(
+            f'CREATE TABLE {quote(staging)} (LIKE {quote(table)} INCLUDING DEFAULTS) PARTITION BY RANGE ("date")'
+        )
+        cursor.execute(f'ALTER TABLE {quote(staging)} ALTER COLUMN "id" DROP DEFAULT')
+
+    # Bölümler son tablo adıyla oluşturulur, ana tablo yeniden adlandırıldığında değişmezler
+    current = academic_year(timezone.localdate())
+    first_year = academic_year(first_date) if first_date else current
+    last_year = academic_year(last_date) if last_date else current
+    with schema_editor.connection.cursor() as cursor:
+        for year in range(min(first_year, current), max(last_year, current + get_partitioning_settings()['years_ahead']) + 1):
+            create_partition(cursor, quote, staging, table, year)
+
+        cursor.execute(f'INSERT INTO {quote(staging)} SELECT * FROM {quote(table)}')
+        cursor.execute(f'DROP TABLE {quote(table)}')
+        cursor.execute(f'ALTER TABLE {quote(staging)} RENAME TO {quote(table)}')
+    add_diary_constraints(schema_editor, model, '"id", "date"')
+
+    with schema_editor.connection.cursor() as cursor:
+        # Migration durumundaki `diary_unique_internship_day` indeksi; benzersizliği trigger sağlar
+        cursor.execute(f'CREATE INDEX {quote(DIARY_DAY_CONSTRAINT)} ON {quote(table)} ("internship_id", "day_number")')
+        cursor.execute(f'''
+            CREATE OR REPLACE FUNCTION {quote(DAY_TRIGGER_FUNCTION)}() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_advisory_xact_lock(NEW."internship_id");
+                IF EXISTS (
+                    SELECT 1 FROM {quote(table)}
+                    WHERE "internship_id" = NEW."internship_id" AND "day_number" = NEW."day_number"
+                      AND "id" <> NEW."id" AND "date" <> NEW."date"
+                ) THEN
+                    RAISE EXCEPTION 'duplicate key value violates unique constraint "{DIARY_DAY_CONSTRAINT}"'
+                        USING ERRCODE = 'unique_violation', CONSTRAINT = '{DIARY_DAY_CONSTRAINT}';
+                END IF;
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+        ''')
+        cursor.execute(
+            f'CREATE TRIGGER {quote(DIARY_DAY_CONSTRAINT)} BEFORE INSERT OR UPDATE OF "internship_id", "day_number", "date" '
+            f'ON {quote(table)} FOR EACH ROW EXECUTE FUNCTION {quote(DAY_TRIGGER_FUNCTION)}()'
+        )
+
+
+def unpartition_diary_table(schema_editor, model):
+    """
+    Bölümlü günlük tablosunu tek tabloya geri dönüştürür. (internship, day_number)
+    indeksi ve trigger'ı geri alınmaz; migration bunu benzersiz kısıt olarak yeniden kurar.
+    """
+    quote = schema_editor.quote_name
+    table = model._meta.db_table
+    staging = f'{table}_staging'
+    with schema_editor.connection.cursor() as cursor:
+        if not is_partitioned(cursor, table):
+            return
+        cursor.execute(f'LOCK TABLE {quote(table)} IN EXCLUSIVE MODE')
+        cursor.execute(f'CREATE TABLE {quote(staging)} (LIKE {quote(table)} INCLUDING DEFAULTS)')
+        cursor.execute(f'ALTER TABLE {quote(staging)} ALTER COLUMN "id" DROP DEFAULT')
+        cursor.execute(f'INSERT INTO {quote(staging)} SELECT * FROM {quote(table)}')
+        cursor.execute(f'DROP TABLE {quote(table)}')
+        cursor.execute(f'DROP FUNCTION IF EXISTS {quote(DAY_TRIGGER_FUNCTION)}()')
+        cursor.execute(f'ALTER TABLE {quote(staging)} RENAME TO {quote(table)}')
+    add_diary_constraints(schema_editor, model, '"id"')
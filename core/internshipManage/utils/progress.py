@@ -0,0 +1,154 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Max, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from core.utils.logging import log_info
+from core.utils.response_cache import invalidate_tags, model_tag
+
+PROGRESS_FIELDS = ('submitted_diary_count', 'draft_diary_count', 'total_hours_worked', 'last_diary_date')
+
+SUBMITTED = 'submitted'
+DRAFT = 'draft'
+
+
+def diary_snapshot(status, hours_worked, date):
+    """Bir günlüğün ilerleme sayaçlarına katkısı"""
+    return {
+        'submitted': 1 if status == SUBMITTED else 0,
+        'draft': 1 if status == DRAFT else 0,
+        'hours': Decimal(hours_worked or 0),
+        'date': date,
+    }
+
+
+def snapshot_of(diary):
+    return diary_snapshot(diary.status, diary.hours_worked, diary.date)
+
+
+def progress_delta(old, new):
+    """İki günlük durumu arasındaki sayaç farkı; oluşturma/silme için old/new None olabilir"""
+    delta = {'submitted': 0, 'draft': 0, 'hours': Decimal(0), 'dates_changed': False}
+    for snapshot, sign in ((old, -1), (new, 1)):
+        if snapshot is None:
+            continue
+        delta['submitted'] += sign * snapshot['submitted']
+        delta['draft'] += sign * snapshot['draft']
+        delta['hours'] += sign * snapshot['hours']
+    delta['dates_changed'] = (old or {}).get('date') != (new or {}).get('date')
+    return delta
+
+
+def merge_deltas(deltas):
+    total = {'submitted': 0, 'draft': 0, 'hours': Decimal(0), 'dates_changed': False}
+    for delta in deltas:
+        total['submitted'] += delta['submitted']
+        total['draft'] += delta['draft']
+        total['hours'] += delta['hours']
+        total['dates_changed'] = total['dates_changed'] or delta['dates_changed']
+    return total
+
+
+def last_diary_date_subquery():
+    """`actual_progress` ile aynı tanım: stajın tüm günlükleri, dönem aralığıyla sınırlanmadan"""
+    from ..models import InternshipDiary
+
+    return Subquery(
+        InternshipDiary.objects.filter(internship=OuterRef('pk')).order_by('-date').values('date')[:1]
+    )
+
+
+def invalidate_progress_cache(internship_ids):
+    """
+    Sayaçlar .update()/bulk_update ile yazıldığından kayıt sinyalleri tetiklenmez; stajların
+    yanıt önbelleği etiketleri işlem commit edildikten sonra burada geçersiz kılınır.
+    """
+    from ..models import Internship
+
+    tags = {model_tag(Internship, internship_id) for internship_id in internship_ids}
+    if tags:
+        transaction.on_commit(lambda: invalidate_tags(tags))
+
+
+def apply_progress_delta(internship_id, delta):
+    """
+    Sayaçları tek bir UPDATE ile F() ifadeleri üzerinden artırır, böylece eşzamanlı yazımlar
+    birbirinin değerini ezmez. Son günlük tarihi (internship, date) indeksinden okunur.
+    """
+    from ..models import Internship
+
+    values = {}
+    if delta['submitted']:
+        values['submitted_diary_count'] = F('submitted_diary_count') + delta['submitted']
+    if delta['draft']:
+        values['draft_diary_count'] = F('draft_diary_count') + delta['draft']
+    if delta['hours']:
+        values['total_hours_worked'] = F('total_hours_worked') + delta['hours']
+    if delta['dates_changed']:
+        values['last_diary_date'] = last_diary_date_subquery()
+    if values:
+        Internship.objects.filter(pk=internship_id).update(**values)
+        invalidate_progress_cache([internship_id])
+
+
+def refresh_internship_progress(internship_id):
+    """Önceki değerleri bilinmeyen değişikliklerde tek stajın sayaçlarını yeniden hesaplar"""
+    from ..models import Internship
+
+    actual = actual_progress(Internship.objects.filter(pk=internship_id)).values(
+        'actual_submitted', 'actual_draft', 'actual_hours', 'actual_last_date'
+    ).first()
+    if actual is not None:
+        Internship.objects.filter(pk=internship_id).update(**dict(zip(PROGRESS_FIELDS, actual.values())))
+        invalidate_progress_cache([internship_id])
+
+
+def actual_progress(queryset):
+    """Sayaçların günlük tablosundan hesaplanan gerçek değerleri"""
+    return queryset.annotate(
+        actual_submitted=Count('diaries', filter=Q(diaries__status=SUBMITTED)),
+        actual_draft=Count('diaries', filter=Q(diaries__status=DRAFT)),
+        actual_hours=Coalesce(
+            Sum('diaries__hours_worked'),
+            Value(Decimal(0)),
+            output_field=DecimalField(max_digits=7, decimal_places=2)
+        ),
+        actual_last_date=Max('diaries__date'),
+    )
+
+
+def reconcile_internship_progress(batch_size=500):
+    """Tüm stajların sayaçlarını günlüklerden yeniden hesaplar, sapan kayıtları düzeltir"""
+    from ..models import Internship
+
+    queryset = actual_progress(Internship.objects.only('id', *PROGRESS_FIELDS)).order_by('id')
+    drifted = []
+    checked = 0
+    fixed = 0
+    for internship in queryset.iterator(chunk_size=batch_size):
+        checked += 1
+        actual = (
+            internship.actual_submitted,
+            internship.actual_draft,
+            internship.actual_hours,
+            internship.actual_last_date,
+        )
+        if actual == tuple(getattr(internship, field) for field in PROGRESS_FIELDS):
+            continue
+        for field, value in zip(PROGRESS_FIELDS, actual):
+            setattr(internship, field, value)
+        drifted.append(internship)
+        if len(drifted) >= batch_size:
+            Internship.objects.bulk_update(drifted, PROGRESS_FIELDS)
+            invalidate_progress_cache(internship.pk for internship in drifted)
+            fixed += len(drifted)
+            drifted = []
+
+    if drifted:
+        Internship.objects.bulk_update(drifted, PROGRESS_FIELDS)
+        invalidate_progress_cache(internship.pk for internship in drifted)
+        fixed += len(drifted)
+
+    log_info('internship_management', 'Staj ilerleme sayaçları mutabakatı tamamlandı', {'checked': checked, 'fixed': fixed})
+    return fixed
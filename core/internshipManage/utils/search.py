@@ -0,0 +1,58 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'turkish'
+SEARCH_COLUMN = 'search_vector'
+SEARCH_INDEX = 'diary_search_vector_idx'
+
+
+def uses_full_text_search(db_connection):
+    """Tam metin arama PostgreSQL'de tsvector kolonu ve GIN indeksi ile yapılır"""
+    return db_connection.vendor == 'postgresql'
+
+
+def add_search_column(schema_editor, table):
+    """
+    Görevler (A ağırlığı) ve günlük metninden (B ağırlığı) Türkçe yapılandırmayla üretilen
+    `search_vector` kolonunu ve GIN indeksini oluşturur. Kolon veritabanında hesaplandığından
+    model alanı değildir ve toplu yazımlarda da güncel kalır.
+    """
+    quote = schema_editor.quote_name
+    schema_editor.execute(
+        f"ALTER TABLE {quote(table)} ADD COLUMN IF NOT EXISTS {quote(SEARCH_COLUMN)} tsvector GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce({quote('tasks')}, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce({quote('text')}, '')), 'B')"
+        f") STORED"
+    )
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS {quote(SEARCH_INDEX)} ON {quote(table)} USING gin ({quote(SEARCH_COLUMN)})'
+    )
+
+
+def remove_search_column(schema_editor, table):
+    quote = schema_editor.quote_name
+    schema_editor.execute(f'DROP INDEX IF EXISTS {quote(SEARCH_INDEX)}')
+    schema_editor.execute(f'ALTER TABLE {quote(table)} DROP COLUMN IF EXISTS {quote(SEARCH_COLUMN)}')
+
+
+def search_diaries(queryset, text):
+    """
+    Sorguyu arama metnine uyan günlüklerle sınırlar ve `rank` ile işaretler. PostgreSQL'de
+    `websearch_to_tsquery` söz dizimi (tırnaklı ifade, `-hariç`, `or`) desteklenir; diğer
+    veritabanlarında sıralamasız `icontains` aramasına dönülür.
+    """
+    if not uses_full_text_search(connections[queryset.db]):
+        return queryset.filter(
+            Q(text__icontains=text) | Q(tasks__icontains=text)
+        ).annotate(rank=Value(0.0, output_field=FloatField()))
+
+    quote = connections[queryset.db].ops.quote_name
+    vector = RawSQL(f'{quote(queryset.model._meta.db_table)}.{quote(SEARCH_COLUMN)}', [], output_field=SearchVectorField())
+    query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+    # ts_rank float4 döndürür; keyset cursor'ında değerin birebir korunması için double'a çevrilir
+    return queryset.alias(search=vector).filter(search=query).annotate(
+        rank=Cast(SearchRank(vector, query), FloatField())
+    )
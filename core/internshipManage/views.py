@@ -1,3 +1,179 @@
-from django.shortcuts import render
+from datetime import date
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views import View
+from graphql_relay import from_global_id
+
+from core.utils.db_router import choose_read_database
+from core.utils.export import EXPORT_CHUNK_SIZE, csv_gzip_chunks, stream_in_thread
+from core.utils.logging import log_info
+from core.views import authenticate_request
+from userManage.models import Company
+from .models import Internship, InternshipDiary
+
+
+class ExportFilterError(Exception):
+    pass
+
+
+def parse_id(value):
+    """Relay global ID ya da düz birincil anahtar kabul eder"""
+    try:
+        _, pk = from_global_id(value)
+        if pk:
+            return int(pk)
+    except Exception:
+        pass
+    try:
+        return int(value)
+    except ValueError:
+        raise ExportFilterError(f"Geçersiz ID: {value}")
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ExportFilterError(f"Geçersiz tarih: {value}. YYYY-AA-GG formatında olmalıdır.")
+
+
+class BaseExportView(View):
+    """
+    Dönem sonu notlandırması için kayıtları gzip'li CSV olarak akıtır. Sorgu `values_list`
+    ve `.iterator(chunk_size=...)` ile sunucu tarafı cursor üzerinden okunur; model nesnesi
+    oluşturulmaz ve bellek kullanımı satır sayısından bağımsız kalır.
+
+    Filtreler: `company`, `status`, `department`, `date_from`, `date_to`
+    """
+
+    http_method_names = ['get']
+    permission = None
+    filename = None
+    columns = ()
+
+    async def get(self, request, *args, **kwargs):
+        user = await sync_to_async(authenticate_request)(request)
+        if not user.is_authenticated:
+            return JsonResponse({'message': 'Lütfen giriş yapınız.'}, status=401)
+        if not await sync_to_async(user.has_perm)(self.permission):
+            return JsonResponse({'message': 'Yetkiniz yok.'}, status=403)
+
+        try:
+            filters = self.get_filters(request.GET)
+        except ExportFilterError as e:
+            return JsonResponse({'message': str(e)}, status=400)
+
+        # Şirket kullanıcıları yalnızca kendi stajlarını dışa aktarabilir
+        company_id = await sync_to_async(Company.objects.filter(user=user).values_list('id', flat=True).first)()
+        if company_id is not None:
+            filters['company'] = company_id
+
+        log_info(
+            module_name="internship_management",
+            message="Dışa aktarma başlatıldı",
+            context={"export": self.filename, "user_id": user.id, "filters": {key: str(value) for key, value in filters.items()}}
+        )
+
+        # Dışa aktarma sorgusu birincil yerine bir okuma replikasında çalıştırılır
+        read_database = await sync_to_async(choose_read_database)(user)
+        header = [header for header, _ in self.columns]
+        fields = [field for _, field in self.columns]
+
+        def make_iterator():
+            rows = self.get_queryset(filters).using(read_database).order_by('id').values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            return csv_gzip_chunks(header, rows)
+
+        filename = f"{self.filename}-{timezone.localdate().isoformat()}.csv.gz"
+        response = StreamingHttpResponse(stream_in_thread(make_iterator), content_type='application/gzip')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def get_filters(self, params):
+        filters = {}
+        if params.get('company'):
+            filters['company'] = parse_id(params['company'])
+        if params.get('status'):
+            filters['status'] = params['status']
+        if params.get('department'):
+            filters['department'] = params['department']
+        if params.get('date_from'):
+            filters['date_from'] = parse_date(params['date_from'])
+        if params.get('date_to'):
+            filters['date_to'] = parse_date(params['date_to'])
+        return filters
+
+    def get_queryset(self, filters):
+        raise NotImplementedError
+
+
+class InternshipExportView(BaseExportView):
+    permission = 'internshipManage.InternshipApplicationList'
+    filename = 'internships'
+    columns = (
+        ('internship_id', 'id'),
+        ('student_number', 'student__student_number'),
+        ('first_name', 'student__first_name'),
+        ('last_name', 'student__last_name'),
+        ('faculty', 'student__faculty'),
+        ('department', 'student__department'),
+        ('company_name', 'company__company_name'),
+        ('position', 'position'),
+        ('start_date', 'start_date'),
+        ('end_date', 'end_date'),
+        ('total_working_days', 'total_working_days'),
+        ('status', 'status'),
+        ('created_at', 'created_at'),
+    )
+
+    def get_queryset(self, filters):
+        queryset = Internship.objects.all()
+        if 'company' in filters:
+            queryset = queryset.filter(company_id=filters['company'])
+        if 'status' in filters:
+            queryset = queryset.filter(status=filters['status'])
+        if 'department' in filters:
+            queryset = queryset.filter(student__department=filters['department'])
+        # Tarih aralığıyla kesişen stajlar
+        if 'date_from' in filters:
+            queryset = queryset.filter(end_date__gte=filters['date_from'])
+        if 'date_to' in filters:
+            queryset = queryset.filter(start_date__lte=filters['date_to'])
+        return queryset
+
+
+class InternshipDiaryExportView(BaseExportView):
+    permission = 'internshipManage.InternshipDiaryList'
+    filename = 'internship-diaries'
+    columns = (
+        ('diary_id', 'id'),
+        ('internship_id', 'internship_id'),
+        ('student_number', 'internship__student__student_number'),
+        ('first_name', 'internship__student__first_name'),
+        ('last_name', 'internship__student__last_name'),
+        ('department', 'internship__student__department'),
+        ('company_name', 'internship__company__company_name'),
+        ('date', 'date'),
+        ('day_number', 'day_number'),
+        ('hours_worked', 'hours_worked'),
+        ('status', 'status'),
+        ('tasks', 'tasks'),
+        ('text', 'text'),
+        ('feedback', 'feedback'),
+    )
+
+    def get_queryset(self, filters):
+        queryset = InternshipDiary.objects.all()
+        if 'company' in filters:
+            queryset = queryset.filter(internship__company_id=filters['company'])
+        if 'status' in filters:
+            queryset = queryset.filter(status=filters['status'])
+        if 'department' in filters:
+            queryset = queryset.filter(internship__student__department=filters['department'])
+        if 'date_from' in filters:
+            queryset = queryset.filter(date__gte=filters['date_from'])
+        if 'date_to' in filters:
+            queryset = queryset.filter(date__lte=filters['date_to'])
+        return queryset
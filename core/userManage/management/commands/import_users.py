@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from userManage.utils.user_import import DEFAULT_CHUNK_SIZE, UserImporter, iter_rows
+
+
+class Command(BaseCommand):
+    help = 'CSV veya XLSX dosyasından öğrenci ve şirket kullanıcılarını toplu olarak içe aktarır'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='İçe aktarılacak .csv veya .xlsx dosyası')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Tek seferde yazılacak satır sayısı')
+        parser.add_argument('--workers', type=int, default=None, help='Parola hash süreç sayısı (varsayılan: CPU sayısı)')
+        parser.add_argument('--no-mail', action='store_true', help='Hoş geldin e-postalarını kuyruğa ekleme')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        importer = UserImporter(
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            send_mail=not options['no_mail'],
+            progress=lambda result: self.stdout.write(f"{result['processed']} satır işlendi"),
+        )
+        try:
+            with open(path, 'rb') as file:
+                result = importer.run(iter_rows(file, path))
+        except OSError as e:
+            raise CommandError(f'Dosya okunamadı: {e}')
+        except Exception as e:
+            raise CommandError(str(e))
+
+        for error in result['errors']:
+            self.stderr.write(f"Satır {error['row']}: {error['message']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['students']} öğrenci, {result['companies']} şirket oluşturuldu, {result['failed']} satır hatalı"
+        ))
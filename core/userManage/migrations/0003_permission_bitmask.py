@@ -0,0 +1,45 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+def assign_permission_bits(apps, schema_editor):
+    CustomPermission = apps.get_model('userManage', 'CustomPermission')
+    CustomRole = apps.get_model('userManage', 'CustomRole')
+
+    for bit, permission in enumerate(CustomPermission.objects.order_by('id')):
+        permission.bit = bit
+        permission.save(update_fields=['bit'])
+
+    for role in CustomRole.objects.all():
+        mask = 0
+        for bit in role.permissions.values_list('bit', flat=True):
+            mask |= 1 << bit
+        role.permission_mask = mask
+        role.save(update_fields=['permission_mask'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('userManage', '0002_alter_custompermission_codename'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='custompermission',
+            name='bit',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='customrole',
+            name='permission_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='customrole',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(assign_permission_bits, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+from userManage.utils.autocomplete import (
+    TRIGRAM_INDEXES,
+    add_trigram_indexes,
+    remove_trigram_indexes,
+    uses_trigram_indexes,
+)
+
+
+def add_indexes(apps, schema_editor):
+    if not uses_trigram_indexes(schema_editor.connection):
+        return
+    for model_name, columns in TRIGRAM_INDEXES.items():
+        model = apps.get_model('userManage', model_name)
+        add_trigram_indexes(schema_editor, model._meta.db_table, columns)
+
+
+def remove_indexes(apps, schema_editor):
+    if not uses_trigram_indexes(schema_editor.connection):
+        return
+    for model_name, columns in TRIGRAM_INDEXES.items():
+        model = apps.get_model('userManage', model_name)
+        remove_trigram_indexes(schema_editor, model._meta.db_table, columns)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY transaction içinde çalıştırılamaz
+    atomic = False
+
+    dependencies = [
+        ('userManage', '0003_permission_bitmask'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
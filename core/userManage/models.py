@@ -1,11 +1,59 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Max
 from django.contrib.auth.hashers import make_password, check_password
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 
+# İzin maskesi BigIntegerField içinde tutulduğu için en fazla 63 bit kullanılabilir
+MAX_PERMISSION_BITS = 63
+
+# Eşzamanlı oluşturulan izinler aynı biti seçerse sonraki boş bit bu kadar kez denenir
+BIT_ALLOCATION_ATTEMPTS = 5
+
+# codename -> bit eşlemesi, süreç içinde bir kez yüklenir
+_permission_bits = {}
+
 class CustomPermission(models.Model):
     name = models.CharField(max_length=50)
     codename = models.CharField(max_length=150, unique=True)
     description = models.CharField(max_length=150)
+    bit = models.PositiveSmallIntegerField(unique=True, null=True, blank=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        if self.bit is not None:
+            return super().save(*args, **kwargs)
+
+        # Bit MAX(bit) + 1 olarak seçilir; aynı anda oluşturulan iki izin aynı biti alırsa
+        # benzersiz kısıt ihlal edilir ve kaybeden taraf güncel en büyük bitle yeniden dener
+        for attempt in range(BIT_ALLOCATION_ATTEMPTS):
+            self.bit = CustomPermission.next_free_bit()
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                bit_taken = CustomPermission.objects.filter(bit=self.bit).exclude(pk=self.pk).exists()
+                self.bit = None
+                if not bit_taken or attempt == BIT_ALLOCATION_ATTEMPTS - 1:
+                    raise
+
+    @staticmethod
+    def next_free_bit():
+        last_bit = CustomPermission.objects.aggregate(last=Max('bit'))['last']
+        bit = 0 if last_bit is None else last_bit + 1
+        if bit >= MAX_PERMISSION_BITS:
+            raise ValueError('İzin bit kapasitesi doldu')
+        return bit
+
+    @staticmethod
+    def get_bit(codename):
+        """İznin bit pozisyonunu döndürür, bilinmeyen izinler için None"""
+        if codename not in _permission_bits:
+            _permission_bits.update(CustomPermission.objects.values_list('codename', 'bit'))
+            _permission_bits.setdefault(codename, None)
+        return _permission_bits[codename]
+
+    @staticmethod
+    def clear_bit_cache():
+        _permission_bits.clear()
 
     def __str__(self):
         return self.name
@@ -15,10 +63,19 @@ class CustomRole(models.Model):
     permissions = models.ManyToManyField(CustomPermission, blank=True)
     description = models.CharField(max_length=150)
     created_at = models.DateTimeField(auto_now_add=True)
+    permission_mask = models.BigIntegerField(default=0, editable=False)
+    version = models.PositiveIntegerField(default=1, editable=False)
 
     def get_permission(self):
         return [perm.codename for perm in self.permissions.all()]
 
+    def compile_permission_mask(self):
+        """Rolün izinlerini tek bir tamsayı maskesine derler"""
+        mask = 0
+        for bit in self.permissions.exclude(bit=None).values_list('bit', flat=True):
+            mask |= 1 << bit
+        return mask
+
     def __str__(self):
         return self.name
 
@@ -82,10 +139,18 @@ class CustomUser(AbstractBaseUser, BaseModel):
     def has_perm(self, perm, obj=None):
         if self.is_superuser:
             return True
-    
-        if self.role:
-            return perm in self.role.get_permission()
-        return False
+
+        bit = CustomPermission.get_bit(perm)
+        if bit is None:
+            return False
+
+        # Token ile gelen maske varsa veritabanına gitmeden kontrol edilir
+        mask = getattr(self, 'token_permission_mask', None)
+        if mask is None:
+            if not self.role:
+                return False
+            mask = self.role.permission_mask
+        return bool(mask >> bit & 1)
 
     def has_module_perms(self, app_label):
         return self.is_superuser
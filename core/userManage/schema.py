@@ -1,3 +1,4 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate
 import graphene
 from .utils.jwt_payload import generate_access_token, generate_refresh_token, custom_permission_required
@@ -5,7 +6,6 @@ from .utils.upload_profile_pic import upload_to_blob
 from .utils.mail_context import get_student_mail_context, get_company_mail_context, get_admin_mail_context, send_registration_mail
 import base64
 from graphene_django.types import DjangoObjectType
-from graphene_django import DjangoConnectionField
 import jwt
 from django.conf import settings
 from userManage.utils.blacklist import TokenBlacklist
@@ -20,7 +20,12 @@ from graphene_file_upload.scalars import Upload
 
 from .utils.constants import USER_TYPES, ERROR_MESSAGES
 from .utils.validators import UserValidator
+from .utils.user_import import JOB_STATUS_FIELDS, start_import_job, get_import_job
+from .utils.autocomplete import autocomplete_companies, autocomplete_students
+from .utils.rate_limit import acquire_cooldown, count_attempt, reset_attempts
 from core.utils.logging import log_error, log_info
+from core.utils.dataloaders import BatchedConnection, load_related
+from core.utils.query_optimizer import OptimizedFilterConnectionField
 from django.core.cache import cache
 
 #-------------------------------------------------------------------------------------------------------------------------------------------------------------------------
@@ -38,6 +43,8 @@ class CustomUserNode(DjangoObjectType):
         interfaces = (graphene.relay.Node,)
 
 class StudentNode(DjangoObjectType):
+    internships_student = OptimizedFilterConnectionField('internshipManage.schema.InternshipNode', required=True)
+
     class Meta:
         model = Student
         fields = "__all__"
@@ -48,8 +55,14 @@ class StudentNode(DjangoObjectType):
             "user": ["exact"],
         }
         interfaces = (graphene.relay.Node,)
+        connection_class = BatchedConnection
+
+    def resolve_user(self, info):
+        return load_related(self, info, 'user')
 
 class CompanyNode(DjangoObjectType):
+    internships_company = OptimizedFilterConnectionField('internshipManage.schema.InternshipNode', required=True)
+
     class Meta:
         model = Company
         fields = "__all__"
@@ -62,6 +75,10 @@ class CompanyNode(DjangoObjectType):
             'tax_number': ['exact'],
         }
         interfaces = (graphene.relay.Node,)
+        connection_class = BatchedConnection
+
+    def resolve_user(self, info):
+        return load_related(self, info, 'user')
 
 class TokenType(graphene.ObjectType):
     access_token = graphene.String()
@@ -93,32 +110,13 @@ class AuthMutation(graphene.Mutation):
         password = graphene.String(required=True)
     
     @classmethod
-    def mutate(cls, root, info, usernameoremail, password):
+    async def mutate(cls, root, info, usernameoremail, password):
+        # Hız sınırı async Redis ile döngüde, kullanıcı sorgusu ve parola doğrulaması isteğin iş parçacığında çalışır
         try:
-            cache = get_cache()
-            if cache is None:
-                log_error(
-                    module_name="user_management",
-                    message="Redis bağlantı hatası - Rate limiting devre dışı",
-                    context={
-                        "error": "Redis connection failed",
-                        "client_ip": info.context.META.get('REMOTE_ADDR', 'Unknown'),
-                        "user_agent": info.context.META.get('HTTP_USER_AGENT', 'Unknown')
-                    }
-                )
-                raise Exception("Sistem şu anda kullanılamıyor. Lütfen daha sonra tekrar deneyin.")
-
             client_ip = info.context.META.get('REMOTE_ADDR', 'Unknown')
             user_agent = info.context.META.get('HTTP_USER_AGENT', 'Unknown')
             cache_key = f"auth_attempt_{usernameoremail}_{client_ip}"
-            attempts = cache.get(cache_key)
-            
-            if attempts is None:
-                attempts = 0
-                cache.set(cache_key, 1, 60)  
-            else:
-                attempts += 1
-                cache.set(cache_key, attempts, 60)
+            attempts = await count_attempt(cache_key, 60)
             
             if attempts >= 5:
                 log_error(
@@ -134,71 +132,79 @@ class AuthMutation(graphene.Mutation):
                 )
                 raise Exception("Çok fazla giriş denemesi yaptınız. Lütfen 1 dakika bekleyin.")
 
-            if '@' in usernameoremail:
-                try:
-                    user = CustomUser.objects.get(email=usernameoremail)
-                    username = user.username
-                except CustomUser.DoesNotExist:
-                    log_error(
-                        module_name="user_management",
-                        message="Email ile kullanıcı bulunamadı",
-                        context={
-                            "email": usernameoremail,
-                            "client_ip": client_ip,
-                            "user_agent": user_agent
-                        }
-                    )
-                    raise Exception(ERROR_MESSAGES['USER_NOT_FOUND'])
-            else: 
-                username = usernameoremail
+            user = await sync_to_async(cls.authenticate_user)(usernameoremail, password, attempts, cache_key, client_ip, user_agent)
+            await reset_attempts(cache_key)
+            tokens = await sync_to_async(cls.issue_tokens)(user, client_ip, user_agent)
+            return cls(tokens=tokens)
 
-            user = authenticate(username=username, password=password)
-            if user is None:
+        except Exception as e:
+            log_error(
+                module_name="user_management",
+                message="Giriş işlemi başarısız",
+                context={
+                    "error": str(e),
+                    "usernameoremail": usernameoremail,
+                    "client_ip": info.context.META.get('REMOTE_ADDR', 'Unknown'),
+                    "user_agent": info.context.META.get('HTTP_USER_AGENT', 'Unknown'),
+                    "stack_trace": str(e.__traceback__)
+                }
+            )
+            raise Exception(str(e))
+
+    @staticmethod
+    def authenticate_user(usernameoremail, password, attempts, cache_key, client_ip, user_agent):
+        if '@' in usernameoremail:
+            try:
+                user = CustomUser.objects.get(email=usernameoremail)
+                username = user.username
+            except CustomUser.DoesNotExist:
                 log_error(
                     module_name="user_management",
-                    message="Geçersiz giriş bilgileri",
+                    message="Email ile kullanıcı bulunamadı",
                     context={
-                        "username": username,
-                        "attempts": attempts,
+                        "email": usernameoremail,
                         "client_ip": client_ip,
-                        "user_agent": user_agent,
-                        "cache_key": cache_key
+                        "user_agent": user_agent
                     }
                 )
-                raise Exception("Geçersiz giriş bilgileri!")
-
-            cache.delete(cache_key)
-            access_token = generate_access_token(user)
-            refresh_token = generate_refresh_token(user)
+                raise Exception(ERROR_MESSAGES['USER_NOT_FOUND'])
+        else: 
+            username = usernameoremail
 
-            log_info(
+        user = authenticate(username=username, password=password)
+        if user is None:
+            log_error(
                 module_name="user_management",
-                message="Başarılı giriş",
+                message="Geçersiz giriş bilgileri",
                 context={
-                    "user_id": user.id,
-                    "username": user.username,
-                    "email": user.email,
+                    "username": username,
+                    "attempts": attempts,
                     "client_ip": client_ip,
                     "user_agent": user_agent,
-                    "role": user.role.name if user.role else None
+                    "cache_key": cache_key
                 }
             )
+            raise Exception("Geçersiz giriş bilgileri!")
+        return user
 
-            return cls(tokens=TokenType(access_token=access_token, refresh_token=refresh_token))
+    @staticmethod
+    def issue_tokens(user, client_ip, user_agent):
+        access_token = generate_access_token(user)
+        refresh_token = generate_refresh_token(user)
 
-        except Exception as e:
-            log_error(
-                module_name="user_management",
-                message="Giriş işlemi başarısız",
-                context={
-                    "error": str(e),
-                    "usernameoremail": usernameoremail,
-                    "client_ip": info.context.META.get('REMOTE_ADDR', 'Unknown'),
-                    "user_agent": info.context.META.get('HTTP_USER_AGENT', 'Unknown'),
-                    "stack_trace": str(e.__traceback__)
-                }
-            )
-            raise Exception(str(e))
+        log_info(
+            module_name="user_management",
+            message="Başarılı giriş",
+            context={
+                "user_id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "client_ip": client_ip,
+                "user_agent": user_agent,
+                "role": user.role.name if user.role else None
+            }
+        )
+        return TokenType(access_token=access_token, refresh_token=refresh_token)
     
 class RefreshTokenMutation(graphene.Mutation):
     tokens = graphene.Field(TokenType)
@@ -206,14 +212,13 @@ class RefreshTokenMutation(graphene.Mutation):
         refresh_token = graphene.String(required=True)
     
     @classmethod
-    def mutate(cls, root, info, refresh_token):
+    async def mutate(cls, root, info, refresh_token):
         try:
             client_ip = info.context.META.get('REMOTE_ADDR', 'Unknown')
             user_agent = info.context.META.get('HTTP_USER_AGENT', 'Unknown')
             
-            cache = get_cache()
             cache_key = f"refresh_token_{refresh_token[:10]}_{client_ip}"
-            if cache.get(cache_key):
+            if not await acquire_cooldown(cache_key, 30):
                 log_error(
                     module_name="user_management",
                     message="Çok sık token yenileme denemesi",
@@ -224,53 +229,8 @@ class RefreshTokenMutation(graphene.Mutation):
                     }
                 )
                 raise Exception("Çok sık token yenileme denemesi yapıyorsunuz. Lütfen bekleyin.")
-            cache.set(cache_key, True, 30)
-
-            payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=['HS256'])
-            if payload.get('token_type') != 'refresh':
-                log_error(
-                    module_name="user_management",
-                    message="Geçersiz token tipi",
-                    context={
-                        "token_type": payload.get('token_type'),
-                        "client_ip": client_ip,
-                        "user_agent": user_agent,
-                        "token_prefix": refresh_token[:10]
-                    }
-                )
-                raise Exception("Token tipi refresh değil")
-            
-            try:
-                user = CustomUser.objects.get(id=payload['user_id'])
-            except CustomUser.DoesNotExist:
-                log_error(
-                    module_name="user_management",
-                    message="Token için kullanıcı bulunamadı",
-                    context={
-                        "user_id": payload['user_id'],
-                        "client_ip": client_ip,
-                        "user_agent": user_agent,
-                        "token_prefix": refresh_token[:10]
-                    }
-                )
-                raise Exception(ERROR_MESSAGES['USER_NOT_FOUND'])
-
-            access_token = generate_access_token(user)
-            refresh_token = generate_refresh_token(user)
-
-            log_info(
-                module_name="user_management",
-                message="Token yenileme başarılı",
-                context={
-                    "user_id": user.id,
-                    "username": user.username,
-                    "email": user.email,
-                    "client_ip": client_ip,
-                    "user_agent": user_agent,
-                    "role": user.role.name if user.role else None
-                }
-            )
-            return cls(tokens=TokenType(access_token=access_token, refresh_token=refresh_token))
+            tokens = await sync_to_async(cls.refresh)(refresh_token, client_ip, user_agent)
+            return cls(tokens=tokens)
 
         except jwt.ExpiredSignatureError:
             log_error(
@@ -307,7 +267,55 @@ class RefreshTokenMutation(graphene.Mutation):
                 }
             )
             raise
+
+    @staticmethod
+    def refresh(refresh_token, client_ip, user_agent):
+        payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=['HS256'])
+        if payload.get('token_type') != 'refresh':
+            log_error(
+                module_name="user_management",
+                message="Geçersiz token tipi",
+                context={
+                    "token_type": payload.get('token_type'),
+                    "client_ip": client_ip,
+                    "user_agent": user_agent,
+                    "token_prefix": refresh_token[:10]
+                }
+            )
+            raise Exception("Token tipi refresh değil")
         
+        try:
+            user = CustomUser.objects.get(id=payload['user_id'])
+        except CustomUser.DoesNotExist:
+            log_error(
+                module_name="user_management",
+                message="Token için kullanıcı bulunamadı",
+                context={
+                    "user_id": payload['user_id'],
+                    "client_ip": client_ip,
+                    "user_agent": user_agent,
+                    "token_prefix": refresh_token[:10]
+                }
+            )
+            raise Exception(ERROR_MESSAGES['USER_NOT_FOUND'])
+
+        access_token = generate_access_token(user)
+        refresh_token = generate_refresh_token(user)
+
+        log_info(
+            module_name="user_management",
+            message="Token yenileme başarılı",
+            context={
+                "user_id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "client_ip": client_ip,
+                "user_agent": user_agent,
+                "role": user.role.name if user.role else None
+            }
+        )
+        return TokenType(access_token=access_token, refresh_token=refresh_token)
+
 class LogoutMutation(graphene.Mutation):
     success = graphene.Boolean()
     message = graphene.String()
@@ -317,14 +325,13 @@ class LogoutMutation(graphene.Mutation):
         refresh_token = graphene.String(required=True)
 
     @classmethod
-    def mutate(cls, root, info, access_token, refresh_token):
+    async def mutate(cls, root, info, access_token, refresh_token):
         try:
             client_ip = info.context.META.get('REMOTE_ADDR', 'Unknown')
             user_agent = info.context.META.get('HTTP_USER_AGENT', 'Unknown')
             
-            cache = get_cache()
             cache_key = f"logout_{access_token[:10]}_{client_ip}"
-            if cache.get(cache_key):
+            if not await acquire_cooldown(cache_key, 30):
                 log_error(
                     module_name="user_management",
                     message="Çok sık çıkış denemesi",
@@ -335,10 +342,8 @@ class LogoutMutation(graphene.Mutation):
                     }
                 )
                 raise Exception("Çok sık çıkış denemesi yapıyorsunuz. Lütfen bekleyin.")
-            cache.set(cache_key, True, 30)
 
-            token_blacklist = TokenBlacklist()
-            if token_blacklist.logout(access_token, refresh_token):
+            if await sync_to_async(TokenBlacklist().logout)(access_token, refresh_token):
                 log_info(
                     module_name="user_management",
                     message="Başarılı çıkış",
@@ -509,6 +514,49 @@ class CreateUserMutation(graphene.Mutation):
             )
             raise Exception(f"Kullanıcı oluşturulurken hata oluştu: {str(e)}")
             
+class UserImportErrorType(graphene.ObjectType):
+    row = graphene.Int()
+    message = graphene.String()
+
+class UserImportJobType(graphene.ObjectType):
+    job_id = graphene.String()
+    status = graphene.String()
+    filename = graphene.String()
+    processed = graphene.Int()
+    students = graphene.Int()
+    companies = graphene.Int()
+    failed = graphene.Int()
+    message = graphene.String()
+    errors = graphene.List(UserImportErrorType)
+
+class ImportUsersMutation(graphene.Mutation):
+    class Arguments:
+        file = Upload(required=True)
+        send_mail = graphene.Boolean(required=False, default_value=True)
+
+    job_id = graphene.String()
+    success = graphene.Boolean()
+    message = graphene.String()
+
+    @classmethod
+    @custom_permission_required('userManage.UserAdd')
+    def mutate(cls, root, info, file, send_mail=True):
+        try:
+            job_id = start_import_job(file, send_mail=send_mail)
+            log_info(
+                module_name="user_management",
+                message="Toplu kullanıcı içe aktarma kuyruğa alındı",
+                context={"job_id": job_id, "filename": file.name, "user_id": info.context.user.id}
+            )
+            return cls(success=True, job_id=job_id, message="İçe aktarma kuyruğa alındı. Durumu userImportStatus sorgusu ile takip edebilirsiniz.")
+        except Exception as e:
+            log_error(
+                module_name="user_management",
+                message="Toplu kullanıcı içe aktarma başlatılamadı",
+                context={"error": str(e)}
+            )
+            return cls(success=False, message=f"İçe aktarma başlatılamadı: {str(e)}")
+
 class UpdateProfileByAdminMutation(graphene.Mutation):
     class Arguments:
         user_id = graphene.ID(required=True)
@@ -911,16 +959,51 @@ class UpdateMyProfileMutation(graphene.Mutation):
             )
             raise Exception(f"Bir hata oluştu: {str(e)}")
     
+class AutocompleteResultType(graphene.ObjectType):
+    id = graphene.ID()
+    label = graphene.String()
+    detail = graphene.String()
+
 #-------------------------------------------------------------------------------------------------------------------------------------------------------------------------
 class UserManageQuery(graphene.ObjectType):
     user = graphene.relay.Node.Field(CustomUserNode)
-    users = DjangoConnectionField(CustomUserNode)
+    users = OptimizedFilterConnectionField(CustomUserNode)
     student = graphene.relay.Node.Field(StudentNode)
-    students = DjangoConnectionField(StudentNode)
+    students = OptimizedFilterConnectionField(StudentNode)
     company = graphene.relay.Node.Field(CompanyNode)
-    companies = DjangoConnectionField(CompanyNode)
+    companies = OptimizedFilterConnectionField(CompanyNode)
     me = graphene.Field(StudentNode)
     mycompany = graphene.Field(CompanyNode)
+    user_import_status = graphene.Field(UserImportJobType, job_id=graphene.String(required=True))
+    autocomplete_companies = graphene.List(
+        graphene.NonNull(AutocompleteResultType),
+        query=graphene.String(required=True),
+        limit=graphene.Int()
+    )
+    autocomplete_students = graphene.List(
+        graphene.NonNull(AutocompleteResultType),
+        query=graphene.String(required=True),
+        limit=graphene.Int()
+    )
+
+    @custom_permission_required('userManage.CompanyAutocomplete')
+    def resolve_autocomplete_companies(self, info, query, limit=None):
+        return [AutocompleteResultType(**result) for result in autocomplete_companies(query, limit)]
+
+    @custom_permission_required('userManage.StudentList')
+    def resolve_autocomplete_students(self, info, query, limit=None):
+        return [AutocompleteResultType(**result) for result in autocomplete_students(query, limit)]
+
+    @custom_permission_required('userManage.UserAdd')
+    def resolve_user_import_status(self, info, job_id):
+        job = get_import_job(job_id)
+        if job is None:
+            raise Exception("İçe aktarma işi bulunamadı.")
+        return UserImportJobType(
+            job_id=job_id,
+            errors=[UserImportErrorType(**error) for error in job.get('errors', [])],
+            **{key: value for key, value in job.items() if key in JOB_STATUS_FIELDS and key != 'errors'}
+        )
 
     def resolve_mycompany(self, info):
         user = info.context.user
@@ -992,5 +1075,6 @@ class UserManageMutation(graphene.ObjectType):
     userCreate = CreateUserMutation.Field()
     updateUserByAdmin = UpdateProfileByAdminMutation.Field()
     updatemyprofile = UpdateMyProfileMutation.Field()
+    importUsers = ImportUsersMutation.Field()
 
 #-------------------------------------------------------------------------------------------------------------------------------------------------------------------------
\ No newline at end of file
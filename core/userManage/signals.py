@@ -0,0 +1,56 @@
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+
+from core.utils.logging import log_info
+from core.utils.response_cache import invalidate_instance
+from .models import CustomPermission, CustomRole, CustomUser, Student, Company
+
+def refresh_role_masks(role_ids=None):
+    """Rol maskelerini yeniden derler, değişen rollerin versiyonunu artırır"""
+    roles = CustomRole.objects.all()
+    if role_ids is not None:
+        roles = roles.filter(pk__in=role_ids)
+
+    for role in roles:
+        mask = role.compile_permission_mask()
+        if mask == role.permission_mask:
+            continue
+        CustomRole.objects.filter(pk=role.pk).update(permission_mask=mask, version=F('version') + 1)
+        log_info(
+            module_name="user_management",
+            message="Rol izinleri değişti, rol versiyonu artırıldı",
+            context={"role_id": role.pk, "role": role.name, "permission_mask": mask}
+        )
+
+@receiver(m2m_changed, sender=CustomRole.permissions.through)
+def role_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        # İzin tarafından değiştirildiğinde pk_set rol id'lerini içerir
+        refresh_role_masks(pk_set if action != 'post_clear' else None)
+    else:
+        refresh_role_masks([instance.pk])
+
+@receiver(post_save, sender=CustomPermission)
+def permission_saved(sender, instance, created, **kwargs):
+    CustomPermission.clear_bit_cache()
+
+@receiver(post_delete, sender=CustomPermission)
+def permission_deleted(sender, instance, **kwargs):
+    CustomPermission.clear_bit_cache()
+    refresh_role_masks()
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Company)
+def profile_saved(sender, instance, **kwargs):
+    invalidate_instance(instance)
+
+@receiver(post_delete, sender=CustomUser)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Company)
+def profile_deleted(sender, instance, **kwargs):
+    invalidate_instance(instance)
@@ -1,3 +1,485 @@
-from django.test import TestCase
+import io
+import json
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.middleware import JWTAuthenticationMiddleware
+from core.testing import TEST_CACHES, GraphQLTestCase, create_company, create_role, create_student, create_user
+from core.utils.persisted_queries import hash_query
+
+from .models import Company, CustomPermission, CustomUser, Student
+from .utils import mail_queue
+from .utils.jwt_payload import generate_access_token
+from .utils.user_import import UserImporter, iter_rows, set_import_job
+
+
+class AutocompleteTests(GraphQLTestCase):
+    COMPANIES = '''
+        query ($query: String!) { autocompleteCompanies(query: $query) { label detail } }
+    '''
+    STUDENTS = '''
+        query ($query: String!, $limit: Int) { autocompleteStudents(query: $query, limit: $limit) { label detail } }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        self.student = create_user('ogrenci', create_role('Student', 'userManage.CompanyAutocomplete'))
+        self.company = create_user('sirket', create_role('Company', 'userManage.CompanyProfileUpdate', 'userManage.StudentList'))
+        create_company('Yazilim Tekno', website='https://yazilim.example.com')
+        create_company('Tekno Soft', website='https://teknosoft.example.com')
+        create_company('Atekno')
+        create_company('Baska Firma')
+        create_student(1, first_name='Ayse', last_name='Kaya', student_number='2021001')
+        create_student(2, first_name='Mehmet', last_name='Ayse', student_number='2021002')
+        create_student(3, first_name='Ayse', last_name='Demir', student_number='2020003')
+
+    def test_company_autocomplete_requires_permission(self):
+        result = self.query(self.COMPANIES, self.company, {'query': 'tekno'})
+
+        self.assertEqual(result['errors'][0]['message'], 'Yetkiniz yok.')
+
+    def test_prefix_matches_come_first(self):
+        result = self.query(self.COMPANIES, self.student, {'query': 'TEKNO'})
+
+        labels = [row['label'] for row in result['data']['autocompleteCompanies']]
+        self.assertEqual(labels, ['Tekno Soft', 'Atekno', 'Yazilim Tekno'])
+        self.assertEqual(result['data']['autocompleteCompanies'][0]['detail'], 'https://teknosoft.example.com')
+
+    def test_short_terms_return_empty_list(self):
+        result = self.query(self.COMPANIES, self.student, {'query': ' t '})
+
+        self.assertEqual(result['data']['autocompleteCompanies'], [])
+
+    def test_student_autocomplete_requires_permission(self):
+        result = self.query(self.STUDENTS, self.student, {'query': 'ayse'})
+
+        self.assertEqual(result['errors'][0]['message'], 'Yetkiniz yok.')
+
+    def test_student_autocomplete_searches_names_and_numbers(self):
+        by_name = self.query(self.STUDENTS, self.company, {'query': 'ayse'})
+        by_number = self.query(self.STUDENTS, self.company, {'query': '2021'})
+
+        self.assertEqual(
+            [row['label'] for row in by_name['data']['autocompleteStudents']],
+            ['Ayse Demir', 'Ayse Kaya', 'Mehmet Ayse']
+        )
+        self.assertEqual(
+            [row['detail'] for row in by_number['data']['autocompleteStudents']],
+            ['2021001 - Bilgisayar', '2021002 - Bilgisayar']
+        )
+
+    def test_student_autocomplete_matches_every_word(self):
+        result = self.query(self.STUDENTS, self.company, {'query': 'ayse  kaya', 'limit': 1})
+
+        self.assertEqual(result['data']['autocompleteStudents'], [{'label': 'Ayse Kaya', 'detail': '2021001 - Bilgisayar'}])
+
+
+class PersistedQueryTests(GraphQLTestCase):
+    QUERY = 'query { autocompleteCompanies(query: "tekno") { label } }'
+
+    def setUp(self):
+        super().setUp()
+        self.student = create_user('ogrenci', create_role('Student', 'userManage.CompanyAutocomplete'))
+        create_company('Tekno Soft')
+
+    @staticmethod
+    def persisted(sha256_hash, version=1):
+        return {'persistedQuery': {'version': version, 'sha256Hash': sha256_hash}}
+
+    def test_unknown_hash_asks_for_query_text(self):
+        unregistered = 'query Kayitsiz { autocompleteCompanies(query: "soft") { label } }'
+        result = self.post({'extensions': self.persisted(hash_query(unregistered))}, self.student)
+
+        self.assertEqual(result['errors'][0]['extensions']['code'], 'PERSISTED_QUERY_NOT_FOUND')
+
+    def test_registered_query_runs_by_hash(self):
+        sha256_hash = hash_query(self.QUERY)
+        registered = self.post({'query': self.QUERY, 'extensions': self.persisted(sha256_hash)}, self.student)
+        by_hash = self.post({'extensions': self.persisted(sha256_hash)}, self.student)
+
+        self.assertEqual(registered['data'], {'autocompleteCompanies': [{'label': 'Tekno Soft'}]})
+        self.assertEqual(by_hash['data'], registered['data'])
+
+    def test_hash_must_match_query(self):
+        result = self.post({'query': self.QUERY, 'extensions': self.persisted('0' * 64)}, self.student)
+
+        self.assertEqual(result['errors'][0]['extensions']['code'], 'PERSISTED_QUERY_HASH_MISMATCH')
+
+    def test_unsupported_version_is_rejected(self):
+        result = self.post({'extensions': self.persisted(hash_query(self.QUERY), version=2)}, self.student)
+
+        self.assertEqual(result['errors'][0]['extensions']['code'], 'PERSISTED_QUERY_NOT_SUPPORTED')
+
+
+class QueryLimitTests(GraphQLTestCase):
+    COMPANIES = '''
+        query ($first: Int) { companies(first: $first) { edges { node { companyName } } } }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        self.student = create_user('ogrenci', create_role('Student'))
+        create_company('Tekno Soft')
+
+    def test_page_size_limit_is_checked_before_execution(self):
+        result = self.query(self.COMPANIES, self.student, {'first': 500})
+
+        # Yetki kontrolüne ulaşılmadan reddedilir
+        error = result['errors'][0]
+        self.assertEqual(error['extensions']['code'], 'PAGE_SIZE_TOO_LARGE')
+        self.assertEqual(error['extensions']['cost']['max_page_size'], 500)
+
+    @override_settings(GRAPHQL_QUERY_LIMITS={
+        'default': {'max_depth': 10, 'max_cost': 5000, 'max_page_size': 100},
+        'Student': {'max_cost': 50},
+    })
+    def test_cost_limit_is_applied_per_role(self):
+        rejected = self.query(self.COMPANIES, self.student, {'first': 20})
+        accepted = self.query(self.COMPANIES, self.admin, {'first': 20})
+
+        self.assertEqual(rejected['errors'][0]['extensions']['code'], 'QUERY_TOO_COMPLEX')
+        self.assertEqual(rejected['errors'][0]['extensions']['limits']['max_cost'], 50)
+        self.assertNotIn('errors', accepted)
+        self.assertEqual(accepted['extensions']['cost']['cost'], 61)
+
+
+class UserImportStatusTests(GraphQLTestCase):
+    STATUS = '''
+        query ($jobId: String!) { userImportStatus(jobId: $jobId) { status processed } }
+    '''
+
+    def test_polling_sees_status_changes(self):
+        set_import_job('job-1', status='PENDING', processed=0)
+        first = self.query(self.STATUS, variables={'jobId': 'job-1'})
+
+        set_import_job('job-1', status='COMPLETED', processed=12)
+        second = self.query(self.STATUS, variables={'jobId': 'job-1'})
+
+        self.assertEqual(first['data']['userImportStatus'], {'status': 'PENDING', 'processed': 0})
+        # Etiketsiz yanıtlar önbelleğe yazılmaz
+        self.assertEqual(second['extensions']['cache'], 'MISS')
+        self.assertEqual(second['data']['userImportStatus'], {'status': 'COMPLETED', 'processed': 12})
+
+
+class PermissionMaskTests(TestCase):
+    def setUp(self):
+        CustomPermission.clear_bit_cache()
+        self.permission = CustomPermission.objects.create(name='Ekleme', codename='userManage.UserAdd', description='Ekleme')
+
+    def test_colliding_bit_is_reallocated(self):
+        # Aynı anda oluşturulan iki iznin aynı biti seçmesi taklit edilir
+        with mock.patch.object(CustomPermission, 'next_free_bit', side_effect=[self.permission.bit, self.permission.bit + 1]):
+            other = CustomPermission.objects.create(name='Silme', codename='userManage.UserDelete', description='Silme')
+
+        self.assertEqual(other.bit, self.permission.bit + 1)
+
+    def test_duplicate_codename_is_not_retried(self):
+        with self.assertRaises(IntegrityError):
+            CustomPermission.objects.create(name='Ekleme', codename='userManage.UserAdd', description='Ekleme')
+
+    def test_has_perm_reads_token_mask(self):
+        user = create_user('kullanici', create_role('Student', 'userManage.UserAdd'))
+        CustomPermission.get_bit('userManage.UserAdd')
+
+        with self.assertNumQueries(0):
+            user.token_permission_mask = 0
+            self.assertFalse(user.has_perm('userManage.UserAdd'))
+            user.token_permission_mask = 1 << self.permission.bit
+            self.assertTrue(user.has_perm('userManage.UserAdd'))
+
+    def test_role_permission_changes_bump_version(self):
+        role = create_role('Student')
+
+        role.permissions.add(self.permission)
+        role.refresh_from_db()
+        self.assertEqual((role.version, role.permission_mask), (2, 1 << self.permission.bit))
+
+        role.permissions.remove(self.permission)
+        role.refresh_from_db()
+        self.assertEqual((role.version, role.permission_mask), (3, 0))
+
+    def test_token_with_stale_role_version_is_rejected(self):
+        user = create_user('kullanici', create_role('Student'))
+        stale_token = generate_access_token(user)
+        user.role.permissions.add(self.permission)
+        user = CustomUser.objects.select_related('role').get(pk=user.pk)
+
+        def authenticate(token):
+            request = RequestFactory().post('/graphql/', HTTP_AUTHORIZATION=f'Bearer {token}')
+            return JWTAuthenticationMiddleware().authenticate(request)
+
+        self.assertFalse(authenticate(stale_token).is_authenticated)
+        fresh = authenticate(generate_access_token(user))
+        self.assertEqual(fresh.pk, user.pk)
+        self.assertEqual(fresh.token_permission_mask, 1 << self.permission.bit)
+
+
+IMPORT_CSV = """user_type,email,username,password,first_name,last_name,student_number,department,faculty,company_name,contact_person,tax_number,date_of_birth
+student,Ali@Example.com,,Parola123,Ali,Yilmaz,2020001,Bilgisayar,Muhendislik,,,,2001-05-04
+company,firma@example.com,firma,,,,,,,Tekno Soft,Ayse Kaya,1234567890,
+student,ali@example.com,,,Ali,Tekrar,2020002,Bilgisayar,Muhendislik,,,,
+student,kayitli@example.com,,,Veli,Kaya,2020003,Bilgisayar,Muhendislik,,,,
+student,eksik@example.com,,,Can,,2020004,Bilgisayar,Muhendislik,,,,
+admin,yonetici@example.com,,,,,,,,,,,
+student,tarih@example.com,,,Ece,Demir,2020005,Bilgisayar,Muhendislik,,,,04.05.2001
+""".encode('utf-8-sig')
+
+
+@override_settings(CACHES=TEST_CACHES)
+class UserImporterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student_role = create_role('Student')
+        self.company_role = create_role('Company')
+        CustomUser.objects.create_user('kayitli', 'kayitli@example.com', 'pass1234')
+
+    def run_import(self, skip=0, **kwargs):
+        importer = UserImporter(chunk_size=2, workers=1, **{'send_mail': False, **kwargs})
+        return importer.run(iter_rows(io.BytesIO(IMPORT_CSV), 'kullanicilar.csv'), skip=skip)
+
+    def test_csv_round_trip_reports_duplicate_and_invalid_rows(self):
+        result = self.run_import()
+
+        self.assertEqual(
+            (result['processed'], result['students'], result['companies'], result['failed']),
+            (7, 1, 1, 5)
+        )
+        self.assertEqual([error['row'] for error in result['errors']], [4, 5, 6, 7, 8])
+        self.assertIn('Dosyada tekrar eden email', result['errors'][0]['message'])
+        self.assertEqual(result['errors'][1]['message'], 'Kayıtlı email: kayitli@example.com')
+
+        student = Student.objects.select_related('user__role').get(student_number='2020001')
+        self.assertEqual(student.user.email, 'ali@example.com')
+        self.assertEqual(student.user.username, 'ali@example.com')
+        self.assertEqual(student.user.role, self.student_role)
+        self.assertEqual(student.date_of_birth.isoformat(), '2001-05-04')
+        self.assertTrue(student.user.check_password('Parola123'))
+
+        company = Company.objects.select_related('user').get(tax_number='1234567890')
+        self.assertEqual((company.user.username, company.user.role_id), ('firma', self.company_role.pk))
+        # Parola kayıt e-postası gönderilirken üretilir
+        self.assertFalse(company.user.has_usable_password())
+
+    def test_resumed_import_skips_written_rows(self):
+        self.run_import()
+
+        result = self.run_import(skip=2)
+
+        self.assertEqual((result['processed'], result['students'], result['companies']), (5, 0, 0))
+        self.assertEqual(CustomUser.objects.count(), 3)
+
+    def test_registration_mails_are_queued_per_password_source(self):
+        with mock.patch('userManage.utils.user_import.queue_registration_mails') as queue:
+            self.run_import(send_mail=True)
+
+        company_user = CustomUser.objects.get(username='firma')
+        student_user = CustomUser.objects.get(username='ali@example.com')
+        self.assertEqual(queue.call_args_list, [
+            mock.call([company_user.id], set_password=True),
+            mock.call([student_user.id], set_password=False),
+        ])
+
+
+class ListRedis:
+    """Testlerde kuyruğun kullandığı liste komutlarını bellekte karşılar"""
+
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(value.encode() if isinstance(value, str) else value for value in values)
+
+    def lmove(self, source, destination, where_from, where_to):
+        items = self.lists.get(source)
+        if not items:
+            return None
+        value = items.pop(0 if where_from == 'LEFT' else -1)
+        target = self.lists.setdefault(destination, [])
+        target.insert(0 if where_to == 'LEFT' else len(target), value)
+        return value
+
+    def lrem(self, key, count, value):
+        self.lists.get(key, []).remove(value)
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        pass
+
+    def messages(self, key):
+        return [json.loads(value) for value in self.lists.get(key, [])]
+
+
+@override_settings(CACHES=TEST_CACHES)
+class RegistrationMailQueueTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.redis = ListRedis()
+        patcher = mock.patch.object(mail_queue, 'get_redis_connection', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.users = [create_student(index).user for index in (1, 2)]
+        mail_queue.queue_registration_mails([user.id for user in self.users], set_password=False)
+
+    def test_sent_messages_are_acknowledged(self):
+        sent = mail_queue.send_queued_registration_mails()
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(self.redis.messages(mail_queue.REGISTRATION_MAIL_QUEUE), [])
+        self.assertEqual(self.redis.messages(mail_queue.REGISTRATION_MAIL_PROCESSING), [])
+
+    def test_interrupted_run_keeps_unsent_messages(self):
+        send = mail.EmailMessage.send
+        calls = []
+
+        def crash_after_first(message, *args, **kwargs):
+            calls.append(message)
+            if len(calls) > 1:
+                raise KeyboardInterrupt
+            return send(message, *args, **kwargs)
+
+        with mock.patch.object(mail.EmailMessage, 'send', crash_after_first):
+            with self.assertRaises(KeyboardInterrupt):
+                mail_queue.send_queued_registration_mails()
+
+        # Gönderilen mesaj onaylanmış, yarıda kalan mesaj işlem listesinde bekliyor
+        self.assertEqual(
+            [message['user_id'] for message in self.redis.messages(mail_queue.REGISTRATION_MAIL_PROCESSING)],
+            [self.users[1].id]
+        )
+
+        sent = mail_queue.send_queued_registration_mails()
+
+        self.assertEqual(sent, 1)
+        self.assertEqual([message.to for message in mail.outbox], [['student1@example.com'], ['student2@example.com']])
+        self.assertEqual(self.redis.messages(mail_queue.REGISTRATION_MAIL_PROCESSING), [])
+
+    def test_failed_send_is_requeued_with_attempt_count(self):
+        with mock.patch.object(mail.EmailMessage, 'send', side_effect=OSError('smtp')):
+            sent = mail_queue.send_queued_registration_mails()
+
+        self.assertEqual(sent, 0)
+        self.assertEqual(
+            [(message['user_id'], message['attempts']) for message in self.redis.messages(mail_queue.REGISTRATION_MAIL_QUEUE)],
+            [(self.users[0].id, 1), (self.users[1].id, 1)]
+        )
+        self.assertEqual(self.redis.messages(mail_queue.REGISTRATION_MAIL_PROCESSING), [])
+
+
+class CounterRedis:
+    """Testlerde hız sınırlarının kullandığı async Redis komutlarını bellekte karşılar"""
+
+    def __init__(self):
+        self.values = {}
+        self.commands = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.commands = []
+
+    def incr(self, key):
+        self.commands.append(('incr', key))
+
+    def expire(self, key, seconds):
+        self.commands.append(('expire', key))
+
+    async def execute(self):
+        results = []
+        for command, key in self.commands:
+            if command == 'incr':
+                self.values[key] = self.values.get(key, 0) + 1
+                results.append(self.values[key])
+            else:
+                results.append(True)
+        return results
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+
+class AuthMutationTests(GraphQLTestCase):
+    AUTH = '''
+        mutation ($login: String!, $password: String!) {
+            auth(usernameoremail: $login, password: $password) { tokens { accessToken refreshToken } }
+        }
+    '''
+    REFRESH = '''
+        mutation ($token: String!) { refreshToken(refreshToken: $token) { tokens { accessToken } } }
+    '''
+
+    def setUp(self):
+        super().setUp()
+        self.redis = CounterRedis()
+        patcher = mock.patch('userManage.utils.rate_limit.get_async_redis', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = create_user('ogrenci', create_role('Student'))
+
+    def login(self, password, login='ogrenci@example.com'):
+        return self.post({'query': self.AUTH, 'variables': {'login': login, 'password': password}})
+
+    def test_login_returns_tokens_and_resets_attempts(self):
+        self.login('yanlis123')
+        result = self.login('pass1234')
+
+        tokens = result['data']['auth']['tokens']
+        self.assertTrue(tokens['accessToken'] and tokens['refreshToken'])
+        self.assertEqual(self.redis.values, {})
+
+    def test_fifth_attempt_within_window_is_rejected(self):
+        messages = [self.login('yanlis123')['errors'][0]['message'] for _ in range(4)]
+        blocked = self.login('pass1234')
+
+        self.assertEqual(messages, ['Geçersiz giriş bilgileri!'] * 4)
+        self.assertEqual(blocked['errors'][0]['message'], 'Çok fazla giriş denemesi yaptınız. Lütfen 1 dakika bekleyin.')
+        self.assertIsNone(blocked['data']['auth'])
+
+    def test_unreachable_redis_rejects_login(self):
+        with mock.patch.object(self.redis, 'execute', side_effect=ConnectionError('redis')):
+            result = self.login('pass1234')
+
+        self.assertEqual(result['errors'][0]['message'], 'Sistem şu anda kullanılamıyor. Lütfen daha sonra tekrar deneyin.')
+
+    def test_refresh_is_rate_limited_per_token(self):
+        refresh_token = self.login('pass1234')['data']['auth']['tokens']['refreshToken']
+
+        first = self.post({'query': self.REFRESH, 'variables': {'token': refresh_token}})
+        second = self.post({'query': self.REFRESH, 'variables': {'token': refresh_token}})
+
+        self.assertTrue(first['data']['refreshToken']['tokens']['accessToken'])
+        self.assertEqual(second['errors'][0]['message'], 'Çok sık token yenileme denemesi yapıyorsunuz. Lütfen bekleyin.')
+
+    def test_sync_root_fields_run_in_request_thread(self):
+        threads = []
+
+        def search(query, limit):
+            threads.append(threading.get_ident())
+            return []
+
+        role = create_role('Company', 'userManage.CompanyAutocomplete', 'userManage.StudentList')
+        user = create_user('sirket', role)
+        with mock.patch('userManage.schema.autocomplete_companies', side_effect=search), \
+                mock.patch('userManage.schema.autocomplete_students', side_effect=search):
+            result = self.query('{ autocompleteCompanies(query: "ab") { label } autocompleteStudents(query: "ab") { label } }', user)
+
+        # ORM erişen senkron çözücüler olay döngüsünde değil, isteği işleyen iş parçacığında çalışır
+        self.assertNotIn('errors', result)
+        self.assertEqual(threads, [threading.get_ident()] * 2)
@@ -0,0 +1,146 @@
+from functools import reduce
+
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, Q, Value, When
+from graphql_relay import to_global_id
+
+from core.utils.conf import get_setting_group
+from core.utils.logging import log_warning
+
+# autocompleteCompanies / autocompleteStudents sorguları. Sonuçlar sık yazılan önekler için
+# `cache_timeout` saniye önbellekte tutulur; `min_length` altındaki terimler sorgu çalıştırmaz
+DEFAULT_AUTOCOMPLETE_SETTINGS = {
+    'min_length': 2,
+    'default_limit': 10,
+    'max_limit': 20,
+    'cache_timeout': 60,
+}
+
+CACHE_KEY_PREFIX = 'autocomplete'
+
+# icontains/istartswith filtrelerinin ürettiği UPPER(kolon::text) LIKE ifadeleri için trigram indeksleri
+TRIGRAM_INDEXES = {
+    'Student': ('student_number', 'department', 'faculty', 'first_name', 'last_name'),
+    'Company': ('company_name', 'contact_person', 'address', 'website'),
+}
+
+
+def get_autocomplete_settings():
+    return get_setting_group('AUTOCOMPLETE', DEFAULT_AUTOCOMPLETE_SETTINGS)
+
+
+def uses_trigram_indexes(db_connection):
+    return db_connection.vendor == 'postgresql'
+
+
+def trigram_index_name(table, column):
+    return f'{table}_{column}_trgm'
+
+
+def add_trigram_indexes(schema_editor, table, columns):
+    """Django'nun büyük/küçük harf duyarsız LIKE ifadesiyle birebir eşleşen GIN trigram indekslerini oluşturur"""
+    quote = schema_editor.quote_name
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in columns:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(trigram_index_name(table, column))} '
+            f'ON {quote(table)} USING gin ((UPPER({quote(column)}::text)) gin_trgm_ops)'
+        )
+
+
+def remove_trigram_indexes(schema_editor, table, columns):
+    quote = schema_editor.quote_name
+    for column in columns:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {quote(trigram_index_name(table, column))}')
+
+
+def clamp_limit(limit):
+    config = get_autocomplete_settings()
+    if limit is None:
+        return config['default_limit']
+    return max(1, min(limit, config['max_limit']))
+
+
+def cached_autocomplete(kind, term, limit, search):
+    """
+    Sonuçları kısa süreli önbellekte tutar; sık yazılan önekler (ör. "tek", "yaz")
+    veritabanına gitmeden döner. Önbellek hatalarında doğrudan sorgu çalıştırılır.
+    """
+    config = get_autocomplete_settings()
+    term = ' '.join(term.split())
+    if len(term) < config['min_length']:
+        return []
+
+    key = f'{CACHE_KEY_PREFIX}:{kind}:{limit}:{term.upper()}'
+    try:
+        results = cache.get(key)
+    except Exception as e:
+        log_warning('user_management', 'Otomatik tamamlama önbelleği okunamadı', {'error': str(e)})
+        return search(term, limit)
+
+    if results is None:
+        results = search(term, limit)
+        try:
+            cache.set(key, results, config['cache_timeout'])
+        except Exception as e:
+            log_warning('user_management', 'Otomatik tamamlama önbelleği yazılamadı', {'error': str(e)})
+    return results
+
+
+def search_companies(term, limit):
+    from ..models import Company
+
+    rows = (
+        Company.objects.filter(company_name__icontains=term)
+        .annotate(prefix_rank=Case(
+            When(company_name__istartswith=term, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        ))
+        .order_by('prefix_rank', 'company_name', 'id')
+        .values('id', 'company_name', 'website')[:limit]
+    )
+    return [
+        {'id': to_global_id('CompanyNode', row['id']), 'label': row['company_name'], 'detail': row['website']}
+        for row in rows
+    ]
+
+
+def search_students(term, limit):
+    """Her kelime öğrenci numarası, ad ya da soyadından birinde geçmelidir"""
+    from ..models import Student
+
+    conditions = [
+        Q(student_number__istartswith=word) | Q(first_name__icontains=word) | Q(last_name__icontains=word)
+        for word in term.split()
+    ]
+    rows = (
+        Student.objects.filter(reduce(lambda left, right: left & right, conditions))
+        .annotate(prefix_rank=Case(
+            When(student_number__istartswith=term, then=Value(0)),
+            When(first_name__istartswith=term, then=Value(1)),
+            When(last_name__istartswith=term, then=Value(1)),
+            default=Value(2),
+            output_field=IntegerField(),
+        ))
+        .order_by('prefix_rank', 'first_name', 'last_name', 'id')
+        .values('id', 'first_name', 'last_name', 'student_number', 'department')[:limit]
+    )
+    return [
+        {
+            'id': to_global_id('StudentNode', row['id']),
+            'label': f"{row['first_name']} {row['last_name']}",
+            'detail': f"{row['student_number']} - {row['department']}",
+        }
+        for row in rows
+    ]
+
+
+def autocomplete_companies(term, limit=None):
+    limit = clamp_limit(limit)
+    return cached_autocomplete('company', term, limit, search_companies)
+
+
+def autocomplete_students(term, limit=None):
+    limit = clamp_limit(limit)
+    return cached_autocomplete('student', term, limit, search_students)
@@ -41,6 +41,8 @@ def generate_access_token(user):
     payload = {
         'user_id':user.id,
         'user_role':user.role.name,
+        'permission_mask':user.role.permission_mask,
+        'role_version':user.role.version,
         'exp': datetime.utcnow() + timedelta(hours=1),
         'iat': datetime.utcnow(),
         'token_type':'access',
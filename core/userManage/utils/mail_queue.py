@@ -0,0 +1,175 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+from django_redis import get_redis_connection
+
+from core.utils.logging import log_error, log_info
+from .mail_context import get_student_mail_context, get_company_mail_context
+from .passwords import generate_password, hash_password, init_hash_worker
+
+REGISTRATION_MAIL_QUEUE = 'mail_queue:registration'
+# Deneme sınırını aşan mesajlar; yalnızca kullanıcı kimliği içerir, elle incelenip yeniden kuyruğa alınabilir
+REGISTRATION_MAIL_DEAD_LETTER = 'mail_queue:registration:failed'
+# Gönderilmek üzere alınan, henüz onaylanmamış mesajlar; süreç yarıda kesilirse kuyruğa geri alınır
+REGISTRATION_MAIL_PROCESSING = 'mail_queue:registration:processing'
+REGISTRATION_MAIL_LOCK = 'mail_queue:registration:lock'
+REGISTRATION_MAIL_LOCK_TIMEOUT = 600
+MAX_SEND_ATTEMPTS = 5
+
+
+def queue_registration_mails(user_ids, set_password=True):
+    """
+    Kayıt e-postalarını kuyruğa ekler. Kuyrukta parola tutulmaz; `set_password` ise parola
+    gönderim anında üretilip kaydedilir ve yalnızca e-postada yer alır.
+    """
+    payloads = [
+        json.dumps({'user_id': user_id, 'set_password': set_password, 'attempts': 0})
+        for user_id in user_ids
+    ]
+    if payloads:
+        get_redis_connection('default').rpush(REGISTRATION_MAIL_QUEUE, *payloads)
+    return len(payloads)
+
+
+def registration_mail_context(user, password):
+    profile = getattr(user, 'student_profile', None)
+    if profile is not None:
+        return get_student_mail_context({'first_name': profile.first_name, 'last_name': profile.last_name}, user.email, password)
+    profile = getattr(user, 'company_profile', None)
+    if profile is not None:
+        return get_company_mail_context({'company_name': profile.company_name, 'contact_person': profile.contact_person}, user.email, password)
+    return None
+
+
+def set_generated_passwords(users, workers=None):
+    """
+    Henüz hiç giriş yapmamış kullanıcılara yeni parola üretir, süreç havuzunda hash'leyip
+    tek sorguyla kaydeder. Tekrar denenen gönderimlerde önceki (ulaşmamış) parola geçersizleşir.
+    """
+    from ..models import CustomUser
+
+    passwords = {user.id: generate_password() for user in users if user.last_login is None}
+    if not passwords:
+        return passwords
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_hash_worker) as executor:
+        hashes = executor.map(hash_password, passwords.values(), chunksize=16)
+        by_id = {user.id: user for user in users}
+        for user_id, password_hash in zip(passwords, hashes):
+            by_id[user_id].password = password_hash
+    CustomUser.objects.bulk_update([by_id[user_id] for user_id in passwords], ['password'])
+    return passwords
+
+
+def claim_registration_mails(redis, batch_size):
+    """
+    Önceki çalıştırmadan onaylanmadan kalan mesajları kuyruğun başına geri alır, ardından
+    en fazla `batch_size` mesajı LMOVE ile işlem listesine taşıyarak döndürür.
+    """
+    while redis.lmove(REGISTRATION_MAIL_PROCESSING, REGISTRATION_MAIL_QUEUE, 'RIGHT', 'LEFT') is not None:
+        pass
+    payloads = []
+    while len(payloads) < batch_size:
+        payload = redis.lmove(REGISTRATION_MAIL_QUEUE, REGISTRATION_MAIL_PROCESSING, 'LEFT', 'RIGHT')
+        if payload is None:
+            break
+        payloads.append(payload)
+    return payloads
+
+
+def send_queued_registration_mails(batch_size=100, workers=None):
+    """
+    Kuyruktaki kayıt e-postalarını tek SMTP bağlantısı üzerinden gönderir. Mesajlar gönderim
+    süresince işlem listesinde tutulur ve her biri gönderildikten sonra onaylanıp silinir; süreç
+    yarıda kesilirse sonraki çalıştırma onaylanmamış mesajları yeniden dener. Gönderilemeyen
+    mesajlar `MAX_SEND_ATTEMPTS` denemeye kadar kuyruğa geri eklenir, sonra ayrı listeye taşınır.
+    """
+    # Aynı anda tek gönderici çalışır; aksi halde diğerinin işlem listesindeki mesajlar geri alınırdı
+    if not cache.add(REGISTRATION_MAIL_LOCK, True, REGISTRATION_MAIL_LOCK_TIMEOUT):
+        return 0
+    try:
+        return send_claimed_registration_mails(get_redis_connection('default'), batch_size, workers)
+    finally:
+        cache.delete(REGISTRATION_MAIL_LOCK)
+
+
+def send_claimed_registration_mails(redis, batch_size, workers):
+    """Alınan mesajları gönderir; her mesaj gönderildikten ya da yeniden kuyruğa alındıktan sonra onaylanır"""
+    from ..models import CustomUser
+
+    payloads = claim_registration_mails(redis, batch_size)
+    if not payloads:
+        return 0
+    messages = [(payload, json.loads(payload)) for payload in payloads]
+
+    users = CustomUser.objects.select_related('student_profile', 'company_profile').in_bulk(
+        [message['user_id'] for _, message in messages]
+    )
+    passwords = set_generated_passwords(
+        [users[message['user_id']] for _, message in messages if message['set_password'] and message['user_id'] in users],
+        workers=workers
+    )
+
+    counts = {'sent': 0, 'retried': 0, 'dead_lettered': 0}
+
+    def acknowledge(payload, requeue_to=None, message=None):
+        pipeline = redis.pipeline()
+        if requeue_to is not None:
+            pipeline.rpush(requeue_to, json.dumps(message))
+        pipeline.lrem(REGISTRATION_MAIL_PROCESSING, 1, payload)
+        pipeline.execute()
+
+    def fail(payload, message, error):
+        message['attempts'] += 1
+        dead = message['attempts'] >= MAX_SEND_ATTEMPTS
+        counts['dead_lettered' if dead else 'retried'] += 1
+        acknowledge(payload, REGISTRATION_MAIL_DEAD_LETTER if dead else REGISTRATION_MAIL_QUEUE, message)
+        log_error(
+            module_name="user_management",
+            message="Kuyruktaki kayıt e-postası gönderilemedi",
+            context={"user_id": message['user_id'], "attempts": message['attempts'], "error": str(error)}
+        )
+
+    pending = list(messages)
+    try:
+        with get_connection() as connection:
+            while pending:
+                payload, message = pending[0]
+                user = users.get(message['user_id'])
+                mail = registration_mail_context(user, passwords.get(user.id)) if user is not None else None
+                # Kullanıcı ya da profili silinmişse mesaj atlanır
+                if mail is not None:
+                    subject, context = mail
+                    html_message = render_to_string('emails/email.html', context)
+                    email = EmailMultiAlternatives(
+                        subject=subject,
+                        body=strip_tags(html_message),
+                        from_email=settings.DEFAULT_FROM_EMAIL,
+                        to=[user.email],
+                        connection=connection,
+                    )
+                    email.attach_alternative(html_message, 'text/html')
+                    try:
+                        email.send()
+                        counts['sent'] += 1
+                        acknowledge(payload)
+                    except Exception as e:
+                        fail(payload, message, e)
+                else:
+                    acknowledge(payload)
+                pending.pop(0)
+    except Exception as e:
+        # SMTP bağlantısı kurulamadı ya da koptu; gönderilmemiş mesajlar tekrar denenir
+        for payload, message in pending:
+            fail(payload, message, e)
+
+    log_info(
+        module_name="user_management",
+        message="Kuyruktaki kayıt e-postaları gönderildi",
+        context=counts
+    )
+    return counts['sent']
@@ -0,0 +1,20 @@
+import string
+
+from django.contrib.auth.hashers import make_password
+from django.utils.crypto import get_random_string
+
+
+def generate_password():
+    return get_random_string(10, string.ascii_letters + string.digits) + get_random_string(1, string.ascii_letters) + get_random_string(1, string.digits)
+
+
+def hash_password(password):
+    return make_password(password)
+
+
+def init_hash_worker():
+    # spawn/forkserver ile başlatılan süreçlerde Django ayarları yeniden yüklenmelidir
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
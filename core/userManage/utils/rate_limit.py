@@ -0,0 +1,49 @@
+from contextlib import asynccontextmanager
+
+from core.utils.logging import log_error
+from core.utils.realtime import get_async_redis
+
+KEY_PREFIX = 'rate_limit'
+UNAVAILABLE_MESSAGE = "Sistem şu anda kullanılamıyor. Lütfen daha sonra tekrar deneyin."
+
+
+def rate_limit_key(key):
+    return f'{KEY_PREFIX}:{key}'
+
+
+@asynccontextmanager
+async def rate_limit_redis():
+    """Redis'e ulaşılamazsa istek sınırsız bırakılmaz, kullanıcıya genel bir hata döner"""
+    try:
+        yield get_async_redis()
+    except Exception as e:
+        log_error(
+            module_name="user_management",
+            message="Redis bağlantı hatası - Rate limiting devre dışı",
+            context={"error": str(e)}
+        )
+        raise Exception(UNAVAILABLE_MESSAGE)
+
+
+async def count_attempt(key, window):
+    """
+    Denemeyi sayar ve son denemeden bu yana `window` saniye içindeki toplam deneme sayısını
+    döndürür. INCR ile sayıldığından eşzamanlı istekler aynı değeri okuyup sınırı aşamaz.
+    """
+    async with rate_limit_redis() as redis:
+        async with redis.pipeline(transaction=True) as pipeline:
+            pipeline.incr(rate_limit_key(key))
+            pipeline.expire(rate_limit_key(key), window)
+            attempts, _ = await pipeline.execute()
+    return attempts
+
+
+async def reset_attempts(key):
+    async with rate_limit_redis() as redis:
+        await redis.delete(rate_limit_key(key))
+
+
+async def acquire_cooldown(key, seconds):
+    """Anahtar için bekleme süresi başlatır; süre dolmadan yapılan çağrılarda False döner"""
+    async with rate_limit_redis() as redis:
+        return bool(await redis.set(rate_limit_key(key), 1, ex=seconds, nx=True))
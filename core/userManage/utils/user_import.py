@@ -0,0 +1,383 @@
+import csv
+import io
+import os
+import shutil
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, close_old_connections, transaction
+from django_redis import get_redis_connection
+
+from core.utils.conf import get_setting_group
+from core.utils.logging import log_error, log_info
+from core.utils.response_cache import invalidate_tags
+from ..models import CustomRole, CustomUser, Student, Company
+from .constants import USER_TYPES
+from .mail_queue import queue_registration_mails
+from .passwords import hash_password, init_hash_worker
+from .validators import UserValidator
+
+DEFAULT_CHUNK_SIZE = 500
+IMPORT_JOB_TIMEOUT = 60 * 60 * 24
+IMPORT_QUEUE = 'user_import:queue'
+IMPORT_LOCK_KEY = 'user_import:lock'
+
+# importUsers mutasyonu dosyayı `upload_dir` dizinine yazıp işi kuyruğa ekler; içe aktarma
+# `core.tasks.run_user_imports` cron görevinde çalışır. Dizin web ve cron süreçleri arasında paylaşılmalıdır
+DEFAULT_USER_IMPORT_SETTINGS = {
+    'upload_dir': None,  # Boşsa BASE_DIR/imports kullanılır
+    'lock_timeout': 600,  # Tek çalıştırıcı kilidinin süresi (saniye), her parça yazıldıktan sonra yenilenir
+    'max_attempts': 3,  # Yarıda kalan bir işin en fazla kaç kez yeniden başlatılacağı
+}
+
+# userImportStatus sorgusunda döndürülen iş alanları
+JOB_STATUS_FIELDS = ('status', 'filename', 'processed', 'students', 'companies', 'failed', 'message', 'errors')
+
+# Kullanıcı tipine göre zorunlu profil kolonları
+REQUIRED_COLUMNS = {
+    USER_TYPES['STUDENT']: ('first_name', 'last_name', 'student_number', 'department', 'faculty'),
+    USER_TYPES['COMPANY']: ('company_name', 'contact_person'),
+}
+
+ROLE_NAMES = {
+    USER_TYPES['STUDENT']: 'Student',
+    USER_TYPES['COMPANY']: 'Company',
+}
+
+STUDENT_FIELDS = ('first_name', 'last_name', 'student_number', 'department', 'faculty', 'phone_number', 'address', 'date_of_birth')
+COMPANY_FIELDS = ('company_name', 'contact_person', 'website', 'tax_number', 'phone_number', 'address')
+
+
+def iter_csv_rows(file):
+    stream = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    for row in csv.DictReader(stream):
+        yield {(key or '').strip().lower(): value for key, value in row.items()}
+
+
+def iter_xlsx_rows(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValidationError("XLSX içe aktarma için openpyxl paketi kurulu olmalıdır.")
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell or '').strip().lower() for cell in next(rows, ())]
+        for values in rows:
+            if not any(value not in (None, '') for value in values):
+                continue
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_rows(file, filename):
+    """Dosyayı belleğe almadan satır satır okur"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        return iter_csv_rows(file)
+    if extension in ('.xlsx', '.xlsm'):
+        return iter_xlsx_rows(file)
+    raise ValidationError("Desteklenmeyen dosya tipi. CSV veya XLSX yükleyiniz.")
+
+
+def clean_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (date,)):
+        return value
+    value = str(value).strip()
+    return value or None
+
+
+class UserImporter:
+    """
+    CSV/XLSX dosyasından öğrenci ve şirket kullanıcılarını parça parça içe aktarır.
+    Her parça toplu olarak doğrulanır, e-posta/kullanıcı adı/öğrenci no/vergi no tekrarları
+    veritabanına karşı tek sorguda kontrol edilir, parolalar süreç havuzunda hash'lenir ve
+    kullanıcılar ile profiller bulk_create ile yazılır. Hoş geldin e-postaları kuyruğa alınır.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, send_mail=True, progress=None):
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.send_mail = send_mail
+        self.progress = progress
+        self.roles = {}
+        self.seen = {'email': set(), 'username': set(), 'student_number': set(), 'tax_number': set()}
+        self.result = {'processed': 0, 'students': 0, 'companies': 0, 'failed': 0, 'errors': []}
+
+    def run(self, rows, skip=0):
+        """`skip` yarıda kalan bir işe devam ederken daha önce yazılmış satırları atlar"""
+        self.roles = {
+            user_type: CustomRole.objects.filter(name__iexact=role_name).first()
+            for user_type, role_name in ROLE_NAMES.items()
+        }
+        numbered_rows = islice(enumerate(rows, start=2), skip, None)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=init_hash_worker) as executor:
+            while True:
+                chunk = list(islice(numbered_rows, self.chunk_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, executor)
+                if self.progress:
+                    self.progress(self.result)
+
+        invalidate_tags({'customuser:list', 'student:list', 'company:list'})
+        log_info(
+            module_name="user_management",
+            message="Toplu kullanıcı içe aktarma tamamlandı",
+            context={key: value for key, value in self.result.items() if key != 'errors'}
+        )
+        return self.result
+
+    def add_error(self, row_number, message):
+        self.result['failed'] += 1
+        self.result['errors'].append({'row': row_number, 'message': message})
+
+    def validate_row(self, row):
+        """Satırı normalize eder, hata varsa ValidationError fırlatır"""
+        data = {key: clean_value(value) for key, value in row.items() if key}
+        user_type = (data.get('user_type') or '').lower()
+        if user_type not in REQUIRED_COLUMNS:
+            raise ValidationError("Geçersiz kullanıcı tipi")
+        if self.roles.get(user_type) is None:
+            raise ValidationError("Rol bulunamadı")
+        data['user_type'] = user_type
+
+        if not data.get('email'):
+            raise ValidationError("E-posta zorunludur")
+        data['email'] = data['email'].lower()
+        UserValidator.validate_email(data['email'])
+        data['username'] = data.get('username') or data['email']
+
+        missing = [column for column in REQUIRED_COLUMNS[user_type] if not data.get(column)]
+        if missing:
+            raise ValidationError(f"Eksik alanlar: {', '.join(missing)}")
+
+        if data.get('password'):
+            UserValidator.validate_password(data['password'])
+        if data.get('phone_number'):
+            UserValidator.validate_phone(data['phone_number'])
+        if data.get('student_number') and len(data['student_number']) > 10:
+            raise ValidationError("Öğrenci numarası en fazla 10 karakter olabilir")
+        if isinstance(data.get('date_of_birth'), str):
+            try:
+                data['date_of_birth'] = date.fromisoformat(data['date_of_birth'][:10])
+            except ValueError:
+                raise ValidationError("Doğum tarihi YYYY-AA-GG formatında olmalıdır")
+
+        for key in self.seen:
+            if data.get(key) and data[key] in self.seen[key]:
+                raise ValidationError(f"Dosyada tekrar eden {key}: {data[key]}")
+        return data
+
+    def existing_values(self, rows):
+        """Parçadaki benzersiz alanların veritabanında zaten kayıtlı olanlarını toplu sorgular"""
+        def values(key):
+            return {row[key] for row in rows if row.get(key)}
+
+        return {
+            'email': set(CustomUser.objects.filter(email__in=values('email')).values_list('email', flat=True)),
+            'username': set(CustomUser.objects.filter(username__in=values('username')).values_list('username', flat=True)),
+            'student_number': set(Student.objects.filter(student_number__in=values('student_number')).values_list('student_number', flat=True)),
+            'tax_number': set(Company.objects.filter(tax_number__in=values('tax_number')).values_list('tax_number', flat=True)),
+        }
+
+    def import_chunk(self, chunk, executor):
+        valid = []
+        for row_number, row in chunk:
+            self.result['processed'] += 1
+            try:
+                data = self.validate_row(row)
+            except ValidationError as e:
+                self.add_error(row_number, '; '.join(e.messages))
+                continue
+            for key in self.seen:
+                if data.get(key):
+                    self.seen[key].add(data[key])
+            valid.append((row_number, data))
+
+        existing = self.existing_values([data for _, data in valid])
+        rows = []
+        for row_number, data in valid:
+            duplicate = next((key for key in existing if data.get(key) and data[key] in existing[key]), None)
+            if duplicate:
+                self.add_error(row_number, f"Kayıtlı {duplicate}: {data[duplicate]}")
+                continue
+            rows.append((row_number, data))
+        if not rows:
+            return
+
+        # Parolası verilmeyen kullanıcılara parola, kayıt e-postası gönderilirken üretilir
+        supplied = [data['password'] for _, data in rows if data.get('password')]
+        hashes = iter(executor.map(hash_password, supplied, chunksize=16))
+        users = [
+            CustomUser(
+                username=data['username'],
+                email=data['email'],
+                password=next(hashes) if data.get('password') else make_password(None),
+                role=self.roles[data['user_type']]
+            )
+            for _, data in rows
+        ]
+
+        try:
+            with transaction.atomic():
+                CustomUser.objects.bulk_create(users)
+                students = []
+                companies = []
+                for (_, data), user in zip(rows, users):
+                    if data['user_type'] == USER_TYPES['STUDENT']:
+                        students.append(Student(user=user, **{field: data.get(field) for field in STUDENT_FIELDS}))
+                    else:
+                        companies.append(Company(user=user, **{field: data.get(field) for field in COMPANY_FIELDS}))
+                Student.objects.bulk_create(students)
+                Company.objects.bulk_create(companies)
+        except IntegrityError as e:
+            # Eşzamanlı bir kayıt tekrar kontrolünden sonra eklenmiş olabilir
+            log_error(
+                module_name="user_management",
+                message="Toplu kullanıcı içe aktarmada parça yazılamadı",
+                context={"first_row": rows[0][0], "last_row": rows[-1][0], "error": str(e)}
+            )
+            for row_number, _ in rows:
+                self.add_error(row_number, "Kayıt sırasında çakışma oluştu, satırı tekrar deneyiniz")
+            return
+
+        self.result['students'] += len(students)
+        self.result['companies'] += len(companies)
+
+        if self.send_mail:
+            generated = [user.id for (_, data), user in zip(rows, users) if not data.get('password')]
+            supplied = [user.id for (_, data), user in zip(rows, users) if data.get('password')]
+            try:
+                queue_registration_mails(generated, set_password=True)
+                queue_registration_mails(supplied, set_password=False)
+            except Exception as e:
+                log_error(
+                    module_name="user_management",
+                    message="Kayıt e-postaları kuyruğa eklenemedi",
+                    context={"count": len(rows), "error": str(e)}
+                )
+
+
+def get_user_import_settings():
+    config = get_setting_group('USER_IMPORT', DEFAULT_USER_IMPORT_SETTINGS)
+    config['upload_dir'] = config['upload_dir'] or os.path.join(settings.BASE_DIR, 'imports')
+    return config
+
+
+def import_job_key(job_id):
+    return f'user_import:{job_id}'
+
+
+def get_import_job(job_id):
+    return cache.get(import_job_key(job_id))
+
+
+def set_import_job(job_id, **values):
+    job = {**(get_import_job(job_id) or {}), **values}
+    cache.set(import_job_key(job_id), job, IMPORT_JOB_TIMEOUT)
+    return job
+
+
+def remove_import_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def run_import_job(job_id):
+    """
+    Kuyruktaki bir içe aktarma işini çalıştırır. İlerleme her parça yazıldıktan sonra kaydedilir;
+    süreç yarıda kesilirse iş bir sonraki çalıştırmada kaydedilen satırdan devam eder.
+    """
+    job = get_import_job(job_id)
+    if job is None:
+        return
+    config = get_user_import_settings()
+    attempts = job.get('attempts', 0) + 1
+    if attempts > config['max_attempts']:
+        set_import_job(job_id, status='FAILED', message="İçe aktarma tamamlanamadı, deneme sınırına ulaşıldı.")
+        remove_import_file(job['path'])
+        return
+    set_import_job(job_id, status='RUNNING', attempts=attempts)
+
+    def save_progress(result):
+        set_import_job(job_id, **result)
+        # Uzun süren işlerde kilidin süresi dolup ikinci bir çalıştırıcı başlamasın
+        cache.touch(IMPORT_LOCK_KEY, config['lock_timeout'])
+
+    importer = UserImporter(send_mail=job['send_mail'], progress=save_progress)
+    importer.result.update({key: job[key] for key in importer.result if key in job})
+    try:
+        with open(job['path'], 'rb') as file:
+            result = importer.run(iter_rows(file, job['filename']), skip=job.get('processed', 0))
+        set_import_job(job_id, status='COMPLETED', **result)
+    except Exception as e:
+        log_error(
+            module_name="user_management",
+            message="Toplu kullanıcı içe aktarma başarısız",
+            context={"job_id": job_id, "error": str(e)}
+        )
+        set_import_job(job_id, status='FAILED', message=str(e))
+    remove_import_file(job['path'])
+
+
+def run_pending_import_jobs():
+    """
+    Zamanlanmış görev: kuyruktaki içe aktarma işlerini sırayla çalıştırır. Kilit sayesinde aynı
+    anda tek çalıştırıcı olur. İş bitene kadar kuyruğun başında kaldığından, worker yeniden
+    başlatılırsa sonraki çalıştırma aynı işe kaldığı yerden devam eder.
+    """
+    config = get_user_import_settings()
+    if not cache.add(IMPORT_LOCK_KEY, True, config['lock_timeout']):
+        return 0
+
+    redis = get_redis_connection('default')
+    completed = 0
+    try:
+        while True:
+            job_id = redis.lindex(IMPORT_QUEUE, 0)
+            if job_id is None:
+                break
+            job_id = job_id.decode()
+            run_import_job(job_id)
+            redis.lrem(IMPORT_QUEUE, 1, job_id)
+            completed += 1
+    finally:
+        cache.delete(IMPORT_LOCK_KEY)
+        close_old_connections()
+    return completed
+
+
+def start_import_job(upload, send_mail=True):
+    """
+    Yüklenen dosyayı web ve cron süreçlerinin paylaştığı dizine yazar ve işi kuyruğa ekler.
+    İçe aktarma web worker'ında değil `core.tasks.run_user_imports` görevinde çalışır.
+    """
+    filename = upload.name
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in ('.csv', '.xlsx', '.xlsm'):
+        raise ValidationError("Desteklenmeyen dosya tipi. CSV veya XLSX yükleyiniz.")
+
+    job_id = uuid.uuid4().hex
+    upload_dir = get_user_import_settings()['upload_dir']
+    os.makedirs(upload_dir, exist_ok=True)
+    path = os.path.join(upload_dir, f'{job_id}{extension}')
+    with open(path, 'wb') as file:
+        upload.seek(0)
+        shutil.copyfileobj(upload, file)
+
+    set_import_job(job_id, status='PENDING', filename=filename, path=path, send_mail=send_mail, processed=0, attempts=0)
+    get_redis_connection('default').rpush(IMPORT_QUEUE, job_id)
+    return job_id